@@ -0,0 +1 @@
+"""Fixture overhead benchmarks."""
@@ -0,0 +1,46 @@
+"""Benchmarks main conftest file."""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pytest_elasticsearch.executor import read_version
+from pytest_elasticsearch.plugin import *  # noqa: F403
+
+
+@lru_cache(maxsize=None)
+def _elasticsearch_version(executable: str) -> str:
+    """Get version of the benchmarked elasticsearch executable."""
+    try:
+        return str(read_version(Path(executable)))
+    except RuntimeError:
+        return "unknown"
+
+
+def elasticsearch_version(config: pytest.Config) -> str:
+    """Get version of elasticsearch the benchmarks are run against."""
+    return _elasticsearch_version(
+        config.getoption("elasticsearch_executable") or config.getini("elasticsearch_executable")
+    )
+
+
+def pytest_benchmark_update_machine_info(
+    config: pytest.Config, machine_info: Dict[str, Any]
+) -> None:
+    """Store elasticsearch version along with the saved results."""
+    machine_info["elasticsearch_version"] = elasticsearch_version(config)
+
+
+@pytest.fixture(autouse=True)
+def elasticsearch_version_info(
+    request: pytest.FixtureRequest, benchmark: BenchmarkFixture
+) -> Iterator[None]:
+    """Report each benchmark per elasticsearch major version."""
+    version = elasticsearch_version(request.config)
+    benchmark.extra_info["elasticsearch_version"] = version
+    group = request.node.originalname.replace("test_", "")
+    benchmark.group = f"{group} (elasticsearch {version.split('.')[0]}.x)"
+    yield
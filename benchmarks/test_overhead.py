@@ -0,0 +1,143 @@
+"""Benchmarks of the time fixtures add to the test suite."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+from elasticsearch import Elasticsearch
+from port_for import get_port
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pytest_elasticsearch.cleanup import CLEANUP_STRATEGIES, cleanup_cluster, cluster_state
+from pytest_elasticsearch.client import client_view, process_client
+from pytest_elasticsearch.config import get_config
+from pytest_elasticsearch.executor import ElasticSearchExecutor, read_version
+from pytest_elasticsearch.loader import bulk_load
+
+DOCUMENTS = 10000
+
+NodeFactory = Callable[[Optional[Path], bool], ElasticSearchExecutor]
+Setup = Tuple[Tuple[Any, ...], Dict[str, Any]]
+
+
+@pytest.fixture
+def node_factory(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Iterator[NodeFactory]:
+    """Create executors of single elasticsearch nodes, stopped after the benchmark."""
+    config = get_config(request)
+    executable = Path(config["executable"])
+    executors: List[ElasticSearchExecutor] = []
+
+    def create(tmpdir: Optional[Path] = None, known_version: bool = False) -> ElasticSearchExecutor:
+        """Create executor, probing elasticsearch version unless it's known."""
+        tmpdir = tmpdir or tmp_path_factory.mktemp("benchmark-node")
+        port = get_port(None)
+        assert port
+        transport_port = get_port(None, exclude_ports=[port])
+        assert transport_port
+        executor = ElasticSearchExecutor(
+            executable,
+            config["host"],
+            port,
+            transport_port,
+            tmpdir / "elasticsearch.pid",
+            tmpdir / "logs",
+            tmpdir / "data",
+            "benchmark",
+            config["network_publish_host"],
+            config["index_store_type"],
+            timeout=120,
+            version=read_version(executable) if known_version else None,
+            settings={"discovery.type": "single-node"},
+        )
+        executors.append(executor)
+        return executor
+
+    yield create
+    for executor in executors:
+        executor.stop()
+
+
+def documents() -> Iterator[Dict[str, Any]]:
+    """Generate documents to seed."""
+    for number in range(DOCUMENTS):
+        yield {"_id": str(number), "title": f"Book {number}", "pages": number % 500}
+
+
+def create_indices(client: Elasticsearch, count: int) -> None:
+    """Create empty indices, as left by tests."""
+    for number in range(count):
+        client.indices.create(index=f"benchmark-{number}")
+
+
+def test_startup_cold(benchmark: BenchmarkFixture, node_factory: NodeFactory) -> None:
+    """Node start with version probe and empty data directory, like the first session."""
+    started: List[ElasticSearchExecutor] = []
+
+    def start() -> None:
+        started.append(node_factory(None, False).start())
+
+    benchmark.pedantic(start, teardown=lambda: started.pop().stop(), rounds=3)
+
+
+def test_startup_warm(
+    benchmark: BenchmarkFixture,
+    node_factory: NodeFactory,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    """Node start with cached version and existing data directory."""
+    executor = node_factory(tmp_path_factory.mktemp("benchmark-node"), True)
+    benchmark.pedantic(executor.start, teardown=executor.stop, rounds=3, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("indices", [1, 10, 100])
+def test_client_fixture(
+    benchmark: BenchmarkFixture, elasticsearch_proc: ElasticSearchExecutor, indices: int
+) -> None:
+    """Client fixture setup and teardown of a test leaving given number of indices."""
+    pooled = process_client(elasticsearch_proc)
+
+    def setup() -> None:
+        create_indices(pooled, indices)
+
+    def client_fixture() -> None:
+        client = client_view(pooled)
+        cleanup_cluster(client, "indices")
+
+    benchmark.pedantic(client_fixture, setup=setup, rounds=5)
+    pooled.close()
+
+
+@pytest.mark.parametrize("thread_count", [1, 4])
+def test_bulk_seed(
+    benchmark: BenchmarkFixture, elasticsearch_proc: ElasticSearchExecutor, thread_count: int
+) -> None:
+    """Throughput of seeding an index with bulk requests."""
+    client = process_client(elasticsearch_proc, request_timeout=120)
+
+    def setup() -> Setup:
+        client.indices.delete(index="benchmark-bulk", ignore_unavailable=True)
+        return (client, documents, "benchmark-bulk"), {"thread_count": thread_count}
+
+    benchmark.pedantic(bulk_load, setup=setup, rounds=3)
+    if benchmark.stats:  # Not gathered with --benchmark-disable.
+        benchmark.extra_info["documents_per_second"] = round(DOCUMENTS / benchmark.stats.stats.mean)
+    client.indices.delete(index="benchmark-bulk", ignore_unavailable=True)
+    client.close()
+
+
+@pytest.mark.parametrize("strategy", CLEANUP_STRATEGIES)
+def test_cleanup(
+    benchmark: BenchmarkFixture, elasticsearch_proc: ElasticSearchExecutor, strategy: str
+) -> None:
+    """Latency of cleanup strategies, removing 20 indices."""
+    client = process_client(elasticsearch_proc)
+    baseline = cluster_state(client)
+
+    def setup() -> Setup:
+        create_indices(client, 20)
+        return (client, strategy, baseline), {}
+
+    benchmark.pedantic(cleanup_cluster, setup=setup, rounds=5)
+    client.close()
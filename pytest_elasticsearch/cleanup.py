@@ -0,0 +1,288 @@
+"""Removal of what tests leave behind in elasticsearch."""
+
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
+
+from elasticsearch import AsyncElasticsearch, Elasticsearch, NotFoundError
+
+CLEANUP_STRATEGIES = ("indices", "sweep", "baseline")
+
+# Keeps request line well below elasticsearch's default http.max_initial_line_length (4kb).
+MAX_NAMES_LENGTH = 3072
+
+
+class ClusterState(TypedDict):
+    """Names of resources created by users, leaving out system and managed ones."""
+
+    indices: Set[str]
+    aliases: Set[Tuple[str, str]]
+    data_streams: Set[str]
+    index_templates: Set[str]
+    component_templates: Set[str]
+    pipelines: Set[str]
+
+
+def _user_defined(name: str, body: Optional[Dict[str, Any]] = None) -> bool:
+    """Check whether resource is created by a user, not by elasticsearch itself."""
+    if name.startswith("."):
+        return False
+    meta = (body or {}).get("_meta") or {}
+    return not meta.get("managed", False)
+
+
+def chunk_names(names: Iterable[str], max_length: int = MAX_NAMES_LENGTH) -> Iterator[str]:
+    """Join names with commas, into as few chunks as URL length allows."""
+    chunk: List[str] = []
+    length = 0
+    for name in sorted(names):
+        if chunk and length + len(name) + 1 > max_length:
+            yield ",".join(chunk)
+            chunk, length = [], 0
+        chunk.append(name)
+        length += len(name) + 1
+    if chunk:
+        yield ",".join(chunk)
+
+
+def _user_indices(response: Any) -> Dict[str, Set[str]]:
+    """Get user's indices with their aliases, out of get alias response."""
+    return {
+        index: set(body.get("aliases", {}))
+        for index, body in response.items()
+        if _user_defined(index)
+    }
+
+
+def list_indices(client: Elasticsearch) -> Dict[str, Set[str]]:
+    """Get user's indices, open and closed, with their aliases."""
+    return _user_indices(client.indices.get_alias(index="*", expand_wildcards="open,closed"))
+
+
+def delete_indices(client: Elasticsearch, indices: Iterable[str]) -> None:
+    """Delete indices by their names, within as few requests as possible.
+
+    Names are listed explicitly, so it works when ``action.destructive_requires_name``
+    prohibits wildcard deletes.
+    """
+    for names in chunk_names(indices):
+        client.indices.delete(index=names, ignore_unavailable=True)
+
+
+def _fetch(api: Callable[..., Any], **kwargs: Any) -> Dict[str, Any]:
+    """Call listing API, some elasticsearch versions respond 404 when there's nothing to list."""
+    try:
+        return dict(api(**kwargs))
+    except NotFoundError:
+        return {}
+
+
+def cluster_state(client: Elasticsearch) -> ClusterState:
+    """Get names of all user's resources in the cluster."""
+    return _cluster_state(
+        list_indices(client),
+        _fetch(client.indices.get_data_stream, name="*", expand_wildcards="all"),
+        _fetch(client.indices.get_index_template),
+        _fetch(client.cluster.get_component_template),
+        _fetch(client.ingest.get_pipeline),
+    )
+
+
+def _cluster_state(
+    indices: Dict[str, Set[str]],
+    data_streams: Dict[str, Any],
+    index_templates: Dict[str, Any],
+    component_templates: Dict[str, Any],
+    pipelines: Dict[str, Any],
+) -> ClusterState:
+    """Get names of user's resources, out of listing APIs' responses."""
+    return ClusterState(
+        indices=set(indices),
+        aliases={(index, alias) for index, aliases in indices.items() for alias in aliases},
+        data_streams={
+            data_stream["name"]
+            for data_stream in data_streams.get("data_streams", [])
+            if _user_defined(data_stream["name"], data_stream)
+        },
+        index_templates={
+            template["name"]
+            for template in index_templates.get("index_templates", [])
+            if _user_defined(template["name"], template["index_template"])
+        },
+        component_templates={
+            template["name"]
+            for template in component_templates.get("component_templates", [])
+            if _user_defined(template["name"], template["component_template"])
+        },
+        pipelines={name for name, body in pipelines.items() if _user_defined(name, body)},
+    )
+
+
+def state_difference(current: ClusterState, baseline: ClusterState) -> ClusterState:
+    """Get resources present in current state, but not in the baseline."""
+    return ClusterState(
+        indices=current["indices"] - baseline["indices"],
+        aliases=current["aliases"] - baseline["aliases"],
+        data_streams=current["data_streams"] - baseline["data_streams"],
+        index_templates=current["index_templates"] - baseline["index_templates"],
+        component_templates=current["component_templates"] - baseline["component_templates"],
+        pipelines=current["pipelines"] - baseline["pipelines"],
+    )
+
+
+def _removed_aliases(state: ClusterState) -> List[Dict[str, Any]]:
+    """Get alias removal actions, leaving out aliases of indices removed along with them."""
+    return [
+        {"remove": {"index": index, "alias": alias}}
+        for index, alias in sorted(state["aliases"])
+        if index not in state["indices"]
+    ]
+
+
+def remove_resources(client: Elasticsearch, state: ClusterState) -> None:
+    """Remove resources, in order of their dependencies."""
+    for names in chunk_names(state["data_streams"]):
+        client.indices.delete_data_stream(name=names)
+    delete_indices(client, state["indices"])
+    aliases = _removed_aliases(state)
+    if aliases:
+        client.indices.update_aliases(body={"actions": aliases})
+    # Older elasticsearch versions delete single template or pipeline per request.
+    for name in sorted(state["index_templates"]):
+        client.indices.delete_index_template(name=name)
+    for name in sorted(state["component_templates"]):
+        client.cluster.delete_component_template(name=name)
+    for name in sorted(state["pipelines"]):
+        client.ingest.delete_pipeline(id=name)
+
+
+def _check_strategy(strategy: str) -> None:
+    """Raise error if the cleanup strategy is unknown."""
+    if strategy not in CLEANUP_STRATEGIES:
+        raise ValueError(
+            f"Unknown cleanup strategy {strategy!r}, choose one of {', '.join(CLEANUP_STRATEGIES)}"
+        )
+
+
+def cleanup_cluster(
+    client: Elasticsearch, strategy: str, baseline: Optional[ClusterState] = None
+) -> None:
+    """Remove what the test has left behind.
+
+    :param client: elasticsearch client
+    :param strategy: *indices* to delete all indices,
+        *sweep* to also delete data streams, aliases, index and component templates
+        and ingest pipelines,
+        *baseline* to delete only those that are not in the baseline
+    :param baseline: cluster state to compare with, for the *baseline* strategy
+    """
+    _check_strategy(strategy)
+    if strategy == "indices":
+        delete_indices(client, list_indices(client))
+    elif strategy == "sweep":
+        remove_resources(client, cluster_state(client))
+    else:
+        assert baseline is not None
+        remove_resources(client, state_difference(cluster_state(client), baseline))
+
+
+async def _async_fetch(api: Callable[..., Awaitable[Any]], **kwargs: Any) -> Dict[str, Any]:
+    """Call listing API of async client, see :func:`_fetch`."""
+    try:
+        return dict(await api(**kwargs))
+    except NotFoundError:
+        return {}
+
+
+async def async_list_indices(client: AsyncElasticsearch) -> Dict[str, Set[str]]:
+    """Get user's indices, open and closed, with their aliases, through async client."""
+    return _user_indices(await client.indices.get_alias(index="*", expand_wildcards="open,closed"))
+
+
+async def async_delete_indices(client: AsyncElasticsearch, indices: Iterable[str]) -> None:
+    """Delete indices through async client, see :func:`delete_indices`.
+
+    Chunks are deleted concurrently, as they don't share any index.
+    """
+    await asyncio.gather(
+        *(
+            client.indices.delete(index=names, ignore_unavailable=True)
+            for names in chunk_names(indices)
+        )
+    )
+
+
+async def async_cluster_state(client: AsyncElasticsearch) -> ClusterState:
+    """Get names of all user's resources in the cluster, through async client.
+
+    Resources are listed concurrently.
+    """
+    return _cluster_state(
+        *await asyncio.gather(
+            async_list_indices(client),
+            _async_fetch(client.indices.get_data_stream, name="*", expand_wildcards="all"),
+            _async_fetch(client.indices.get_index_template),
+            _async_fetch(client.cluster.get_component_template),
+            _async_fetch(client.ingest.get_pipeline),
+        )
+    )
+
+
+async def async_remove_resources(client: AsyncElasticsearch, state: ClusterState) -> None:
+    """Remove resources through async client, see :func:`remove_resources`.
+
+    Resources of a kind are deleted concurrently, kinds still in order of their dependencies.
+    Index templates go before component templates they may be composed of.
+    """
+    await asyncio.gather(
+        *(
+            client.indices.delete_data_stream(name=names)
+            for names in chunk_names(state["data_streams"])
+        )
+    )
+    await async_delete_indices(client, state["indices"])
+    aliases = _removed_aliases(state)
+    if aliases:
+        await client.indices.update_aliases(body={"actions": aliases})
+    await asyncio.gather(
+        *(client.indices.delete_index_template(name=name) for name in state["index_templates"]),
+        *(client.ingest.delete_pipeline(id=name) for name in state["pipelines"]),
+    )
+    await asyncio.gather(
+        *(
+            client.cluster.delete_component_template(name=name)
+            for name in state["component_templates"]
+        )
+    )
+
+
+async def async_cleanup_cluster(
+    client: AsyncElasticsearch, strategy: str, baseline: Optional[ClusterState] = None
+) -> None:
+    """Remove what the test has left behind, through async client.
+
+    :param client: async elasticsearch client
+    :param strategy: cleanup strategy, see :func:`cleanup_cluster`
+    :param baseline: cluster state to compare with, for the *baseline* strategy
+    """
+    _check_strategy(strategy)
+    if strategy == "indices":
+        await async_delete_indices(client, await async_list_indices(client))
+    elif strategy == "sweep":
+        await async_remove_resources(client, await async_cluster_state(client))
+    else:
+        assert baseline is not None
+        await async_remove_resources(
+            client, state_difference(await async_cluster_state(client), baseline)
+        )
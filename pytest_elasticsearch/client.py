@@ -0,0 +1,101 @@
+"""Elasticsearch clients used by the client fixtures."""
+
+import copy
+from typing import Any, Dict, Optional, Type, TypeVar, Union
+from uuid import uuid4
+
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from elasticsearch import __version__ as elastic_version
+
+from pytest_elasticsearch.container import ContainerElasticsearch
+from pytest_elasticsearch.executor import (
+    ElasticSearchExecutor,
+    NoopElasticsearch,
+    SharedElasticsearch,
+)
+from pytest_elasticsearch.fake import FakeElasticsearch
+from pytest_elasticsearch.shared import xdist_worker
+
+ElasticsearchProcess = Union[
+    ElasticSearchExecutor,
+    NoopElasticsearch,
+    SharedElasticsearch,
+    FakeElasticsearch,
+    ContainerElasticsearch,
+]
+ElasticsearchType = TypeVar("ElasticsearchType", bound=Elasticsearch)
+
+
+class NamespacedElasticsearch(Elasticsearch):
+    """Elasticsearch client owning indices prefixed with its namespace."""
+
+    namespace: str = ""
+
+    def delete_namespace(self) -> None:
+        """Delete all indices within client's namespace.
+
+        Wildcard deletes are rejected when ``action.destructive_requires_name``
+        is enabled (the default since 8.0), so the names get resolved first
+        and removed within a single request.
+        """
+        indices = self.indices.get_alias(index=f"{self.namespace}*", expand_wildcards="all")
+        if indices:
+            self.indices.delete(index=",".join(indices), ignore_unavailable=True)
+
+
+class AsyncNamespacedElasticsearch(AsyncElasticsearch):
+    """Async Elasticsearch client owning indices prefixed with its namespace."""
+
+    namespace: str = ""
+
+    async def delete_namespace(self) -> None:
+        """Delete all indices within client's namespace, within a single request."""
+        indices = await self.indices.get_alias(index=f"{self.namespace}*", expand_wildcards="all")
+        if indices:
+            await self.indices.delete(index=",".join(indices), ignore_unavailable=True)
+
+
+def new_namespace() -> str:
+    """Generate unique index prefix for a single test."""
+    worker = xdist_worker()
+    if worker:
+        return f"pytest-{worker}-{uuid4().hex[:12]}-"
+    return f"pytest-{uuid4().hex[:12]}-"
+
+
+def connection_pool_options(connections_per_node: Optional[int]) -> Dict[str, int]:
+    """Get client arguments sizing its connection pool, in the installed client's version.
+
+    :param connections_per_node: number of connections kept open to each node,
+        client's default if not given
+    """
+    if not connections_per_node:
+        return {}
+    if elastic_version >= (8, 0, 0):
+        return {"connections_per_node": connections_per_node}
+    return {"maxsize": connections_per_node}
+
+
+def process_client(
+    process: ElasticsearchProcess,
+    client_class: Type[Elasticsearch] = Elasticsearch,
+    **kwargs: Any,
+) -> Elasticsearch:
+    """Create Elasticsearch client connected to process fixture's node."""
+    kwargs.setdefault("request_timeout", 30)
+    kwargs.setdefault("verify_certs", False)
+    return client_class(
+        hosts=[{"host": process.host, "port": process.port, "scheme": "http"}], **kwargs
+    )
+
+
+def client_view(client: ElasticsearchType) -> ElasticsearchType:
+    """Get client sharing the given client's transport and connection pool.
+
+    Attributes set on the view, like the namespace, do not affect the given client.
+    Clients older than 8.0 have no ``options()``, their shallow copy shares the transport
+    along with the API namespaces calling it.
+    """
+    if elastic_version >= (8, 0, 0):
+        return client.options()
+    return copy.copy(client)
@@ -0,0 +1,49 @@
+"""Per-test clones of seeded indices."""
+
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from elasticsearch import Elasticsearch
+from elasticsearch import __version__ as elastic_version
+
+
+class ClonedIndexElasticsearch(Elasticsearch):
+    """Elasticsearch client owning a clone of a seeded index."""
+
+    source_index: str = ""
+    cloned_index: str = ""
+    index_name: str = ""
+
+    def delete_clone(self) -> None:
+        """Delete the cloned index, along with its alias."""
+        self.indices.delete(index=self.cloned_index, ignore_unavailable=True)
+
+
+def new_clone_name(source: str) -> str:
+    """Generate unique name of source index clone."""
+    return f"{source}-clone-{uuid4().hex[:12]}"
+
+
+def clone_index(
+    client: Elasticsearch, source: str, target: str, alias: Optional[str] = None
+) -> None:
+    """Clone source index, blocking writes to it first, as the clone API requires.
+
+    Cloning hard-links source's segments, so it takes about the same time
+    regardless of the index size. The write block is copied along with
+    other settings, and lifted from the clone.
+
+    :param client: elasticsearch client
+    :param source: index to clone
+    :param target: name of the clone
+    :param alias: alias to create for the clone
+    """
+    client.indices.add_block(index=source, block="write")
+    settings = {"index.blocks.write": None}
+    aliases: Dict[str, Dict[str, Any]] = {alias: {}} if alias else {}
+    if elastic_version >= (8, 0, 0):
+        client.indices.clone(index=source, target=target, settings=settings, aliases=aliases)
+    else:
+        client.indices.clone(
+            index=source, target=target, body={"settings": settings, "aliases": aliases}
+        )
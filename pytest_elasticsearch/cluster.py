@@ -0,0 +1,93 @@
+"""Elasticsearch cluster of several nodes."""
+
+from pathlib import Path
+from typing import List, Optional
+
+from mirakuru import ProcessExitedWithError
+
+from pytest_elasticsearch.client import process_client
+from pytest_elasticsearch.executor import ElasticSearchExecutor
+
+
+class ClusterHealthTimeout(Exception):
+    """Cluster has not reached expected health status in time."""
+
+
+class ElasticsearchCluster:
+    """Elasticsearch nodes forming a single cluster.
+
+    Client fixtures connect to the first running node, so nodes can be stopped
+    and started again through :attr:`executors` to test failover.
+    """
+
+    def __init__(
+        self, executors: List[ElasticSearchExecutor], repo_path: Optional[Path] = None
+    ) -> None:
+        """Initialize elasticsearch cluster.
+
+        :param executors: executors of cluster's nodes
+        :param repo_path: snapshot repositories location, shared by all nodes
+        """
+        self.executors = executors
+        self.repo_path = repo_path
+
+    def _node(self) -> ElasticSearchExecutor:
+        """Get the first running node, or the first node if none is running."""
+        for executor in self.executors:
+            if executor.running():
+                return executor
+        return self.executors[0]
+
+    @property
+    def host(self) -> str:
+        """Host of a running node."""
+        return self._node().host
+
+    @property
+    def port(self) -> int:
+        """HTTP port of a running node."""
+        return self._node().port
+
+    def running(self) -> bool:
+        """Check if any of the nodes is running."""
+        return any(executor.running() for executor in self.executors)
+
+    def start(self, wait_for_status: str = "green", timeout: int = 60) -> "ElasticsearchCluster":
+        """Start nodes that are not running, and wait for the cluster to form.
+
+        Nodes are spawned together, as the cluster can't elect a master
+        until enough of them are up.
+        """
+        for executor in self.executors:
+            if executor.process is None:
+                executor.spawn()
+        for executor in self.executors:
+            executor.start()
+        self.wait_for_status(wait_for_status, timeout)
+        return self
+
+    def wait_for_status(self, status: str = "green", timeout: int = 60) -> None:
+        """Wait until the cluster reaches given health status, with all its running nodes."""
+        client = process_client(self._node(), request_timeout=timeout + 10)
+        try:
+            health = dict(
+                client.cluster.health(
+                    wait_for_status=status,
+                    wait_for_nodes=str(sum(executor.running() for executor in self.executors)),
+                    timeout=f"{timeout}s",
+                )
+            )
+        finally:
+            client.close()
+        if health.get("timed_out"):
+            raise ClusterHealthTimeout(
+                f"Cluster has not reached {status} status within {timeout}s: {health}"
+            )
+
+    def stop(self) -> None:
+        """Stop all nodes."""
+        for executor in self.executors:
+            try:
+                executor.stop()
+            except ProcessExitedWithError:
+                pass
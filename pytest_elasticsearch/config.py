@@ -1,7 +1,7 @@
 """Configuration for pytest-elasticsearch."""
 
 from pathlib import Path
-from typing import Any, Optional, TypedDict
+from typing import Any, List, Optional, TypedDict
 
 from pytest import FixtureRequest
 
@@ -16,6 +16,31 @@ class ElasticsearchConfigDict(TypedDict):
     cluster_name: str
     network_publish_host: str
     index_store_type: str
+    index_defaults: str
+    refresh_interval: Optional[str]
+    data_template_dir: str
+    xdist_mode: str
+    xdist_pool_size: Optional[str]
+    parallel_start: bool
+    version: Optional[str]
+    jvm_profile: str
+    heap_size: Optional[str]
+    java_opts: Optional[str]
+    envvars: List[str]
+    profile: str
+    settings: List[str]
+    keep_alive: bool
+    connections_per_node: Optional[str]
+    cleanup: str
+    wait_for_status: str
+    data_dir: Optional[str]
+    teardown: str
+    keep_on_failure: bool
+    backend: str
+    image: Optional[str]
+    container_runtime: str
+    requests_report: bool
+    search_profiles: bool
 
 
 def get_config(request: FixtureRequest) -> ElasticsearchConfigDict:
@@ -33,4 +58,29 @@ def get_config(request: FixtureRequest) -> ElasticsearchConfigDict:
         cluster_name=get_elasticsearch_option("cluster_name"),
         network_publish_host=get_elasticsearch_option("network_publish_host"),
         index_store_type=get_elasticsearch_option("index_store_type"),
+        index_defaults=get_elasticsearch_option("index_defaults"),
+        refresh_interval=get_elasticsearch_option("refresh_interval"),
+        data_template_dir=get_elasticsearch_option("data_template_dir"),
+        xdist_mode=get_elasticsearch_option("xdist_mode"),
+        xdist_pool_size=get_elasticsearch_option("xdist_pool_size"),
+        parallel_start=get_elasticsearch_option("parallel_start"),
+        version=get_elasticsearch_option("version"),
+        jvm_profile=get_elasticsearch_option("jvm_profile"),
+        heap_size=get_elasticsearch_option("heap_size"),
+        java_opts=get_elasticsearch_option("java_opts"),
+        envvars=get_elasticsearch_option("envvars"),
+        profile=get_elasticsearch_option("profile"),
+        settings=get_elasticsearch_option("settings"),
+        keep_alive=get_elasticsearch_option("keep_alive"),
+        connections_per_node=get_elasticsearch_option("connections_per_node"),
+        cleanup=get_elasticsearch_option("cleanup"),
+        wait_for_status=get_elasticsearch_option("wait_for_status"),
+        data_dir=get_elasticsearch_option("data_dir"),
+        teardown=get_elasticsearch_option("teardown"),
+        keep_on_failure=get_elasticsearch_option("keep_on_failure"),
+        backend=get_elasticsearch_option("backend"),
+        image=get_elasticsearch_option("image"),
+        container_runtime=get_elasticsearch_option("container_runtime"),
+        requests_report=get_elasticsearch_option("requests_report"),
+        search_profiles=get_elasticsearch_option("search_profiles"),
     )
@@ -0,0 +1,174 @@
+"""Elasticsearch node running in a Docker or Podman container."""
+
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, NoReturn, Optional
+
+from elasticsearch import __version__ as elastic_version
+from packaging.version import InvalidVersion, Version
+
+from pytest_elasticsearch.executor import READINESS_POLL_INTERVAL, health_reached
+
+BACKENDS = ("local", "container")
+CONTAINER_LABEL = "pytest-elasticsearch"
+CONTAINER_HTTP_PORT = 9200
+CONTAINER_DATA_PATH = "/usr/share/elasticsearch/data"
+CONTAINER_REPO_PATH = Path("/usr/share/elasticsearch/snapshots")
+# Elasticsearch runs as elasticsearch user within the official image.
+CONTAINER_TMPFS_OPTIONS = "rw,uid=1000,gid=0,mode=0770"
+
+
+class ContainerStartError(Exception):
+    """Elasticsearch container has exited or not responded in time."""
+
+
+def default_image() -> str:
+    """Get official elasticsearch image of the version matching installed client."""
+    tag = ".".join(str(part) for part in elastic_version[:3])
+    return f"docker.elastic.co/elasticsearch/elasticsearch:{tag}"
+
+
+def image_version(image: str) -> Version:
+    """Get elasticsearch version from image tag, installed client's one if tag is not a version."""
+    try:
+        return Version(image.rsplit(":", 1)[-1])
+    except InvalidVersion:
+        return Version(".".join(str(part) for part in elastic_version[:3]))
+
+
+class ContainerElasticsearch:  # pylint:disable=too-many-instance-attributes
+    """Elasticsearch node running in a container, with data kept on tmpfs."""
+
+    xdist_shared = False
+
+    def __init__(
+        self,
+        runtime: str,
+        image: str,
+        host: str,
+        port: int,
+        name: str,
+        cluster_name: str,
+        timeout: int,
+        settings: Optional[Dict[str, str]] = None,
+        envvars: Optional[Dict[str, str]] = None,
+        wait_for_status: Optional[str] = None,
+    ) -> None:  # pylint:disable=too-many-arguments
+        """Initialize container executor.
+
+        :param runtime: container runtime executable, e.g. *docker* or *podman*
+        :param image: elasticsearch image, pulled unless already present
+        :param host: host to publish elasticsearch's HTTP port on
+        :param port: port to publish elasticsearch's HTTP port on
+        :param name: container name
+        :param cluster_name: cluster name
+        :param timeout: time after which to give up to start elasticsearch
+        :param settings: additional elasticsearch settings
+        :param envvars: additional environment variables, like ``ES_JAVA_OPTS``
+        :param wait_for_status: cluster health status the node has to reach
+            to be considered started, None to only wait until it responds
+        """
+        self.runtime = runtime
+        self.image = image
+        self.host = host
+        self.port = port
+        self.name = name
+        self.cluster_name = cluster_name
+        self.timeout = timeout
+        self.settings = settings or {}
+        self.envvars = envvars or {}
+        self.wait_for_status = wait_for_status
+        self.repo_path = CONTAINER_REPO_PATH
+        self.container_id: Optional[str] = None
+
+    def _run(self, *args: str, check: bool = True) -> "subprocess.CompletedProcess[str]":
+        """Run container runtime command."""
+        return subprocess.run([self.runtime, *args], capture_output=True, text=True, check=check)
+
+    def pull(self) -> None:
+        """Pull the image, unless it's already present."""
+        if self._run("image", "inspect", self.image, check=False).returncode != 0:
+            self._run("pull", self.image)
+
+    def _run_arguments(self) -> List[str]:
+        """Get arguments starting elasticsearch container."""
+        settings = {
+            "cluster.name": self.cluster_name,
+            "xpack.security.enabled": "false",
+            "path.repo": str(self.repo_path),
+            **self.settings,
+        }
+        arguments = [
+            "run",
+            "--detach",
+            "--name",
+            self.name,
+            "--label",
+            CONTAINER_LABEL,
+            "--publish",
+            f"{self.host}:{self.port}:{CONTAINER_HTTP_PORT}",
+            "--tmpfs",
+            f"{CONTAINER_DATA_PATH}:{CONTAINER_TMPFS_OPTIONS}",
+            "--tmpfs",
+            f"{self.repo_path}:{CONTAINER_TMPFS_OPTIONS}",
+        ]
+        # Official image turns environment variables with dots into settings.
+        for name, value in {**settings, **self.envvars}.items():
+            arguments.extend(["--env", f"{name}={value}"])
+        arguments.append(self.image)
+        return arguments
+
+    def start(self) -> "ContainerElasticsearch":
+        """Start elasticsearch container and wait until it's ready."""
+        if self.running():
+            return self
+        self.pull()
+        self.container_id = self._run(*self._run_arguments()).stdout.strip()
+        endtime = time.time() + self.timeout
+        delay = READINESS_POLL_INTERVAL[0]
+        while time.time() <= endtime:
+            if health_reached(
+                self.host, self.port, self.wait_for_status, int(endtime - time.time())
+            ):
+                return self
+            if not self.running():
+                self._fail("has exited")
+            time.sleep(delay)
+            delay = min(delay * 2, READINESS_POLL_INTERVAL[1])
+        self._fail(f"has not started within {self.timeout}s")
+
+    def _fail(self, reason: str) -> NoReturn:
+        """Remove the container, raising error with the end of its logs."""
+        assert self.container_id
+        logs = self._run("logs", "--tail", "50", self.container_id, check=False)
+        self.stop()
+        raise ContainerStartError(
+            f"Elasticsearch container {self.name} {reason}:\n{logs.stdout}{logs.stderr}"
+        )
+
+    def running(self) -> bool:
+        """Check if the container is running.
+
+        Client fixtures ask before every test, so published HTTP port accepting
+        connections is checked first, before asking the runtime to inspect the container.
+        """
+        if self.container_id is None:
+            return False
+        try:
+            with socket.create_connection((self.host, self.port), timeout=1):
+                return True
+        except OSError:
+            pass
+        inspect = self._run(
+            "inspect", "--format", "{{.State.Running}}", self.container_id, check=False
+        )
+        return inspect.stdout.strip() == "true"
+
+    def stop(self) -> None:
+        """Remove the container, along with its data."""
+        if self.container_id is None:
+            return
+        self._run("rm", "--force", "--volumes", self.container_id, check=False)
+        self.container_id = None
@@ -0,0 +1,118 @@
+"""Cached, pre-seeded data directories for elasticsearch process fixtures."""
+
+import errno
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from elasticsearch import Elasticsearch
+
+# ioctl request number of FICLONE on Linux (_IOW(0x94, 9, int)).
+FICLONE = 0x40049409
+
+DataTemplateSeed = Callable[[Elasticsearch], Any]
+
+
+def seed_fingerprint(seed: DataTemplateSeed) -> str:
+    """Identify the seeding callable, including its source code if available."""
+    name = f"{getattr(seed, '__module__', '')}.{getattr(seed, '__qualname__', repr(seed))}"
+    try:
+        source = inspect.getsource(seed)
+    except (OSError, TypeError):
+        source = ""
+    return f"{name}:{hashlib.sha256(source.encode('utf-8')).hexdigest()}"
+
+
+def data_template_key(version: str, settings: Dict[str, Any], seed: DataTemplateSeed) -> str:
+    """Compute the cache key of a data template.
+
+    :param version: elasticsearch version the template is created with
+    :param settings: node settings that affect the data directory layout
+    :param seed: callable seeding the node with data
+    :returns: hex digest identifying the template
+    """
+    payload = json.dumps(
+        {"version": version, "settings": settings, "seed": seed_fingerprint(seed)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _reflink_or_copy(source: str, destination: str) -> str:
+    """Copy a file, sharing its blocks with the source if filesystem allows it.
+
+    Hardlinks are not an option, as elasticsearch appends to translog
+    and state files in place, which would corrupt the template.
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError as exc:
+                if exc.errno not in (
+                    errno.EBADF,
+                    errno.EINVAL,
+                    errno.ENOTTY,
+                    errno.EOPNOTSUPP,
+                    errno.EXDEV,
+                ):
+                    raise
+            else:
+                shutil.copystat(source, destination)
+                return destination
+    shutil.copy2(source, destination)
+    return destination
+
+
+def copy_data_dir(source: Path, destination: Path) -> None:
+    """Copy elasticsearch data directory using reflinks where possible."""
+    shutil.copytree(
+        source,
+        destination,
+        copy_function=_reflink_or_copy,
+        ignore=shutil.ignore_patterns("node.lock"),
+        dirs_exist_ok=True,
+    )
+
+
+class DataTemplate:
+    """Pre-seeded elasticsearch data directory stored in a cache directory."""
+
+    def __init__(self, cache_dir: Path, key: str) -> None:
+        """Initialize data template.
+
+        :param cache_dir: directory holding all data templates
+        :param key: key identifying this template
+        """
+        self.path = cache_dir / key
+
+    def exists(self) -> bool:
+        """Check whether the template has already been created."""
+        return self.path.is_dir()
+
+    def restore(self, work_path: Path) -> None:
+        """Copy template into elasticsearch's data directory."""
+        copy_data_dir(self.path, work_path)
+
+    def save(self, work_path: Path) -> None:
+        """Store elasticsearch's data directory as a template.
+
+        Data is copied to a temporary directory first and renamed afterwards,
+        so concurrent sessions never see partially written template.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+        copy_data_dir(work_path, partial)
+        try:
+            partial.rename(self.path)
+        except OSError:
+            # Another session has stored the very same template in the meantime.
+            shutil.rmtree(partial)
@@ -1,14 +1,48 @@
 """Elasticsearch executor."""
 
+import json
+import os
 import re
+import shlex
+import signal
+import threading
+import time
+from collections import deque
+from http.client import HTTPConnection, HTTPException
 from pathlib import Path
-from subprocess import check_output
-from typing import Literal, Optional
+from subprocess import DEVNULL, PIPE, STDOUT, check_output
+from typing import IO, Callable, Deque, Dict, List, Literal, Optional, Sequence, TypeVar
 
-from mirakuru import HTTPExecutor
+from mirakuru import (
+    AlreadyRunning,
+    Executor,
+    HTTPExecutor,
+    ProcessExitedWithError,
+    TimeoutExpired,
+)
+from mirakuru.base import ENV_UUID
 from packaging.version import Version
 
 
+def process_running(pid: int) -> bool:
+    """Check whether process with given pid is running.
+
+    Zombie processes, that are not reaped by their parent yet,
+    are considered as stopped.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as stat:
+            return stat.read().rsplit(")", 1)[-1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
 class NoopElasticsearch:  # pylint:disable=too-few-public-methods
     """No operation Elasticsearch executor mock."""
 
@@ -27,6 +61,245 @@ class NoopElasticsearch:  # pylint:disable=too-few-public-methods
         return True
 
 
+class SharedElasticsearch:
+    """Elasticsearch node started by another pytest-xdist worker."""
+
+    shared = True
+    # Node is used by several sessions at once, so their client fixtures are namespaced.
+    xdist_shared = True
+
+    def __init__(self, host: str, port: int, pid: int, repo_path: Optional[Path] = None) -> None:
+        """Initialize shared Elasticsearch node handle.
+
+        :param host: hostname under which elasticsearch is available
+        :param port: port under which elasticsearch is available
+        :param pid: pid of the process that started the node
+        :param repo_path: snapshot repositories location
+        """
+        self.host = host
+        self.port = port
+        self.pid = pid
+        self.repo_path = repo_path
+
+    def running(self) -> bool:
+        """Check if the node is still running."""
+        return process_running(self.pid)
+
+    def stop(self, timeout: int = 60) -> None:
+        """Stop the node, killing it if it does not stop within timeout."""
+        try:
+            os.killpg(self.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        endtime = time.time() + timeout
+        while self.running():
+            if time.time() > endtime:
+                os.killpg(self.pid, signal.SIGKILL)
+                break
+            time.sleep(0.1)
+
+
+class KeptElasticsearch(SharedElasticsearch):
+    """Elasticsearch node kept running by a previous pytest session."""
+
+    # Node is reused between sessions, not used by several sessions at once.
+    xdist_shared = False
+
+
+JVM_PROFILES = ("default", "test")
+
+TEST_PROFILE_HEAP_SIZE = "512m"
+TEST_PROFILE_SETTINGS = {"discovery.type": "single-node"}
+
+
+SETTINGS_PROFILES = ("default", "ephemeral")
+
+
+def profile_settings(profile: str, version: Version) -> Dict[str, str]:
+    """Get elasticsearch settings of a settings profile.
+
+    :param profile: *default* to start a regular node, *ephemeral* to skip
+        discovery and disable modules tests do not need
+    :param version: elasticsearch version
+    :return: elasticsearch settings
+    """
+    if profile not in SETTINGS_PROFILES:
+        raise ValueError(
+            f"Unknown settings profile {profile!r}, choose one of {', '.join(SETTINGS_PROFILES)}"
+        )
+    if profile == "default":
+        return {}
+    settings = {
+        "discovery.type": "single-node",
+        "xpack.ml.enabled": "false",
+        "xpack.watcher.enabled": "false",
+        "xpack.monitoring.collection.enabled": "false",
+        "cluster.routing.allocation.disk.threshold_enabled": "false",
+    }
+    if version < Version("8.0.0"):
+        settings["xpack.monitoring.enabled"] = "false"
+    if version >= Version("7.14.0"):
+        settings["ingest.geoip.downloader.enabled"] = "false"
+    return settings
+
+
+def jvm_options(
+    profile: str,
+    heap_size: Optional[str] = None,
+    java_opts: Optional[str] = None,
+    cds_archive: Optional[Path] = None,
+) -> str:
+    """Compose JVM options for elasticsearch process.
+
+    :param profile: *default* to keep elasticsearch's JVM defaults,
+        *test* to trade peak performance for small heap and fast boot
+    :param heap_size: min and max heap size, e.g. *512m*
+    :param java_opts: additional JVM options
+    :param cds_archive: Class Data Sharing archive path, used by *test* profile
+    :return: value for ``ES_JAVA_OPTS`` environment variable
+    """
+    if profile not in JVM_PROFILES:
+        raise ValueError(
+            f"Unknown JVM profile {profile!r}, choose one of {', '.join(JVM_PROFILES)}"
+        )
+    options = []
+    if profile == "test":
+        heap_size = heap_size or TEST_PROFILE_HEAP_SIZE
+        # Bundled JDK depends on elasticsearch version, don't fail on older ones.
+        options.extend(["-XX:+IgnoreUnrecognizedVMOptions", "-XX:TieredStopAtLevel=1"])
+        if cds_archive:
+            options.extend(["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={cds_archive}"])
+    if heap_size:
+        options.extend([f"-Xms{heap_size}", f"-Xmx{heap_size}"])
+    if java_opts:
+        options.append(java_opts)
+    return " ".join(options)
+
+
+def read_version(executable: Path) -> Version:
+    """Read elasticsearch version by running its executable.
+
+    :param executable: elasticsearch executable path
+    :return: Elasticsearch version
+    """
+    try:
+        output = check_output([executable, "-Vv"]).decode("utf-8")
+    except OSError as exc:
+        raise RuntimeError("'%s' does not point to elasticsearch." % executable) from exc
+    match = re.search(r"Version: (?P<major>\d)\.(?P<minor>\d+)\.(?P<patch>\d+)", output)
+    if not match:
+        raise RuntimeError(
+            "Elasticsearch version is not recognized. "
+            "It is probably not supported. \n"
+            "Output is: " + output
+        )
+    version = match.groupdict()
+    return Version(".".join([version["major"], version["minor"], version["patch"]]))
+
+
+# Log messages of a node failing to bind its HTTP or transport port.
+BIND_FAILURE = re.compile(r"BindException|BindTransportException|Address already in use")
+# Log and output messages of a node, which is not going to start however long it's waited for.
+FATAL_FAILURE = re.compile(
+    r"fatal exception while booting|bootstrap checks? failed|OutOfMemoryError"
+    r"|Could not create the Java Virtual Machine|unknown setting \[|SettingsException"
+)
+# Number of node's last log and output lines kept, and included in startup errors.
+OUTPUT_TAIL_LINES = 200
+LOG_EXCERPT_LINES = 30
+
+
+class PortInUse(Exception):
+    """Elasticsearch node could not bind its port, taken by another process."""
+
+
+class NodeStartupError(Exception):
+    """Elasticsearch node has failed to start."""
+
+    def __init__(self, message: str, excerpt: Sequence[str]) -> None:
+        """Initialize startup error.
+
+        :param message: failure description
+        :param excerpt: node's last log or output lines
+        """
+        self.excerpt = list(excerpt)
+        super().__init__("\n".join([message, *self.excerpt]))
+
+
+class OutputTail:
+    """Last lines of node's log or output, collected as they come."""
+
+    def __init__(self, size: int = OUTPUT_TAIL_LINES) -> None:
+        """Initialize output tail.
+
+        :param size: number of last lines kept
+        """
+        self.lines: Deque[str] = deque(maxlen=size)
+        self._received = 0
+        self._read = 0
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> None:
+        """Add line received from the node."""
+        with self._lock:
+            self.lines.append(line.rstrip("\r\n"))
+            self._received += 1
+
+    def unread(self) -> List[str]:
+        """Get lines received since the last call, as many as are still kept."""
+        with self._lock:
+            count = min(self._received - self._read, len(self.lines))
+            self._read = self._received
+            return list(self.lines)[len(self.lines) - count :]
+
+    def excerpt(self, size: int = LOG_EXCERPT_LINES) -> List[str]:
+        """Get last lines received."""
+        with self._lock:
+            return list(self.lines)[-size:]
+
+
+def _read_output(stream: IO[bytes], tail: OutputTail) -> None:
+    """Collect node's output lines until it closes its output."""
+    with stream:
+        for line in iter(stream.readline, b""):
+            tail.append(line.decode("utf-8", errors="replace"))
+
+
+READINESS_STATUSES = ("none", "yellow", "green")
+# First and maximum interval between readiness checks, in seconds.
+READINESS_POLL_INTERVAL = (0.05, 0.5)
+# Longest time elasticsearch is asked to wait for health status within a single request.
+HEALTH_REQUEST_TIMEOUT = 5
+
+
+def health_reached(host: str, port: int, status: Optional[str], timeout: int) -> bool:
+    """Check if node responds, and its cluster has reached given health status.
+
+    :param host: node's host
+    :param port: node's HTTP port
+    :param status: *yellow* or *green*, None to only check that the node responds
+    :param timeout: longest time to wait for the status, capped by :data:`HEALTH_REQUEST_TIMEOUT`
+    """
+    request_timeout = max(1, min(timeout, HEALTH_REQUEST_TIMEOUT))
+    path = (
+        f"/_cluster/health?wait_for_status={status}&timeout={request_timeout}s" if status else "/"
+    )
+    connection = HTTPConnection(host, port, timeout=request_timeout + 5)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        health = json.loads(response.read() or b"{}")
+    except (HTTPException, OSError, ValueError):
+        # Node does not listen yet, or responds with no master elected.
+        return False
+    finally:
+        connection.close()
+    return response.status == 200 and not health.get("timed_out", False)
+
+
+ElasticSearchExecutorType = TypeVar("ElasticSearchExecutorType", bound="ElasticSearchExecutor")
+
+
 # pylint:disable=too-many-instance-attributes
 class ElasticSearchExecutor(HTTPExecutor):
     """Elasticsearch executor."""
@@ -44,6 +317,13 @@ class ElasticSearchExecutor(HTTPExecutor):
         network_publish_host: str,
         index_store_type: str,
         timeout: int,
+        shared: bool = False,
+        version: Optional[Version] = None,
+        settings: Optional[Dict[str, str]] = None,
+        envvars: Optional[Dict[str, str]] = None,
+        repo_path: Optional[Path] = None,
+        wait_for_status: Optional[str] = None,
+        startup_progress: Optional[Callable[[str], None]] = None,
     ) -> None:  # pylint:disable=too-many-arguments
         """Initialize ElasticSearchExecutor.
 
@@ -60,8 +340,21 @@ class ElasticSearchExecutor(HTTPExecutor):
         :param index_store_type: type of the index to use in the
             elasticsearch process fixture
         :param timeout: Time after which to give up to start elasticsearch
+        :param shared: whether the node is shared with other processes,
+            so it has to be able to outlive the one starting it
+        :param version: elasticsearch version, if known upfront,
+            saves running the executable just to check it
+        :param settings: additional elasticsearch settings, passed with ``-E``
+        :param envvars: additional environment variables for elasticsearch process,
+            like ``ES_JAVA_OPTS``
+        :param repo_path: snapshot repositories location
+        :param wait_for_status: cluster health status (*yellow* or *green*) the node
+            has to reach to be considered started. Node is started as soon as it responds
+            to HTTP requests if not given.
+        :param startup_progress: callback receiving every line the node writes
+            to its server log, while it's being started
         """
-        self._version: Optional[Version] = None
+        self._version: Optional[Version] = version
         self.executable = executable
         self.host = host
         self.port = port
@@ -73,12 +366,157 @@ class ElasticSearchExecutor(HTTPExecutor):
         self.cluster_name = cluster_name
         self.network_publish_host = network_publish_host
         self.index_store_type = index_store_type
+        self.shared = shared
+        # Set for nodes started for pytest-xdist workers to share.
+        self.xdist_shared = False
+        self.settings = settings or {}
+        self.repo_path = repo_path
+        self.wait_for_status = wait_for_status
+        self.startup_progress = startup_progress
+        self._log_offset = 0
+        self._log_tail = OutputTail()
+        self._output_tail = OutputTail()
+        self._output_reader: Optional[threading.Thread] = None
         super().__init__(
             self._exec_command(),
             f"http://{self.host}:{self.port}",
             timeout=timeout,
+            envvars=envvars,
+            # Process starting a shared node might exit long before the node does,
+            # so it can't hold pytest's output open, which would hang piped runs.
+            stdin=DEVNULL if shared else PIPE,
+            stdout=DEVNULL if shared else PIPE,
+            # JVM reports failing to start on stderr, before the node starts logging.
+            stderr=DEVNULL if shared else STDOUT,
         )
 
+    @property
+    def envvars(self) -> Dict[str, str]:
+        """Environment variables of elasticsearch process.
+
+        Shared nodes are not marked as mirakuru's subprocesses,
+        as otherwise mirakuru would kill them when the starting process exits.
+        """
+        envs = super().envvars
+        if self.shared:
+            del envs[ENV_UUID]
+        return envs
+
+    def spawn(self: ElasticSearchExecutorType) -> ElasticSearchExecutorType:
+        """Start elasticsearch process, without waiting for it to respond.
+
+        Lets several nodes boot at the same time,
+        :meth:`start` waits for the spawned node afterwards.
+        """
+        if self.pre_start_check():
+            raise AlreadyRunning(self)
+        # Logs directory might hold logs of a node started there before.
+        self._log_offset = self.log_file.stat().st_size if self.log_file.exists() else 0
+        super(Executor, self).start()
+        assert self.process
+        if self.process.stdout is not None:
+            # Reading from a duplicate, so the executor can close its end at any time,
+            # and the node's output doesn't fill up the pipe after it has started.
+            stream = os.fdopen(os.dup(self.process.stdout.fileno()), "rb")
+            self._output_reader = threading.Thread(
+                target=_read_output,
+                args=(stream, self._output_tail),
+                name=f"elasticsearch-{self.port}-output",
+                daemon=True,
+            )
+            self._output_reader.start()
+        return self
+
+    def start(self: ElasticSearchExecutorType) -> ElasticSearchExecutorType:
+        """Start elasticsearch process, or take over spawned one, and wait until it responds."""
+        if self.process is None:
+            self.spawn()
+        else:
+            # Spawned node might have been waiting for its fixture for a while.
+            self._set_timeout()
+        try:
+            self._wait_with_backoff(self.check_subprocess)
+        except ProcessExitedWithError as exc:
+            if self._output_reader is not None:
+                # Let the reader catch up with the output of the exited node.
+                self._output_reader.join(timeout=1)
+            self._check_startup()
+            raise NodeStartupError(
+                f"Elasticsearch node on port {self.port} has exited with code {exc.exit_code}:",
+                self._log_tail.excerpt() or self._output_tail.excerpt(),
+            ) from exc
+        return self
+
+    @property
+    def log_file(self) -> Path:
+        """Get node's server log file."""
+        return self.logs_path / f"{self.cluster_name}.log"
+
+    def _read_log(self) -> List[str]:
+        """Read complete lines logged by the node since the last call."""
+        if not self.log_file.exists():
+            return []
+        with open(self.log_file, "rb") as log:
+            log.seek(self._log_offset)
+            chunk = log.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        self._log_offset += len(complete)
+        lines = complete.decode("utf-8", errors="replace").splitlines()
+        for line in lines:
+            self._log_tail.append(line)
+        return lines
+
+    def _check_startup(self) -> None:
+        """Scan node's new log and output lines, failing as soon as it won't start.
+
+        :raises PortInUse: if the node has failed to bind its port
+        :raises NodeStartupError: if the node has reported a fatal failure
+        """
+        log_lines = self._read_log()
+        if self.startup_progress:
+            for line in log_lines:
+                self.startup_progress(line)
+        output_lines = self._output_tail.unread()
+        if any(BIND_FAILURE.search(line) for line in log_lines + output_lines):
+            raise PortInUse(f"Elasticsearch could not bind port {self.port}.")
+        for tail, lines in ((self._log_tail, log_lines), (self._output_tail, output_lines)):
+            if any(FATAL_FAILURE.search(line) for line in lines):
+                raise NodeStartupError(
+                    f"Elasticsearch node on port {self.port} has failed to start:",
+                    tail.excerpt(),
+                )
+
+    def _wait_with_backoff(self, wait_for: Callable[[], bool]) -> None:
+        """Wait for callback to return True, polling less often the longer it takes."""
+        delay = READINESS_POLL_INTERVAL[0]
+        while self.check_timeout():
+            if wait_for():
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, READINESS_POLL_INTERVAL[1])
+        self.kill()
+        raise TimeoutExpired(self, timeout=self._timeout)
+
+    def after_start_check(self) -> bool:
+        """Check if node responds, and its cluster has reached expected health status.
+
+        Health request waits on elasticsearch's side until the status is reached,
+        so the node is ready as soon as possible, not at the next poll.
+        """
+        try:
+            self._check_startup()
+        except (PortInUse, NodeStartupError):
+            self.kill()
+            raise
+        if not self.wait_for_status:
+            return super().after_start_check()
+        remaining = int(self._endtime - time.time()) if self._endtime else HEALTH_REQUEST_TIMEOUT
+        return health_reached(self.host, self.port, self.wait_for_status, remaining)
+
+    def detach(self) -> None:
+        """Leave the node running after this executor is gone."""
+        self.process = None
+
     @property
     def version(self) -> Version:
         """Get the given elasticsearch executable version parts.
@@ -86,23 +524,7 @@ class ElasticSearchExecutor(HTTPExecutor):
         :return: Elasticsearch version
         """
         if not self._version:
-            try:
-                output = check_output([self.executable, "-Vv"]).decode("utf-8")
-                match = re.search(r"Version: (?P<major>\d)\.(?P<minor>\d+)\.(?P<patch>\d+)", output)
-                if not match:
-                    raise RuntimeError(
-                        "Elasticsearch version is not recognized. "
-                        "It is probably not supported. \n"
-                        "Output is: " + output
-                    )
-                version = match.groupdict()
-                self._version = Version(
-                    ".".join([version["major"], version["minor"], version["patch"]])
-                )
-            except OSError as exc:
-                raise RuntimeError(
-                    "'%s' does not point to elasticsearch." % self.executable
-                ) from exc
+            self._version = read_version(self.executable)
         return self._version
 
     def _exec_command(self) -> str:
@@ -117,6 +539,12 @@ class ElasticSearchExecutor(HTTPExecutor):
             port_param = "transport.tcp.port"
         else:
             port_param = "transport.port"
+        settings = dict(self.settings)
+        if self.repo_path:
+            settings["path.repo"] = str(self.repo_path)
+        extra_settings = " ".join(
+            f"-E {name}={shlex.quote(str(value))}" for name, value in settings.items()
+        )
         return f"""
             {self.executable} -p {self.pidfile}
             -E http.port={self.port}
@@ -127,4 +555,5 @@ class ElasticSearchExecutor(HTTPExecutor):
             -E network.host='{self.network_publish_host}'
             -E index.store.type={self.index_store_type}
             -E xpack.security.enabled=false
+            {extra_settings}
         """
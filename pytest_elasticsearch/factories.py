@@ -16,20 +16,99 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pytest-elasticsearch.  If not, see <http://www.gnu.org/licenses/>.
 """Fixture factories."""
+import hashlib
+import os
 import shutil
+import time
 from pathlib import Path
-from typing import Callable, Iterator, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import pytest
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 from elasticsearch import __version__ as elastic_version
 from mirakuru import ProcessExitedWithError
+from packaging.version import Version
 from port_for import get_port
 from port_for.api import PortType
 from pytest import FixtureRequest, TempPathFactory
 
+from pytest_elasticsearch.cleanup import (
+    ClusterState,
+    async_cleanup_cluster,
+    async_cluster_state,
+    cleanup_cluster,
+    cluster_state,
+)
+from pytest_elasticsearch.client import (
+    AsyncNamespacedElasticsearch,
+    ElasticsearchProcess,
+    ElasticsearchType,
+    NamespacedElasticsearch,
+    client_view,
+    connection_pool_options,
+    new_namespace,
+    process_client,
+)
+from pytest_elasticsearch.clone import ClonedIndexElasticsearch, clone_index, new_clone_name
+from pytest_elasticsearch.cluster import ElasticsearchCluster
 from pytest_elasticsearch.config import get_config
-from pytest_elasticsearch.executor import ElasticSearchExecutor, NoopElasticsearch
+from pytest_elasticsearch.container import ContainerElasticsearch, default_image, image_version
+from pytest_elasticsearch.data_template import DataTemplate, DataTemplateSeed, data_template_key
+from pytest_elasticsearch.executor import (
+    TEST_PROFILE_SETTINGS,
+    ElasticSearchExecutor,
+    KeptElasticsearch,
+    NoopElasticsearch,
+    PortInUse,
+    SharedElasticsearch,
+    jvm_options,
+    process_running,
+    profile_settings,
+    read_version,
+)
+from pytest_elasticsearch.fake import FakeElasticsearch
+from pytest_elasticsearch.index_defaults import index_settings, install_index_template
+from pytest_elasticsearch.keep_alive import KEPT_NODES_DIR, KeptNode, KeptNodeState, settings_hash
+from pytest_elasticsearch.loader import DataSource, bulk_load
+from pytest_elasticsearch.ports import PortReservation, reserve_port
+from pytest_elasticsearch.profiling import get_profiler
+from pytest_elasticsearch.shared import (
+    SharedNode,
+    SharedNodeState,
+    worker_name,
+    xdist_slot,
+    xdist_worker,
+)
+from pytest_elasticsearch.snapshot import SeedSnapshot
+from pytest_elasticsearch.teardown import data_directory, remove_directories
+from pytest_elasticsearch.timing import get_timings
+
+Prestart = Callable[[FixtureRequest, TempPathFactory, str], Optional[ElasticSearchExecutor]]
+FixtureScope = Literal["session", "package", "module", "class", "function"]
+FixtureFunction = TypeVar("FixtureFunction", bound=Callable[..., Any])
+
+# Number of times a node is respawned on new ports, if its ports turn out to be taken.
+PORT_RETRIES = 3
+_PRESTART_ATTRIBUTE = "_pytest_elasticsearch_prestart"
+prestarted_key = pytest.StashKey[Dict[str, ElasticSearchExecutor]]()
+snapshots_key = pytest.StashKey[Dict[str, SeedSnapshot]]()
+baselines_key = pytest.StashKey[Dict[str, ClusterState]]()
+port_reservations_key = pytest.StashKey[Dict[int, PortReservation]]()
+clients_key = pytest.StashKey[Dict[Tuple[str, str, int, str, bool], Elasticsearch]]()
 
 
 def elasticsearch_proc(
@@ -40,7 +119,30 @@ def elasticsearch_proc(
     cluster_name: Optional[str] = None,
     network_publish_host: Optional[str] = None,
     index_store_type: Optional[str] = None,
-) -> Callable[[FixtureRequest, TempPathFactory], Iterator[ElasticSearchExecutor]]:
+    data_template: Optional[DataTemplateSeed] = None,
+    xdist_mode: Optional[str] = None,
+    xdist_pool_size: Optional[int] = None,
+    version: Optional[str] = None,
+    jvm_profile: Optional[str] = None,
+    heap_size: Optional[str] = None,
+    java_opts: Optional[str] = None,
+    envvars: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+    settings: Optional[Dict[str, str]] = None,
+    keep_alive: Optional[bool] = None,
+    wait_for_status: Optional[str] = None,
+    data_dir: Optional[Path] = None,
+    teardown: Optional[str] = None,
+    backend: Optional[str] = None,
+    image: Optional[str] = None,
+    container_runtime: Optional[str] = None,
+    startup_progress: Optional[Callable[[str], None]] = None,
+    index_defaults: Optional[str] = None,
+    refresh_interval: Optional[str] = None,
+) -> Callable[
+    [FixtureRequest, TempPathFactory],
+    Iterator[Union[ElasticSearchExecutor, SharedElasticsearch, ContainerElasticsearch]],
+]:
     """Create elasticsearch process fixture.
 
     :param executable: elasticsearch's executable
@@ -58,38 +160,117 @@ def elasticsearch_proc(
         http://www.elasticsearch.org/guide/en/elasticsearch/reference/current/modules-network.html
     :param index_store_type: index.store.type setting. *memory* by default
         to speed up tests
+    :param data_template: callable receiving Elasticsearch client to seed
+        the node with mappings and data. The first session stores seeded
+        data directory in a cache and later sessions start from its copy.
+    :param xdist_mode: how to run nodes under pytest-xdist:
+        *worker* - each worker starts its own node,
+        *shared* - all workers share a single node,
+        *pool* - workers share a pool of nodes, assigned round-robin
+    :param xdist_pool_size: number of nodes in the *pool* mode
+    :param version: elasticsearch version of the executable. Detected by
+        running the executable (cached between sessions) if not given.
+    :param jvm_profile: *default* to keep elasticsearch's JVM settings,
+        *test* for small heap, Class Data Sharing archive, C1 compiler only
+        and single-node discovery, to lower memory usage and boot time
+    :param heap_size: JVM heap size, e.g. *512m*
+    :param java_opts: additional JVM options
+    :param envvars: additional environment variables for elasticsearch process
+    :param profile: *default* to start a regular node, *ephemeral* for single-node
+        discovery, with ML, watcher, monitoring, GeoIP downloader and disk
+        allocation watermarks disabled
+    :param settings: additional elasticsearch settings, passed with ``-E``
+    :param keep_alive: leave the node running after the session,
+        for the next session to reattach to it
+    :param wait_for_status: cluster health status the node has to reach
+        before tests use it: *yellow*, *green* or *none* to only wait
+        until it responds to HTTP requests
+    :param data_dir: directory to create node's data directory in, e.g. a tmpfs
+        mount point. Nodes shared between pytest-xdist workers or kept alive
+        between sessions keep their data next to their state.
+    :param teardown: what happens to node's data and logs directories after it is stopped:
+        *delete* - removed right away, *background* - removed by a detached process
+        after moving them aside, *keep* - left for inspection
+    :param backend: *local* to run elasticsearch executable, *container* to run
+        elasticsearch image with Docker or Podman. Containers are neither shared
+        between pytest-xdist workers nor kept alive between sessions.
+    :param image: elasticsearch image of the *container* backend,
+        the official one matching installed client's version by default
+    :param container_runtime: container runtime executable, e.g. *docker* or *podman*
+    :param startup_progress: callback receiving every line the node logs while it's starting,
+        e.g. to report the progress of a slow start
+    :param index_defaults: *test* to install an index template giving indices created
+        by tests a single shard, no replicas and asynchronous translog,
+        *none* to leave elasticsearch's defaults (default)
+    :param refresh_interval: refresh interval of indices created by tests,
+        e.g. *-1* to refresh them only when asked to, elasticsearch's default if not given
     """
 
-    @pytest.fixture(scope="session")
-    def elasticsearch_proc_fixture(
-        request: FixtureRequest, tmp_path_factory: TempPathFactory
-    ) -> Iterator[ElasticSearchExecutor]:
-        """Elasticsearch process starting fixture."""
+    def create_elasticsearch(
+        request: FixtureRequest,
+        tmp_path_factory: TempPathFactory,
+        fixturename: str,
+        tmpdir: Optional[Path] = None,
+        shared: bool = False,
+        stable_cluster_name: bool = False,
+        exclude_ports: Sequence[int] = (),
+    ) -> ElasticSearchExecutor:
+        """Configure elasticsearch node executor, on ports other than excluded ones."""
         config = get_config(request)
+        timings = get_timings(request.config)
         elasticsearch_host = host or config["host"]
         elasticsearch_executable = executable or config["executable"]
 
-        elasticsearch_port = get_port(port) or get_port(config["port"])
-        assert elasticsearch_port
-        elasticsearch_transport_port = get_port(
-            transport_tcp_port, exclude_ports=[elasticsearch_port]
-        ) or get_port(config["transport_tcp_port"], exclude_ports=[elasticsearch_port])
-        assert elasticsearch_transport_port
+        http_reservation = _reserve_port(request, port, exclude_ports) or _reserve_port(
+            request, config["port"], exclude_ports
+        )
+        assert http_reservation
+        elasticsearch_port = http_reservation.port
+        transport_exclude_ports = [*exclude_ports, elasticsearch_port]
+        transport_reservation = _reserve_port(
+            request, transport_tcp_port, transport_exclude_ports
+        ) or _reserve_port(request, config["transport_tcp_port"], transport_exclude_ports)
+        assert transport_reservation
+        elasticsearch_transport_port = transport_reservation.port
 
-        elasticsearch_cluster_name = (
-            cluster_name or config["cluster_name"] or f"elasticsearch_cluster_{elasticsearch_port}"
+        # Cluster name is persisted in the data directory,
+        # so nodes started from a template or kept between sessions need a stable one.
+        default_cluster_name = (
+            f"elasticsearch_cluster_{fixturename}"
+            if data_template or stable_cluster_name
+            else f"elasticsearch_cluster_{elasticsearch_port}"
         )
+        elasticsearch_cluster_name = cluster_name or config["cluster_name"] or default_cluster_name
         assert elasticsearch_cluster_name
         elasticsearch_index_store_type = index_store_type or config["index_store_type"]
         elasticsearch_network_publish_host = network_publish_host or config["network_publish_host"]
-        tmpdir = tmp_path_factory.mktemp(f"pytest-elasticsearch-{request.fixturename}")
+        with timings.measure(fixturename, "version"):
+            elasticsearch_version = _elasticsearch_version(
+                request, elasticsearch_executable, version or config["version"]
+            )
+        elasticsearch_settings = _node_settings(
+            request, elasticsearch_version, jvm_profile, profile, settings
+        )
+        elasticsearch_envvars = _node_envvars(
+            request, elasticsearch_version, jvm_profile, heap_size, java_opts, envvars
+        )
+        readiness_status = wait_for_status or config["wait_for_status"]
+        node_data_dir = data_dir or config["data_dir"]
+        if tmpdir is None:
+            tmpdir = tmp_path_factory.mktemp(f"pytest-elasticsearch-{fixturename}")
+        else:
+            node_data_dir = None
 
         logs_path = tmpdir / "logs"
 
         pidfile = tmpdir / f"elasticsearch.{elasticsearch_port}.pid"
-        work_path = tmpdir / f"workdir_{elasticsearch_port}"
+        work_path = data_directory(
+            Path(node_data_dir) if node_data_dir else None,
+            tmpdir / f"workdir_{elasticsearch_port}",
+            f"pytest-elasticsearch-{fixturename}",
+        )
 
-        elasticsearch_executor = ElasticSearchExecutor(
+        return ElasticSearchExecutor(
             elasticsearch_executable,
             elasticsearch_host,
             elasticsearch_port,
@@ -101,18 +282,658 @@ def elasticsearch_proc(
             elasticsearch_network_publish_host,
             elasticsearch_index_store_type,
             timeout=60,
+            shared=shared,
+            version=elasticsearch_version,
+            settings=elasticsearch_settings,
+            envvars=elasticsearch_envvars,
+            repo_path=tmpdir / "snapshots",
+            wait_for_status=None if readiness_status == "none" else readiness_status,
+            startup_progress=startup_progress,
         )
 
-        elasticsearch_executor.start()
-        yield elasticsearch_executor
+    def spawn_executor(
+        request: FixtureRequest,
+        tmp_path_factory: TempPathFactory,
+        fixturename: str,
+        elasticsearch_executor: ElasticSearchExecutor,
+    ) -> ElasticSearchExecutor:
+        """Prepare node's data directory and spawn it, without waiting for it to respond."""
+        timings = get_timings(request.config)
+        if data_template:
+            template = DataTemplate(
+                _data_template_dir(
+                    request, tmp_path_factory, get_config(request)["data_template_dir"]
+                ),
+                data_template_key(
+                    str(elasticsearch_executor.version),
+                    {
+                        "cluster_name": elasticsearch_executor.cluster_name,
+                        "index_store_type": elasticsearch_executor.index_store_type,
+                        **elasticsearch_executor.settings,
+                        **test_index_settings(request),
+                    },
+                    data_template,
+                ),
+            )
+            with timings.measure(fixturename, "data template"):
+                if template.exists():
+                    template.restore(elasticsearch_executor.works_path)
+                else:
+                    _seed_data_template(
+                        elasticsearch_executor, data_template, test_index_settings(request)
+                    )
+                    template.save(elasticsearch_executor.works_path)
+
+        with timings.measure(fixturename, "spawn"):
+            return elasticsearch_executor.spawn()
+
+    def spawn_elasticsearch(
+        request: FixtureRequest,
+        tmp_path_factory: TempPathFactory,
+        fixturename: str,
+        tmpdir: Optional[Path] = None,
+        shared: bool = False,
+    ) -> ElasticSearchExecutor:
+        """Spawn elasticsearch node, without waiting for it to respond."""
+        return spawn_executor(
+            request,
+            tmp_path_factory,
+            fixturename,
+            create_elasticsearch(request, tmp_path_factory, fixturename, tmpdir, shared),
+        )
+
+    def start_elasticsearch(
+        request: FixtureRequest,
+        tmp_path_factory: TempPathFactory,
+        fixturename: str,
+        elasticsearch_executor: ElasticSearchExecutor,
+        tmpdir: Optional[Path] = None,
+        shared: bool = False,
+        stable_cluster_name: bool = False,
+    ) -> ElasticSearchExecutor:
+        """Wait for spawned node to start, respawning it on new ports if its ports were taken."""
+        timings = get_timings(request.config)
+        # Ports taken by some other process might still be taken when released.
+        failed_ports: List[int] = []
+        for _ in range(PORT_RETRIES):
+            try:
+                with timings.measure(fixturename, "readiness"):
+                    return elasticsearch_executor.start()
+            except PortInUse:
+                _stop_elasticsearch(elasticsearch_executor)
+                _release_ports(request, elasticsearch_executor)
+                failed_ports.extend((elasticsearch_executor.port, elasticsearch_executor.tcp_port))
+                shutil.rmtree(elasticsearch_executor.works_path, ignore_errors=True)
+                elasticsearch_executor = spawn_executor(
+                    request,
+                    tmp_path_factory,
+                    fixturename,
+                    create_elasticsearch(
+                        request,
+                        tmp_path_factory,
+                        fixturename,
+                        tmpdir,
+                        shared,
+                        stable_cluster_name,
+                        failed_ports,
+                    ),
+                )
+        with timings.measure(fixturename, "readiness"):
+            return elasticsearch_executor.start()
+
+    def test_index_settings(request: FixtureRequest) -> Dict[str, str]:
+        """Get settings the node's index template gives to indices, empty if it's not installed."""
+        config = get_config(request)
+        if (index_defaults or config["index_defaults"]) == "none":
+            return {}
+        return index_settings(refresh_interval or config["refresh_interval"])
+
+    def install_index_defaults(request: FixtureRequest, process: ElasticsearchProcess) -> None:
+        """Install index template with test indices' settings on the node, unless disabled."""
+        template_settings = test_index_settings(request)
+        if not template_settings:
+            return
+        client = process_client(process)
         try:
-            elasticsearch_executor.stop()
+            install_index_template(client, template_settings)
+        finally:
+            client.close()
+
+    def kept_nodes_dir(request: FixtureRequest) -> Optional[Path]:
+        """Get directory of nodes kept between sessions, None if they should not be kept."""
+        enabled = keep_alive if keep_alive is not None else get_config(request)["keep_alive"]
+        cache = getattr(request.config, "cache", None)
+        if not enabled or cache is None:
+            return None
+        return Path(cache.mkdir(KEPT_NODES_DIR))
+
+    def keep_elasticsearch_alive(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory, fixturename: str, path: Path
+    ) -> Iterator[Union[ElasticSearchExecutor, KeptElasticsearch]]:
+        """Reattach to the node kept by a previous session, or start one and keep it running."""
+        node = KeptNode(path / f"{fixturename}-{xdist_worker() or 'main'}")
+        kept_executor: Union[ElasticSearchExecutor, KeptElasticsearch, None]
+        with node.locked():
+            elasticsearch_executor = create_elasticsearch(
+                request,
+                tmp_path_factory,
+                fixturename,
+                node.path,
+                shared=True,
+                stable_cluster_name=True,
+            )
+            expected_hash = settings_hash(elasticsearch_executor, data_template)
+            kept_executor = node.attach(expected_hash)
+            if kept_executor is None:
+                node.stop()
+                kept_executor = start_elasticsearch(
+                    request,
+                    tmp_path_factory,
+                    fixturename,
+                    spawn_executor(request, tmp_path_factory, fixturename, elasticsearch_executor),
+                    node.path,
+                    shared=True,
+                    stable_cluster_name=True,
+                )
+                assert kept_executor.process
+                node.write(
+                    KeptNodeState(
+                        host=kept_executor.host,
+                        port=kept_executor.port,
+                        transport_port=kept_executor.tcp_port,
+                        pid=kept_executor.process.pid,
+                        version=str(kept_executor.version),
+                        settings_hash=expected_hash,
+                        repo_path=str(kept_executor.repo_path),
+                    )
+                )
+        install_index_defaults(request, kept_executor)
+
+        yield kept_executor
+        if isinstance(kept_executor, ElasticSearchExecutor):
+            kept_executor.detach()
+
+    def container_elasticsearch(
+        request: FixtureRequest, fixturename: str
+    ) -> Iterator[ContainerElasticsearch]:
+        """Run elasticsearch container for the session."""
+        config = get_config(request)
+        timings = get_timings(request.config)
+        container_image = image or config["image"] or default_image()
+        declared_version = version or config["version"]
+        elasticsearch_version = (
+            Version(declared_version) if declared_version else image_version(container_image)
+        )
+        elasticsearch_port = get_port(port) or get_port(config["port"])
+        assert elasticsearch_port
+        container_settings = {
+            "discovery.type": "single-node",
+            **_node_settings(request, elasticsearch_version, jvm_profile, profile, settings),
+        }
+        container_envvars = _parse_assignments(config["envvars"])
+        container_envvars.update(envvars or {})
+        container_java_opts = jvm_options(
+            jvm_profile or config["jvm_profile"],
+            heap_size or config["heap_size"],
+            java_opts or config["java_opts"],
+        )
+        if container_java_opts:
+            container_envvars["ES_JAVA_OPTS"] = container_java_opts
+        readiness_status = wait_for_status or config["wait_for_status"]
+        container = ContainerElasticsearch(
+            container_runtime or config["container_runtime"],
+            container_image,
+            host or config["host"],
+            elasticsearch_port,
+            f"pytest-elasticsearch-{fixturename}-{elasticsearch_port}",
+            cluster_name or config["cluster_name"] or f"elasticsearch_cluster_{elasticsearch_port}",
+            timeout=120,
+            settings=container_settings,
+            envvars=container_envvars,
+            wait_for_status=None if readiness_status == "none" else readiness_status,
+        )
+        with timings.measure(fixturename, "readiness"):
+            container.start()
+        install_index_defaults(request, container)
+        yield container
+        with timings.measure(fixturename, "stop"):
+            container.stop()
+
+    def get_xdist_slot(request: FixtureRequest) -> Optional[int]:
+        """Get pytest-xdist shared node slot, None if node is not shared."""
+        config = get_config(request)
+        return xdist_slot(
+            xdist_mode or config["xdist_mode"],
+            int(xdist_pool_size or config["xdist_pool_size"] or 1),
+        )
+
+    def prestart_elasticsearch(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory, fixturename: str
+    ) -> Optional[ElasticSearchExecutor]:
+        """Spawn elasticsearch node ahead of its fixture, unless it is a shared or kept one."""
+        if (backend or get_config(request)["backend"]) == "container":
+            return None
+        if get_xdist_slot(request) is not None or kept_nodes_dir(request) is not None:
+            return None
+        return spawn_elasticsearch(request, tmp_path_factory, fixturename)
+
+    @pytest.fixture(scope="session")
+    @_prestartable(prestart_elasticsearch)
+    def elasticsearch_proc_fixture(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory
+    ) -> Iterator[Union[ElasticSearchExecutor, SharedElasticsearch, ContainerElasticsearch]]:
+        """Elasticsearch process starting fixture."""
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        if (backend or get_config(request)["backend"]) == "container":
+            yield from container_elasticsearch(request, fixturename)
+            return
+        elasticsearch_xdist_slot = get_xdist_slot(request)
+
+        if elasticsearch_xdist_slot is None:
+            kept_path = kept_nodes_dir(request)
+            if kept_path is not None:
+                yield from keep_elasticsearch_alive(
+                    request, tmp_path_factory, fixturename, kept_path
+                )
+                return
+            if get_config(request)["parallel_start"]:
+                _prestart_process_fixtures(request, tmp_path_factory)
+            elasticsearch_executor = _pop_prestarted(request, fixturename) or spawn_elasticsearch(
+                request, tmp_path_factory, fixturename
+            )
+            elasticsearch_executor = start_elasticsearch(
+                request, tmp_path_factory, fixturename, elasticsearch_executor
+            )
+            install_index_defaults(request, elasticsearch_executor)
+            yield elasticsearch_executor
+            with timings.measure(fixturename, "stop"):
+                _stop_elasticsearch(elasticsearch_executor)
+            with timings.measure(fixturename, "rmtree"):
+                remove_directories(
+                    request,
+                    [elasticsearch_executor.works_path, elasticsearch_executor.logs_path],
+                    teardown or get_config(request)["teardown"],
+                    get_config(request)["keep_on_failure"],
+                )
+            return
+
+        # Under pytest-xdist, parent of worker's basetemp is common to all workers.
+        worker = xdist_worker()
+        assert worker
+        node = SharedNode(
+            tmp_path_factory.getbasetemp().parent
+            / f"pytest-elasticsearch-{fixturename}-{elasticsearch_xdist_slot}"
+        )
+        shared_executor: Union[ElasticSearchExecutor, SharedElasticsearch]
+        with node.locked():
+            state = node.read()
+            if state is None or not process_running(state["pid"]):
+                shared_executor = start_elasticsearch(
+                    request,
+                    tmp_path_factory,
+                    fixturename,
+                    spawn_elasticsearch(
+                        request, tmp_path_factory, fixturename, node.path, shared=True
+                    ),
+                    node.path,
+                    shared=True,
+                )
+                shared_executor.xdist_shared = True
+                install_index_defaults(request, shared_executor)
+                assert shared_executor.process
+                state = SharedNodeState(
+                    host=shared_executor.host,
+                    port=shared_executor.port,
+                    pid=shared_executor.process.pid,
+                    repo_path=str(shared_executor.repo_path),
+                    workers=[],
+                )
+            else:
+                shared_executor = SharedElasticsearch(
+                    state["host"], state["port"], state["pid"], Path(state["repo_path"])
+                )
+            state["workers"].append(worker)
+            node.write(state)
+
+        yield shared_executor
+
+        with node.locked():
+            state = node.read()
+            assert state
+            state["workers"].remove(worker)
+            if state["workers"]:
+                node.write(state)
+                if isinstance(shared_executor, ElasticSearchExecutor):
+                    shared_executor.detach()
+            else:
+                with timings.measure(fixturename, "stop"):
+                    _stop_elasticsearch(shared_executor)
+                node.remove()
+
+    return elasticsearch_proc_fixture
+
+
+def _reserve_port(
+    request: FixtureRequest, ports: Optional[PortType], exclude_ports: Sequence[int] = ()
+) -> Optional[PortReservation]:
+    """Reserve a port for the session, so other processes don't select it."""
+    reservation = reserve_port(ports, exclude_ports)
+    if reservation is not None:
+        request.config.stash.setdefault(port_reservations_key, {})[reservation.port] = reservation
+        request.config.add_cleanup(reservation.release)
+    return reservation
+
+
+def _release_ports(request: FixtureRequest, executor: ElasticSearchExecutor) -> None:
+    """Release ports reserved for the node."""
+    reservations = request.config.stash.get(port_reservations_key, {})
+    for node_port in (executor.port, executor.tcp_port):
+        reservation = reservations.pop(node_port, None)
+        if reservation is not None:
+            reservation.release()
+
+
+def _stop_elasticsearch(executor: Union[ElasticSearchExecutor, SharedElasticsearch]) -> None:
+    """Stop elasticsearch node."""
+    try:
+        executor.stop()
+    except ProcessExitedWithError:
+        pass
+
+
+def _prestartable(prestart: Prestart) -> Callable[[FixtureFunction], FixtureFunction]:
+    """Mark process fixture function as one that can be spawned ahead of its use."""
+
+    def mark(fixture_function: FixtureFunction) -> FixtureFunction:
+        setattr(fixture_function, _PRESTART_ATTRIBUTE, prestart)
+        return fixture_function
+
+    return mark
+
+
+def _prestart_process_fixtures(request: FixtureRequest, tmp_path_factory: TempPathFactory) -> None:
+    """Spawn nodes of all process fixtures used within the session at once.
+
+    Nodes boot simultaneously, and each fixture only waits for its node
+    when requested, so the session waits for the slowest node to boot,
+    instead of all of them one after another.
+    """
+    if prestarted_key in request.config.stash:
+        return
+    prestarted: Dict[str, ElasticSearchExecutor] = {}
+    request.config.stash[prestarted_key] = prestarted
+    for item in request.session.items:
+        fixtureinfo = getattr(item, "_fixtureinfo", None)
+        if fixtureinfo is None:
+            continue
+        for name in fixtureinfo.names_closure:
+            fixturedefs = fixtureinfo.name2fixturedefs.get(name)
+            if name in prestarted or not fixturedefs:
+                continue
+            prestart = getattr(fixturedefs[-1].func, _PRESTART_ATTRIBUTE, None)
+            if prestart is None:
+                continue
+            executor = prestart(request, tmp_path_factory, name)
+            if executor is not None:
+                prestarted[name] = executor
+
+    def stop_unused() -> None:
+        """Stop nodes that were spawned, but never requested by their fixtures."""
+        for executor in prestarted.values():
+            _stop_elasticsearch(executor)
+            shutil.rmtree(executor.works_path, ignore_errors=True)
+            shutil.rmtree(executor.logs_path, ignore_errors=True)
+
+    request.addfinalizer(stop_unused)
+
+
+def _pop_prestarted(request: FixtureRequest, fixturename: str) -> Optional[ElasticSearchExecutor]:
+    """Take node spawned ahead of its fixture, if there is one."""
+    return request.config.stash.get(prestarted_key, {}).pop(fixturename, None)
+
+
+def _elasticsearch_version(
+    request: FixtureRequest, executable: Path, declared: Optional[str]
+) -> Version:
+    """Get elasticsearch version, without starting a JVM if possible.
+
+    Version detected by running the executable is cached in pytest's cache,
+    keyed by the executable's resolved path, modification time and size.
+    """
+    if declared:
+        return Version(declared)
+    cache = getattr(request.config, "cache", None)
+    resolved = Path(executable).resolve()
+    try:
+        executable_stat = resolved.stat()
+    except OSError:
+        # Let the executor report a missing executable.
+        cache = None
+    if cache is None:
+        return read_version(executable)
+    fingerprint = f"{resolved}:{executable_stat.st_mtime_ns}:{executable_stat.st_size}"
+    cache_key = (
+        "pytest_elasticsearch/version/"
+        f"{hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]}"
+    )
+    cached_version = cache.get(cache_key, None)
+    if cached_version:
+        return Version(cached_version)
+    detected_version = read_version(executable)
+    cache.set(cache_key, str(detected_version))
+    return detected_version
+
+
+def _node_settings(
+    request: FixtureRequest,
+    version: Version,
+    jvm_profile: Optional[str],
+    profile: Optional[str],
+    settings: Optional[Dict[str, str]],
+) -> Dict[str, str]:
+    """Compose elasticsearch settings of a node from profiles and configured settings."""
+    config = get_config(request)
+    node_settings = (
+        dict(TEST_PROFILE_SETTINGS) if (jvm_profile or config["jvm_profile"]) == "test" else {}
+    )
+    node_settings.update(profile_settings(profile or config["profile"], version))
+    node_settings.update(_parse_assignments(config["settings"]))
+    node_settings.update(settings or {})
+    return node_settings
+
+
+def _node_envvars(
+    request: FixtureRequest,
+    version: Version,
+    jvm_profile: Optional[str],
+    heap_size: Optional[str],
+    java_opts: Optional[str],
+    envvars: Optional[Dict[str, str]],
+) -> Dict[str, str]:
+    """Compose environment variables of a node, including its JVM options."""
+    config = get_config(request)
+    node_envvars = _parse_assignments(config["envvars"])
+    node_envvars.update(envvars or {})
+    node_java_opts = jvm_options(
+        jvm_profile or config["jvm_profile"],
+        heap_size or config["heap_size"],
+        java_opts or config["java_opts"],
+        _cds_archive(request, version),
+    )
+    if node_java_opts:
+        # Options given later take precedence within the JVM.
+        node_envvars["ES_JAVA_OPTS"] = " ".join(
+            filter(
+                None,
+                (
+                    node_envvars.get("ES_JAVA_OPTS", os.environ.get("ES_JAVA_OPTS")),
+                    node_java_opts,
+                ),
+            )
+        )
+    return node_envvars
+
+
+def _parse_assignments(assignments: Optional[List[str]]) -> Dict[str, str]:
+    """Parse ``NAME=value`` lines of ini/command line options."""
+    return dict(assignment.split("=", 1) for assignment in assignments or [] if "=" in assignment)
+
+
+def _cds_archive(request: FixtureRequest, version: Version) -> Optional[Path]:
+    """Get Class Data Sharing archive path, kept in pytest's cache between sessions."""
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return None
+    return Path(cache.mkdir("pytest-elasticsearch-cds")) / f"elasticsearch-{version}.jsa"
+
+
+def _data_template_dir(
+    request: FixtureRequest, tmp_path_factory: TempPathFactory, configured: str
+) -> Path:
+    """Get directory to store data templates in."""
+    if configured:
+        return Path(configured)
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        # Cache plugin is disabled, templates will be reused within the session only.
+        return tmp_path_factory.getbasetemp() / "elasticsearch-data-templates"
+    return Path(cache.mkdir("pytest-elasticsearch-data-templates"))
+
+
+def _seed_data_template(
+    executor: ElasticSearchExecutor,
+    seed: DataTemplateSeed,
+    template_settings: Optional[Dict[str, str]] = None,
+) -> None:
+    """Bootstrap a node, seed it and stop it cleanly, to keep its data directory.
+
+    :param executor: node to seed
+    :param seed: callable seeding the node
+    :param template_settings: settings of the index template installed before seeding
+    """
+    executor.start()
+    client = process_client(executor)
+    try:
+        if template_settings:
+            install_index_template(client, template_settings)
+        seed(client)
+        client.indices.flush()
+    finally:
+        client.close()
+        try:
+            executor.stop()
         except ProcessExitedWithError:
             pass
-        shutil.rmtree(work_path)
-        shutil.rmtree(logs_path)
 
-    return elasticsearch_proc_fixture
+
+def elasticsearch_cluster(
+    nodes: int = 3,
+    executable: Optional[Path] = None,
+    host: Optional[str] = None,
+    cluster_name: Optional[str] = None,
+    network_publish_host: Optional[str] = None,
+    index_store_type: Optional[str] = None,
+    version: Optional[str] = None,
+    jvm_profile: Optional[str] = None,
+    heap_size: Optional[str] = None,
+    java_opts: Optional[str] = None,
+    envvars: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+    settings: Optional[Dict[str, str]] = None,
+    wait_for_status: str = "green",
+) -> Callable[[FixtureRequest, TempPathFactory], Iterator[ElasticsearchCluster]]:
+    """Create fixture starting a cluster of several elasticsearch nodes.
+
+    Client fixtures can use it as a process fixture.
+
+    :param nodes: number of nodes, all of them master eligible
+    :param executable: elasticsearch's executable
+    :param host: host that the nodes listen on
+    :param cluster_name: name of the cluster
+    :param network_publish_host: host the nodes publish themselves within the cluster
+    :param index_store_type: index.store.type setting
+    :param version: elasticsearch version of the executable
+    :param jvm_profile: *default* or *test* JVM profile, see :func:`elasticsearch_proc`
+    :param heap_size: JVM heap size of each node, e.g. *512m*
+    :param java_opts: additional JVM options
+    :param envvars: additional environment variables for elasticsearch processes
+    :param profile: *default* or *ephemeral* settings profile, see :func:`elasticsearch_proc`.
+        Single-node discovery is never used, even if a profile sets it.
+    :param settings: additional elasticsearch settings of each node
+    :param wait_for_status: cluster health status to wait for after starting the nodes
+    """
+
+    @pytest.fixture(scope="session")
+    def elasticsearch_cluster_fixture(
+        request: FixtureRequest, tmp_path_factory: TempPathFactory
+    ) -> Iterator[ElasticsearchCluster]:
+        """Elasticsearch cluster starting fixture."""
+        fixturename = request.fixturename
+        assert fixturename
+        config = get_config(request)
+        timings = get_timings(request.config)
+        elasticsearch_host = host or config["host"]
+        elasticsearch_executable = executable or config["executable"]
+        with timings.measure(fixturename, "version"):
+            elasticsearch_version = _elasticsearch_version(
+                request, elasticsearch_executable, version or config["version"]
+            )
+        node_settings = _node_settings(
+            request, elasticsearch_version, jvm_profile, profile, settings
+        )
+        node_settings.pop("discovery.type", None)
+        node_envvars = _node_envvars(
+            request, elasticsearch_version, jvm_profile, heap_size, java_opts, envvars
+        )
+
+        used_ports: List[int] = []
+        for _ in range(nodes * 2):
+            free_port = get_port(None, exclude_ports=used_ports)
+            assert free_port
+            used_ports.append(free_port)
+        http_ports, transport_ports = used_ports[:nodes], used_ports[nodes:]
+        node_names = [f"{fixturename}-{number}" for number in range(nodes)]
+        cluster_settings = {
+            "discovery.seed_hosts": ",".join(
+                f"{elasticsearch_host}:{transport_port}" for transport_port in transport_ports
+            ),
+            "cluster.initial_master_nodes": ",".join(node_names),
+        }
+
+        tmpdir = tmp_path_factory.mktemp(f"pytest-elasticsearch-{fixturename}")
+        repo_path = tmpdir / "snapshots"
+        executors = [
+            ElasticSearchExecutor(
+                elasticsearch_executable,
+                elasticsearch_host,
+                http_port,
+                transport_port,
+                tmpdir / f"elasticsearch.{http_port}.pid",
+                tmpdir / node_name / "logs",
+                tmpdir / node_name / "data",
+                cluster_name or config["cluster_name"] or f"elasticsearch_cluster_{fixturename}",
+                network_publish_host or config["network_publish_host"],
+                index_store_type or config["index_store_type"],
+                timeout=60,
+                version=elasticsearch_version,
+                settings={**node_settings, **cluster_settings, "node.name": node_name},
+                envvars=node_envvars,
+                repo_path=repo_path,
+            )
+            for node_name, http_port, transport_port in zip(node_names, http_ports, transport_ports)
+        ]
+        cluster = ElasticsearchCluster(executors, repo_path)
+        with timings.measure(fixturename, "readiness"):
+            cluster.start(wait_for_status)
+        yield cluster
+        with timings.measure(fixturename, "stop"):
+            cluster.stop()
+        with timings.measure(fixturename, "rmtree"):
+            remove_directories(request, [tmpdir], config["teardown"], config["keep_on_failure"])
+
+    return elasticsearch_cluster_fixture
 
 
 def elasticsearch_noproc(
@@ -144,28 +965,368 @@ def elasticsearch_noproc(
     return elasticsearch_noproc_fixture
 
 
-def elasticsearch(process_fixture_name: str) -> Callable[[FixtureRequest], Iterator[Elasticsearch]]:
+def elasticsearch_fakeproc(
+    host: Optional[str] = None, port: Optional[PortType] = None, version: Optional[str] = None
+) -> Callable[[FixtureRequest], Iterator[FakeElasticsearch]]:
+    """Fake elasticsearch process factory.
+
+    Serves a subset of elasticsearch's HTTP API from a thread of the test process,
+    for tests that only index, get and search a handful of documents.
+
+    :param host: hostname
+    :param port: exact port (e.g. '8000', 8000), randomly selected by default
+    :param version: elasticsearch version to report,
+        the one matching installed client by default
+    :returns: function which makes a fake elasticsearch process
+    """
+
+    @pytest.fixture(scope="session")
+    def elasticsearch_fakeproc_fixture(request: FixtureRequest) -> Iterator[FakeElasticsearch]:
+        """Fake elasticsearch process fixture."""
+        config = get_config(request)
+        fixturename = request.fixturename
+        assert fixturename
+        es_host = host or config["host"]
+        assert es_host
+        fake = FakeElasticsearch(es_host, get_port(port) or 0, version)
+        with get_timings(request.config).measure(fixturename, "readiness"):
+            fake.start()
+        yield fake
+        fake.stop()
+
+    return elasticsearch_fakeproc_fixture
+
+
+def elasticsearch(
+    process_fixture_name: str,
+    namespace: bool = False,
+    connections_per_node: Optional[int] = None,
+    cleanup: Optional[str] = None,
+    profile_requests: Optional[bool] = None,
+) -> Callable[[FixtureRequest], Iterator[Elasticsearch]]:
     """Create Elasticsearch client fixture.
 
+    Tests get a lightweight view of a client created once per session,
+    so they share its transport and connection pool.
+
     :param process_fixture_name: elasticsearch process fixture name
+    :param namespace: whether to give each test a unique index prefix,
+        available as client's ``namespace`` attribute. Only indices
+        within the namespace are removed after the test.
+    :param connections_per_node: size of the connection pool, per node
+    :param cleanup: what to remove after each test, unless the client is namespaced:
+        *indices* - all indices,
+        *sweep* - all indices, data streams, aliases, index and component templates
+        and ingest pipelines,
+        *baseline* - all of these that were not there before the first test
+    :param profile_requests: whether to record client's requests, reported at the end
+        of the session, enabled by ``--elasticsearch-requests-report`` by default
     """
 
     @pytest.fixture
     def elasticsearch_fixture(request: FixtureRequest) -> Iterator[Elasticsearch]:
         """Elasticsearch client fixture."""
         process = request.getfixturevalue(process_fixture_name)
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        setup_start = time.perf_counter()
         if not process.running():
             process.start()
-        client = Elasticsearch(
-            hosts=[{"host": process.host, "port": process.port, "scheme": "http"}],
-            request_timeout=30,
-            verify_certs=False,
+        # Shared nodes are used by other pytest-xdist workers at the same time.
+        namespaced = namespace or getattr(process, "xdist_shared", False)
+        client_class = NamespacedElasticsearch if namespaced else Elasticsearch
+        config = get_config(request)
+        search_profiles = config["search_profiles"]
+        profiling = profile_requests if profile_requests is not None else config["requests_report"]
+        pooled = _pooled_client(
+            request,
+            process_fixture_name,
+            process,
+            client_class,
+            connections_per_node or config["connections_per_node"],
+            profiled=bool(profiling or search_profiles),
         )
+        if profiling or search_profiles:
+            get_profiler(request.config).instrument(pooled, search_profiles)
+        client = client_view(pooled)
         if elastic_version >= (8, 0, 0):
             client.options(ignore_status=400)
 
+        if isinstance(client, NamespacedElasticsearch):
+            client.namespace = new_namespace()
+        cleanup_strategy = cleanup or get_config(request)["cleanup"]
+        baseline = None
+        if cleanup_strategy == "baseline":
+            baselines = request.config.stash.setdefault(baselines_key, {})
+            if process_fixture_name not in baselines:
+                baselines[process_fixture_name] = cluster_state(client)
+            baseline = baselines[process_fixture_name]
+        timings.record(fixturename, "setup", time.perf_counter() - setup_start)
+
         yield client
-        for index in client.indices.get_alias():
-            client.indices.delete(index=index)
+        with timings.measure(fixturename, "cleanup"):
+            if isinstance(client, NamespacedElasticsearch):
+                client.delete_namespace()
+            else:
+                cleanup_cluster(client, cleanup_strategy, baseline)
 
     return elasticsearch_fixture
+
+
+def async_elasticsearch(
+    process_fixture_name: str, namespace: bool = False, cleanup: Optional[str] = None
+) -> Callable[[FixtureRequest], AsyncIterator[AsyncElasticsearch]]:
+    """Create AsyncElasticsearch client fixture.
+
+    Requires pytest-asyncio and async support of elasticsearch client,
+    installed with ``pytest-elasticsearch[async]``. Async clients are
+    bound to the event loop, so each test gets its own.
+
+    :param process_fixture_name: elasticsearch process fixture name
+    :param namespace: whether to give each test a unique index prefix,
+        available as client's ``namespace`` attribute. Only indices
+        within the namespace are removed after the test.
+    :param cleanup: what to remove after each test, unless the client is namespaced,
+        see :func:`elasticsearch`
+    """
+    try:
+        import pytest_asyncio
+    except ImportError as exc:
+        raise ImportError(
+            "async_elasticsearch fixtures require pytest-asyncio, "
+            "install pytest-elasticsearch[async]."
+        ) from exc
+
+    @pytest_asyncio.fixture
+    async def async_elasticsearch_fixture(
+        request: FixtureRequest,
+    ) -> AsyncIterator[AsyncElasticsearch]:
+        """AsyncElasticsearch client fixture."""
+        process = request.getfixturevalue(process_fixture_name)
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        setup_start = time.perf_counter()
+        if not process.running():
+            process.start()
+        namespaced = namespace or getattr(process, "xdist_shared", False)
+        client_class = AsyncNamespacedElasticsearch if namespaced else AsyncElasticsearch
+        client = client_class(
+            hosts=[{"host": process.host, "port": process.port, "scheme": "http"}],
+            request_timeout=30,
+            verify_certs=False,
+        )
+        if isinstance(client, AsyncNamespacedElasticsearch):
+            client.namespace = new_namespace()
+        cleanup_strategy = cleanup or get_config(request)["cleanup"]
+        baseline = None
+        if cleanup_strategy == "baseline":
+            baselines = request.config.stash.setdefault(baselines_key, {})
+            if process_fixture_name not in baselines:
+                baselines[process_fixture_name] = await async_cluster_state(client)
+            baseline = baselines[process_fixture_name]
+        timings.record(fixturename, "setup", time.perf_counter() - setup_start)
+
+        yield client
+        with timings.measure(fixturename, "cleanup"):
+            try:
+                if isinstance(client, AsyncNamespacedElasticsearch):
+                    await client.delete_namespace()
+                else:
+                    await async_cleanup_cluster(client, cleanup_strategy, baseline)
+            finally:
+                await client.close()
+
+    return async_elasticsearch_fixture
+
+
+def _pooled_client(
+    request: FixtureRequest,
+    process_fixture_name: str,
+    process: ElasticsearchProcess,
+    client_class: Type[ElasticsearchType],
+    connections_per_node: Optional[Union[int, str]],
+    profiled: bool = False,
+) -> ElasticsearchType:
+    """Get client of the process fixture's node, created once per session.
+
+    Requests are recorded on the client's transport, shared by all its views,
+    so fixtures profiling their requests get a client of their own.
+    """
+    clients = request.config.stash.setdefault(clients_key, {})
+    key = (process_fixture_name, process.host, process.port, client_class.__name__, profiled)
+    if key not in clients:
+        client = process_client(
+            process,
+            client_class,
+            **connection_pool_options(int(connections_per_node or 0)),
+        )
+        request.config.add_cleanup(client.close)
+        clients[key] = client
+    pooled = clients[key]
+    assert isinstance(pooled, client_class)
+    return pooled
+
+
+def elasticsearch_data(
+    process_fixture_name: str,
+    source: DataSource,
+    index: str,
+    scope: FixtureScope = "function",
+    chunk_size: int = 500,
+    thread_count: int = 1,
+    mappings: Optional[Dict[str, Any]] = None,
+) -> Callable[[FixtureRequest], Iterator[str]]:
+    """Create fixture bulk loading data into an index.
+
+    :param process_fixture_name: elasticsearch process fixture name
+    :param source: NDJSON file path, or a callable returning documents
+        (e.g. a generator function)
+    :param index: index to load documents into, removed at fixture's teardown.
+        On nodes shared between pytest-xdist workers, it's prefixed with the worker id,
+        so tests should use the name the fixture returns.
+    :param scope: fixture scope
+    :param chunk_size: number of documents sent within one bulk request
+    :param thread_count: number of threads sending bulk requests in parallel
+    :param mappings: mappings to create the index with
+    """
+
+    @pytest.fixture(scope=scope)
+    def elasticsearch_data_fixture(request: FixtureRequest) -> Iterator[str]:
+        """Elasticsearch data fixture, returning name of the loaded index."""
+        process = request.getfixturevalue(process_fixture_name)
+        if not process.running():
+            process.start()
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        data_index = worker_name(index, getattr(process, "xdist_shared", False))
+        client = process_client(process, request_timeout=120)
+        with timings.measure(fixturename, "load"):
+            bulk_load(
+                client,
+                source,
+                data_index,
+                chunk_size=chunk_size,
+                thread_count=thread_count,
+                mappings=mappings,
+            )
+        yield data_index
+        with timings.measure(fixturename, "cleanup"):
+            client.indices.delete(index=data_index, ignore_unavailable=True)
+        client.close()
+
+    return elasticsearch_data_fixture
+
+
+def elasticsearch_index(
+    process_fixture_name: str,
+    data_fixture_name: str,
+    alias: Optional[str] = None,
+    connections_per_node: Optional[int] = None,
+) -> Callable[[FixtureRequest], Iterator[ClonedIndexElasticsearch]]:
+    """Create client fixture giving each test its own clone of a seeded index.
+
+    Source index is loaded by the data fixture once within its scope, e.g. once per module,
+    made read-only and cloned for every test. Only the clone is removed after the test,
+    so read-heavy tests don't pay for seeding the index again.
+
+    :param process_fixture_name: elasticsearch process fixture name
+    :param data_fixture_name: name of :func:`elasticsearch_data` fixture loading the source index,
+        usually with module or class scope
+    :param alias: alias pointing to the clone, so tests can use the same index name.
+        On nodes shared between pytest-xdist workers, it's prefixed with the worker id,
+        so tests should use client's ``index_name`` attribute.
+    :param connections_per_node: size of the connection pool, per node
+    """
+
+    @pytest.fixture
+    def elasticsearch_index_fixture(request: FixtureRequest) -> Iterator[ClonedIndexElasticsearch]:
+        """Elasticsearch client fixture, owning a clone of seeded index."""
+        process = request.getfixturevalue(process_fixture_name)
+        source = request.getfixturevalue(data_fixture_name)
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        client = client_view(
+            _pooled_client(
+                request,
+                process_fixture_name,
+                process,
+                ClonedIndexElasticsearch,
+                connections_per_node or get_config(request)["connections_per_node"],
+            )
+        )
+        clone_alias = alias and worker_name(alias, getattr(process, "xdist_shared", False))
+        client.source_index = source
+        client.cloned_index = new_clone_name(source)
+        client.index_name = clone_alias or client.cloned_index
+        with timings.measure(fixturename, "clone"):
+            clone_index(client, source, client.cloned_index, clone_alias)
+        yield client
+        with timings.measure(fixturename, "cleanup"):
+            client.delete_clone()
+
+    return elasticsearch_index_fixture
+
+
+def elasticsearch_reset(
+    process_fixture_name: str,
+    data_fixture_names: Sequence[str] = (),
+    indices: Sequence[str] = (),
+) -> Callable[[FixtureRequest], Iterator[Elasticsearch]]:
+    """Create fixture restoring seeded indices modified by a test from a snapshot.
+
+    Seeded indices are snapshotted once per session, when the fixture
+    is first requested. After each test, only the indices the test has
+    modified get restored, which is much faster than loading them again.
+
+    :param process_fixture_name: elasticsearch process fixture name
+    :param data_fixture_names: names of data fixtures (see
+        :func:`elasticsearch_data`) seeding the indices, should be session scoped
+    :param indices: names of other seeded indices, e.g. from a data template
+    """
+
+    @pytest.fixture
+    def elasticsearch_reset_fixture(request: FixtureRequest) -> Iterator[Elasticsearch]:
+        """Elasticsearch client fixture, resetting seeded indices after the test."""
+        process = request.getfixturevalue(process_fixture_name)
+        if not process.running():
+            process.start()
+        seeded = [request.getfixturevalue(name) for name in data_fixture_names] + list(indices)
+        snapshots = request.config.stash.setdefault(snapshots_key, {})
+        fixturename = request.fixturename
+        assert fixturename
+        timings = get_timings(request.config)
+        snapshot = snapshots.get(fixturename)
+        if snapshot is None:
+            repo_path = getattr(process, "repo_path", None)
+            if repo_path is None:
+                raise RuntimeError(
+                    f"{process_fixture_name} does not have snapshot repositories location set."
+                )
+            # Snapshot names its repository, so workers sharing a node use their own.
+            snapshot_name = worker_name(
+                fixturename.lower(), getattr(process, "xdist_shared", False)
+            )
+            snapshot = SeedSnapshot(
+                process_client(process, request_timeout=120),
+                repo_path / snapshot_name,
+                snapshot_name,
+                seeded,
+            )
+            request.config.add_cleanup(snapshot.client.close)
+            with timings.measure(fixturename, "snapshot"):
+                snapshot.create()
+            snapshots[fixturename] = snapshot
+        else:
+            # Some other fixture might have removed seeded indices in the meantime.
+            with timings.measure(fixturename, "restore"):
+                snapshot.restore()
+
+        yield snapshot.client
+        with timings.measure(fixturename, "restore"):
+            snapshot.restore()
+
+    return elasticsearch_reset_fixture
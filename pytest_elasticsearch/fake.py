@@ -0,0 +1,944 @@
+"""In-process fake of elasticsearch's HTTP API, for tests that don't need a real node.
+
+It implements a small subset of the REST API: index management, aliases, settings,
+mappings, document CRUD, bulk, search and count with simple queries, ``_cat`` and
+cluster health. Documents are searchable right after they are written, mappings are
+stored as given and no text analysis is done besides lowercasing and splitting words.
+Requests outside of the subset are answered with 400 ``fake_unsupported_operation``.
+"""
+
+import json
+import re
+import threading
+import time
+from fnmatch import fnmatch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from uuid import uuid4
+
+from elasticsearch import __version__ as elastic_version
+
+Response = Tuple[int, Any]
+
+SHARDS = {"total": 1, "successful": 1, "failed": 0}
+EMPTY_LISTINGS: Dict[str, Dict[str, Any]] = {
+    "_data_stream": {"data_streams": []},
+    "_index_template": {"index_templates": []},
+    "_component_template": {"component_templates": []},
+    "_ingest": {},
+}
+
+
+class ApiError(Exception):
+    """Error answered with elasticsearch's error response."""
+
+    def __init__(self, status: int, error_type: str, reason: str) -> None:
+        """Initialize API error.
+
+        :param status: HTTP status of the response
+        :param error_type: elasticsearch's error type, e.g. *index_not_found_exception*
+        :param reason: human readable error description
+        """
+        super().__init__(reason)
+        self.status = status
+        self.error_type = error_type
+        self.reason = reason
+
+    def response(self) -> Response:
+        """Get elasticsearch's error response."""
+        error = {"type": self.error_type, "reason": self.reason}
+        return self.status, {"error": {"root_cause": [error], **error}, "status": self.status}
+
+
+def unsupported(what: str) -> ApiError:
+    """Create error of a request the fake does not implement."""
+    return ApiError(
+        400, "fake_unsupported_operation", f"{what} is not supported by fake elasticsearch"
+    )
+
+
+class FakeIndex:  # pylint:disable=too-few-public-methods
+    """Index of the fake elasticsearch, holding documents in memory."""
+
+    def __init__(self, name: str, body: Optional[Dict[str, Any]] = None) -> None:
+        """Create index.
+
+        :param name: index name
+        :param body: index creation request body, with settings, mappings and aliases
+        """
+        body = body or {}
+        self.name = name
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        self.seq_no = 0
+        self.mappings: Dict[str, Any] = body.get("mappings") or {}
+        self.aliases: Dict[str, Dict[str, Any]] = body.get("aliases") or {}
+        self.settings: Dict[str, str] = {
+            "index.number_of_shards": "1",
+            "index.number_of_replicas": "1",
+            "index.uuid": uuid4().hex,
+            "index.provided_name": name,
+            "index.creation_date": str(int(time.time() * 1000)),
+        }
+        for name, value in flatten_settings(body.get("settings") or {}).items():
+            if value is not None:
+                self.settings[name] = value
+
+    def write(self, doc_id: str, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Index document, returning write result."""
+        created = doc_id not in self.documents
+        self.documents[doc_id] = source
+        self.versions[doc_id] = self.versions.get(doc_id, 0) + 1
+        return self._result(doc_id, "created" if created else "updated")
+
+    def delete(self, doc_id: str) -> Dict[str, Any]:
+        """Delete document, returning write result."""
+        if doc_id not in self.documents:
+            return self._result(doc_id, "not_found")
+        del self.documents[doc_id]
+        self.versions[doc_id] += 1
+        return self._result(doc_id, "deleted")
+
+    def _result(self, doc_id: str, result: str) -> Dict[str, Any]:
+        """Compose result of a document write."""
+        self.seq_no += 1
+        return {
+            "_index": self.name,
+            "_id": doc_id,
+            "_version": self.versions.get(doc_id, 1),
+            "result": result,
+            "_shards": SHARDS,
+            "_seq_no": self.seq_no,
+            "_primary_term": 1,
+        }
+
+
+def flatten_settings(settings: Dict[str, Any], prefix: str = "") -> Dict[str, Optional[str]]:
+    """Flatten settings to dotted names, prefixed with *index.* as elasticsearch does.
+
+    Values are kept as strings, None marks a setting reset to its default.
+    """
+    flat: Dict[str, Optional[str]] = {}
+    for name, value in settings.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict):
+            flat.update(flatten_settings(value, f"{key}."))
+            continue
+        if not key.startswith("index."):
+            key = f"index.{key}"
+        flat[key] = (
+            value
+            if value is None
+            else str(value).lower() if isinstance(value, bool) else str(value)
+        )
+    return flat
+
+
+def expand_settings(flat: Dict[str, str]) -> Dict[str, Any]:
+    """Expand dotted setting names into nested objects."""
+    settings: Dict[str, Any] = {}
+    for name, value in sorted(flat.items()):
+        *parents, leaf = name.split(".")
+        node = settings
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return settings
+
+
+def field_values(source: Any, field: str) -> List[Any]:
+    """Get values of a dotted field, flattening arrays on the way."""
+    if field.endswith(".keyword"):
+        field = field[: -len(".keyword")]
+    values = [source]
+    for part in field.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, dict) and part in value:
+                found.append(value[part])
+        values = []
+        for value in found:
+            values.extend(value if isinstance(value, list) else [value])
+    return [value for value in values if value is not None]
+
+
+def tokens(value: Any) -> List[str]:
+    """Split value into lowercase words, as the standard analyzer roughly does."""
+    return re.findall(r"\w+", str(value).lower())
+
+
+def _single(params: Dict[str, Any], kind: str) -> Tuple[str, Any]:
+    """Get field and value of a single field query."""
+    if len(params) != 1:
+        raise ApiError(400, "parsing_exception", f"[{kind}] query supports a single field")
+    ((field, value),) = params.items()
+    return field, value
+
+
+def _compare(value: Any, bound: Any) -> int:
+    """Compare document value with a range bound."""
+    if isinstance(value, (int, float)) and not isinstance(bound, (int, float)):
+        bound = float(bound)
+    if isinstance(bound, (int, float)) and not isinstance(value, (int, float)):
+        value = float(value)
+    return int(value > bound) - int(value < bound)
+
+
+def evaluate(
+    query: Optional[Dict[str, Any]], doc_id: str, source: Dict[str, Any]
+) -> Optional[float]:
+    """Score document against a query, None if it does not match."""
+    if not query:
+        return 1.0
+    if len(query) != 1:
+        raise ApiError(400, "parsing_exception", "query must have a single root")
+    ((kind, params),) = query.items()
+    if kind == "match_all":
+        return 1.0
+    if kind == "match_none":
+        return None
+    if kind == "ids":
+        return 1.0 if doc_id in params.get("values", []) else None
+    if kind == "bool":
+        return _evaluate_bool(params, doc_id, source)
+    if kind == "exists":
+        return 1.0 if field_values(source, params["field"]) else None
+    if kind == "multi_match":
+        scores = [
+            evaluate({"match": {field: {**params, "query": params["query"]}}}, doc_id, source)
+            for field in params.get("fields", [])
+        ]
+        matched = [score for score in scores if score is not None]
+        return max(matched) if matched else None
+    field, value = _single(params, kind)
+    values = field_values(source, field)
+    if kind == "term":
+        expected = value["value"] if isinstance(value, dict) else value
+        return 1.0 if expected in values else None
+    if kind == "terms":
+        return 1.0 if any(expected in values for expected in value) else None
+    if kind == "prefix":
+        expected = value["value"] if isinstance(value, dict) else value
+        return 1.0 if any(str(actual).startswith(expected) for actual in values) else None
+    if kind == "range":
+        checks = {"gt": (1,), "gte": (0, 1), "lt": (-1,), "lte": (-1, 0)}
+        for actual in values:
+            if all(
+                _compare(actual, bound) in checks[operator]
+                for operator, bound in value.items()
+                if operator in checks
+            ):
+                return 1.0
+        return None
+    if kind in ("match", "match_phrase"):
+        text = value["query"] if isinstance(value, dict) else value
+        words = tokens(text)
+        document_words = [word for actual in values for word in tokens(actual)]
+        if kind == "match_phrase":
+            phrase = " ".join(words)
+            found = any(phrase in " ".join(tokens(actual)) for actual in values)
+            return float(len(words)) if found and words else None
+        hits = [word for word in words if word in document_words]
+        operator = value.get("operator", "or").lower() if isinstance(value, dict) else "or"
+        if not hits or (operator == "and" and len(hits) != len(words)):
+            return None
+        return float(len(hits))
+    raise unsupported(f"[{kind}] query")
+
+
+def _clauses(params: Dict[str, Any], occur: str) -> List[Dict[str, Any]]:
+    """Get clauses of a bool query occurrence type, given as an object or a list."""
+    clauses = params.get(occur, [])
+    return clauses if isinstance(clauses, list) else [clauses]
+
+
+def _evaluate_bool(params: Dict[str, Any], doc_id: str, source: Dict[str, Any]) -> Optional[float]:
+    """Score document against a bool query."""
+    score = 0.0
+    for clause in _clauses(params, "must"):
+        clause_score = evaluate(clause, doc_id, source)
+        if clause_score is None:
+            return None
+        score += clause_score
+    for clause in _clauses(params, "filter"):
+        if evaluate(clause, doc_id, source) is None:
+            return None
+    for clause in _clauses(params, "must_not"):
+        if evaluate(clause, doc_id, source) is not None:
+            return None
+    should = _clauses(params, "should")
+    should_scores = [
+        clause_score
+        for clause_score in (evaluate(clause, doc_id, source) for clause in should)
+        if clause_score is not None
+    ]
+    required = params.get(
+        "minimum_should_match",
+        0 if _clauses(params, "must") or _clauses(params, "filter") else 1,
+    )
+    if should and len(should_scores) < int(required):
+        return None
+    return score + sum(should_scores) or 1.0
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Sort key ordering numbers before strings."""
+    if isinstance(value, (int, float)):
+        return 0, value
+    return 1, str(value)
+
+
+def sort_hits(hits: List[Dict[str, Any]], sort: Any) -> List[Dict[str, Any]]:
+    """Sort search hits by given sort specification."""
+    specs = sort if isinstance(sort, list) else [sort]
+    order: Any
+    for spec in reversed(specs):
+        if isinstance(spec, str):
+            field, order = spec, "desc" if spec == "_score" else "asc"
+        else:
+            ((field, order),) = spec.items()
+            if isinstance(order, dict):
+                order = order.get("order", "asc")
+        if field == "_doc":
+            continue
+        if field == "_score":
+            hits.sort(key=lambda hit: hit["_score"], reverse=order == "desc")
+            continue
+        present = [hit for hit in hits if field_values(hit["_source"], field)]
+        missing = [hit for hit in hits if not field_values(hit["_source"], field)]
+        present.sort(
+            key=lambda hit: _sort_key(field_values(hit["_source"], field)[0]),
+            reverse=order == "desc",
+        )
+        hits[:] = present + missing
+    return hits
+
+
+class FakeElasticsearchApi:
+    """Implementation of elasticsearch REST API subset over in-memory indices."""
+
+    def __init__(self, version: str) -> None:
+        """Initialize fake API.
+
+        :param version: elasticsearch version to report
+        """
+        self.version = version
+        self.indices: Dict[str, FakeIndex] = {}
+        self.lock = threading.RLock()
+
+    def resolve(
+        self, expression: Optional[str], ignore_unavailable: bool = False
+    ) -> List[FakeIndex]:
+        """Resolve comma separated index names, aliases and wildcards to indices."""
+        if not expression or expression in ("_all", "*"):
+            return list(self.indices.values())
+        resolved: Dict[str, FakeIndex] = {}
+        for name in expression.split(","):
+            if "*" in name:
+                for index in self.indices.values():
+                    if fnmatch(index.name, name) or any(
+                        fnmatch(alias, name) for alias in index.aliases
+                    ):
+                        resolved[index.name] = index
+            elif name in self.indices:
+                resolved[name] = self.indices[name]
+            else:
+                aliased = [index for index in self.indices.values() if name in index.aliases]
+                if not aliased and not ignore_unavailable:
+                    raise ApiError(404, "index_not_found_exception", f"no such index [{name}]")
+                resolved.update((index.name, index) for index in aliased)
+        return list(resolved.values())
+
+    def write_index(self, name: str) -> FakeIndex:
+        """Get index to write documents to, creating it if needed."""
+        if name not in self.indices:
+            aliased = [index for index in self.indices.values() if name in index.aliases]
+            if len(aliased) == 1:
+                return aliased[0]
+            self.indices[name] = FakeIndex(name)
+        return self.indices[name]
+
+    def handle(self, method: str, path: str, params: Dict[str, str], body: bytes) -> Response:
+        """Answer a request."""
+        segments = [unquote(segment) for segment in path.split("/") if segment]
+        with self.lock:
+            try:
+                return self.route(method, segments, params, body)
+            except ApiError as error:
+                return error.response()
+
+    # pylint:disable=too-many-return-statements,too-many-branches
+    def route(
+        self, method: str, segments: List[str], params: Dict[str, str], body: bytes
+    ) -> Response:
+        """Dispatch request to its endpoint implementation."""
+        ignore_unavailable = params.get("ignore_unavailable") == "true"
+        if not segments:
+            return 200, self.info()
+        first, rest = segments[0], segments[1:]
+        if first.startswith("_"):
+            index_expression = None
+            endpoint, arguments = first, rest
+        else:
+            index_expression = first
+            endpoint, arguments = (rest[0], rest[1:]) if rest else ("", [])
+
+        if endpoint == "":
+            return self.index_endpoint(method, first, _json(body), ignore_unavailable)
+        if endpoint == "_bulk":
+            return 200, self.bulk(index_expression, body)
+        if endpoint in ("_search", "_count"):
+            hits = self.search(index_expression, _json(body), params, ignore_unavailable)
+            if endpoint == "_count":
+                return 200, {"count": hits["hits"]["total"]["value"], "_shards": SHARDS}
+            return 200, hits
+        if endpoint in ("_refresh", "_flush", "_forcemerge"):
+            self.resolve(index_expression, ignore_unavailable)
+            return 200, {"_shards": SHARDS}
+        if endpoint == "_doc" and not arguments and method == "POST":
+            return self.put_document(index_expression, uuid4().hex[:20], _json(body), False)
+        if endpoint in ("_doc", "_create", "_update", "_source") and len(arguments) == 1:
+            return self.document_endpoint(
+                method, endpoint, index_expression, arguments[0], _json(body)
+            )
+        if endpoint == "_mget":
+            return 200, self.mget(index_expression, _json(body))
+        if endpoint == "_delete_by_query":
+            return 200, self.delete_by_query(index_expression, _json(body))
+        if endpoint in ("_alias", "_aliases"):
+            return self.alias_endpoint(method, index_expression, arguments, _json(body))
+        if endpoint == "_settings":
+            return self.settings_endpoint(method, index_expression, arguments, _json(body), params)
+        if endpoint == "_mapping":
+            return self.mapping_endpoint(method, index_expression, _json(body))
+        if method == "GET" and endpoint in EMPTY_LISTINGS:
+            # Resources the fake can't create, listed by the cleanup strategies.
+            return 200, EMPTY_LISTINGS[endpoint]
+        if endpoint == "_cluster" and arguments[:1] == ["health"]:
+            return 200, self.health()
+        if endpoint == "_cat" and arguments:
+            return 200, self.cat(arguments[0], arguments[1] if len(arguments) > 1 else None, params)
+        raise unsupported(f"{method} /{'/'.join(segments)}")
+
+    def info(self) -> Dict[str, Any]:
+        """Get node's root endpoint response."""
+        return {
+            "name": "fake",
+            "cluster_name": "fake",
+            "cluster_uuid": "fake",
+            "version": {
+                "number": self.version,
+                "build_flavor": "default",
+                "build_type": "fake",
+                "lucene_version": "9.0.0",
+                "minimum_wire_compatibility_version": "7.17.0",
+                "minimum_index_compatibility_version": "7.0.0",
+            },
+            "tagline": "You Know, for Search",
+        }
+
+    def health(self) -> Dict[str, Any]:
+        """Get cluster health, always green."""
+        return {
+            "cluster_name": "fake",
+            "status": "green",
+            "timed_out": False,
+            "number_of_nodes": 1,
+            "number_of_data_nodes": 1,
+            "active_primary_shards": len(self.indices),
+            "active_shards": len(self.indices),
+            "relocating_shards": 0,
+            "initializing_shards": 0,
+            "unassigned_shards": 0,
+        }
+
+    def index_endpoint(
+        self, method: str, name: str, body: Dict[str, Any], ignore_unavailable: bool
+    ) -> Response:
+        """Create, check, get or delete indices."""
+        if method == "PUT":
+            if name in self.indices:
+                raise ApiError(
+                    400,
+                    "resource_already_exists_exception",
+                    f"index [{name}] already exists",
+                )
+            self.indices[name] = FakeIndex(name, body)
+            return 200, {"acknowledged": True, "shards_acknowledged": True, "index": name}
+        indices = self.resolve(name, ignore_unavailable)
+        if method == "HEAD":
+            return (200 if indices else 404), None
+        if method == "DELETE":
+            for index in indices:
+                del self.indices[index.name]
+            return 200, {"acknowledged": True}
+        if method == "GET":
+            return 200, {
+                index.name: {
+                    "aliases": index.aliases,
+                    "mappings": index.mappings,
+                    "settings": expand_settings(index.settings),
+                }
+                for index in indices
+            }
+        raise unsupported(f"{method} /{name}")
+
+    def put_document(
+        self, index_name: Optional[str], doc_id: str, source: Dict[str, Any], create_only: bool
+    ) -> Response:
+        """Index a document."""
+        assert index_name
+        index = self.write_index(index_name)
+        if create_only and doc_id in index.documents:
+            raise ApiError(
+                409,
+                "version_conflict_engine_exception",
+                f"[{doc_id}]: version conflict, document already exists",
+            )
+        result = index.write(doc_id, source)
+        return (201 if result["result"] == "created" else 200), result
+
+    def document_endpoint(
+        self,
+        method: str,
+        endpoint: str,
+        index_name: Optional[str],
+        doc_id: str,
+        body: Dict[str, Any],
+    ) -> Response:
+        """Create, get, update or delete a single document."""
+        assert index_name
+        if endpoint == "_create" or (endpoint == "_doc" and method in ("PUT", "POST")):
+            return self.put_document(index_name, doc_id, body, endpoint == "_create")
+        if endpoint == "_update":
+            index = self.write_index(index_name)
+            if doc_id not in index.documents:
+                if "upsert" not in body and not body.get("doc_as_upsert"):
+                    raise ApiError(
+                        404, "document_missing_exception", f"[{doc_id}]: document missing"
+                    )
+                source = body.get("upsert", body.get("doc", {}))
+            else:
+                source = {**index.documents[doc_id], **body.get("doc", {})}
+            if "script" in body:
+                raise unsupported("Scripted update")
+            return 200, index.write(doc_id, source)
+        index = self.resolve(index_name)[0]
+        if method == "DELETE":
+            result = index.delete(doc_id)
+            return (200 if result["result"] == "deleted" else 404), result
+        found = doc_id in index.documents
+        if method == "HEAD":
+            return (200 if found else 404), None
+        if endpoint == "_source":
+            if not found:
+                raise ApiError(
+                    404, "resource_not_found_exception", f"Document not found [{doc_id}]"
+                )
+            return 200, index.documents[doc_id]
+        return (200 if found else 404), self._document(index, doc_id)
+
+    @staticmethod
+    def _document(index: FakeIndex, doc_id: str) -> Dict[str, Any]:
+        """Compose get API response of a document."""
+        if doc_id not in index.documents:
+            return {"_index": index.name, "_id": doc_id, "found": False}
+        return {
+            "_index": index.name,
+            "_id": doc_id,
+            "_version": index.versions[doc_id],
+            "_seq_no": index.seq_no,
+            "_primary_term": 1,
+            "found": True,
+            "_source": index.documents[doc_id],
+        }
+
+    def mget(self, index_name: Optional[str], body: Dict[str, Any]) -> Dict[str, Any]:
+        """Get several documents at once."""
+        requested = body.get("docs") or [{"_id": doc_id} for doc_id in body.get("ids", [])]
+        docs = []
+        for doc in requested:
+            name = doc.get("_index", index_name)
+            indices = self.resolve(name, ignore_unavailable=True)
+            if indices:
+                docs.append(self._document(indices[0], doc["_id"]))
+            else:
+                docs.append({"_index": name, "_id": doc["_id"], "found": False})
+        return {"docs": docs}
+
+    def bulk(self, index_name: Optional[str], body: bytes) -> Dict[str, Any]:
+        """Execute bulk actions."""
+        lines = iter(line for line in body.decode("utf-8").splitlines() if line.strip())
+        items = []
+        for line in lines:
+            ((action, meta),) = json.loads(line).items()
+            source = json.loads(next(lines, "{}")) if action != "delete" else {}
+            name = meta.get("_index", index_name)
+            doc_id = meta.get("_id") or uuid4().hex[:20]
+            try:
+                if action in ("index", "create"):
+                    status, result = self.put_document(name, doc_id, source, action == "create")
+                elif action in ("update", "delete"):
+                    status, result = self.document_endpoint(
+                        "DELETE" if action == "delete" else "POST",
+                        "_doc" if action == "delete" else "_update",
+                        name,
+                        doc_id,
+                        source,
+                    )
+                else:
+                    raise unsupported(f"Bulk [{action}] action")
+                items.append({action: {**result, "status": status}})
+            except ApiError as error:
+                items.append(
+                    {
+                        action: {
+                            "_index": name,
+                            "_id": doc_id,
+                            "status": error.status,
+                            "error": {"type": error.error_type, "reason": error.reason},
+                        }
+                    }
+                )
+        return {
+            "took": 0,
+            "errors": any("error" in next(iter(item.values())) for item in items),
+            "items": items,
+        }
+
+    def matching(
+        self,
+        index_expression: Optional[str],
+        query: Optional[Dict[str, Any]],
+        ignore_unavailable: bool,
+    ) -> Iterator[Tuple[FakeIndex, str, float]]:
+        """Get documents matching a query, with their scores."""
+        for index in self.resolve(index_expression, ignore_unavailable):
+            for doc_id, source in list(index.documents.items()):
+                score = evaluate(query, doc_id, source)
+                if score is not None:
+                    yield index, doc_id, score
+
+    def search(
+        self,
+        index_expression: Optional[str],
+        body: Dict[str, Any],
+        params: Dict[str, str],
+        ignore_unavailable: bool,
+    ) -> Dict[str, Any]:
+        """Search documents."""
+        if "aggs" in body or "aggregations" in body:
+            raise unsupported("Aggregation")
+        hits: List[Dict[str, Any]] = [
+            {
+                "_index": index.name,
+                "_id": doc_id,
+                "_score": score,
+                "_source": index.documents[doc_id],
+            }
+            for index, doc_id, score in self.matching(
+                index_expression, body.get("query"), ignore_unavailable
+            )
+        ]
+        hits.sort(key=lambda hit: hit["_score"], reverse=True)
+        if "sort" in body:
+            sort_hits(hits, body["sort"])
+        start = int(body.get("from", params.get("from", 0)))
+        size = int(body.get("size", params.get("size", 10)))
+        if body.get("_source") is False:
+            hits = [{key: value for key, value in hit.items() if key != "_source"} for hit in hits]
+        return {
+            "took": 0,
+            "timed_out": False,
+            "_shards": {**SHARDS, "skipped": 0},
+            "hits": {
+                "total": {"value": len(hits), "relation": "eq"},
+                "max_score": max((hit["_score"] for hit in hits), default=None),
+                "hits": hits[start : start + size],
+            },
+        }
+
+    def delete_by_query(
+        self, index_expression: Optional[str], body: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Delete documents matching a query."""
+        matched = list(self.matching(index_expression, body.get("query"), False))
+        for index, doc_id, _ in matched:
+            index.delete(doc_id)
+        return {
+            "took": 0,
+            "timed_out": False,
+            "total": len(matched),
+            "deleted": len(matched),
+            "failures": [],
+        }
+
+    def alias_endpoint(
+        self,
+        method: str,
+        index_expression: Optional[str],
+        arguments: List[str],
+        body: Dict[str, Any],
+    ) -> Response:
+        """Get, check, add and remove aliases."""
+        name = arguments[0] if arguments else None
+        if method == "POST" and name is None:
+            for action in body.get("actions", []):
+                ((kind, params),) = action.items()
+                index_names = params.get("indices") or [params["index"]]
+                alias_names = params.get("aliases") or [params["alias"]]
+                for index in self.resolve(",".join(index_names)):
+                    for alias in alias_names:
+                        if kind == "add":
+                            index.aliases[alias] = {
+                                key: value for key, value in params.items() if key == "filter"
+                            }
+                        elif kind == "remove":
+                            index.aliases.pop(alias, None)
+                        else:
+                            raise unsupported(f"[{kind}] alias action")
+            return 200, {"acknowledged": True}
+        if method in ("PUT", "POST"):
+            assert name
+            for index in self.resolve(index_expression):
+                index.aliases[name] = body
+            return 200, {"acknowledged": True}
+        if method == "DELETE":
+            assert name
+            for index in self.resolve(index_expression):
+                for alias in list(index.aliases):
+                    if fnmatch(alias, name):
+                        del index.aliases[alias]
+            return 200, {"acknowledged": True}
+        aliases = {
+            index.name: {
+                "aliases": {
+                    alias: config
+                    for alias, config in index.aliases.items()
+                    if name is None or any(fnmatch(alias, part) for part in name.split(","))
+                }
+            }
+            for index in self.resolve(index_expression, ignore_unavailable=name is not None)
+        }
+        if name is not None:
+            aliases = {index: body for index, body in aliases.items() if body["aliases"]}
+            if not aliases:
+                return 404, {"error": f"alias [{name}] missing", "status": 404}
+        if method == "HEAD":
+            return 200, None
+        return 200, aliases
+
+    def settings_endpoint(
+        self,
+        method: str,
+        index_expression: Optional[str],
+        arguments: List[str],
+        body: Dict[str, Any],
+        params: Dict[str, str],
+    ) -> Response:
+        """Get or update index settings."""
+        indices = self.resolve(index_expression)
+        if method == "PUT":
+            update = flatten_settings(body.get("settings", body) if "settings" in body else body)
+            for index in indices:
+                for name, value in update.items():
+                    if value is None:
+                        index.settings.pop(name, None)
+                    else:
+                        index.settings[name] = value
+            return 200, {"acknowledged": True}
+        patterns = (arguments[0] if arguments else params.get("name", "*")).split(",")
+        return 200, {
+            index.name: {
+                "settings": expand_settings(
+                    {
+                        name: value
+                        for name, value in index.settings.items()
+                        if any(fnmatch(name, pattern) for pattern in patterns)
+                    }
+                )
+            }
+            for index in indices
+        }
+
+    def mapping_endpoint(
+        self, method: str, index_expression: Optional[str], body: Dict[str, Any]
+    ) -> Response:
+        """Get or update index mappings."""
+        indices = self.resolve(index_expression)
+        if method == "PUT":
+            for index in indices:
+                index.mappings.setdefault("properties", {}).update(body.get("properties", {}))
+            return 200, {"acknowledged": True}
+        return 200, {index.name: {"mappings": index.mappings} for index in indices}
+
+    def cat(self, what: str, index_expression: Optional[str], params: Dict[str, str]) -> Any:
+        """Answer a subset of _cat APIs."""
+        if what == "indices":
+            rows = [
+                {
+                    "health": "green",
+                    "status": "open",
+                    "index": index.name,
+                    "uuid": index.settings["index.uuid"],
+                    "pri": "1",
+                    "rep": "0",
+                    "docs.count": str(len(index.documents)),
+                    "docs.deleted": "0",
+                }
+                for index in sorted(self.resolve(index_expression), key=lambda index: index.name)
+            ]
+        elif what == "count":
+            rows = [
+                {
+                    "epoch": str(int(time.time())),
+                    "timestamp": time.strftime("%H:%M:%S"),
+                    "count": str(
+                        sum(len(index.documents) for index in self.resolve(index_expression))
+                    ),
+                }
+            ]
+        elif what == "health":
+            health = self.health()
+            rows = [
+                {
+                    "epoch": str(int(time.time())),
+                    "cluster": health["cluster_name"],
+                    "status": health["status"],
+                    "node.total": "1",
+                }
+            ]
+        elif what == "aliases":
+            rows = [
+                {"alias": alias, "index": index.name}
+                for index in self.resolve(index_expression)
+                for alias in sorted(index.aliases)
+            ]
+        else:
+            raise unsupported(f"_cat/{what}")
+        if params.get("format") == "json":
+            return rows
+        return "".join(" ".join(row.values()) + "\n" for row in rows)
+
+
+def _json(body: bytes) -> Dict[str, Any]:
+    """Parse JSON request body."""
+    if not body:
+        return {}
+    try:
+        parsed: Dict[str, Any] = json.loads(body)
+    except ValueError as exc:
+        raise ApiError(400, "parse_exception", f"request body is not valid JSON: {exc}") from exc
+    return parsed
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    """Pass HTTP requests to the fake elasticsearch API."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which would wait for delayed ACKs on keep-alive.
+    disable_nagle_algorithm = True
+    server: "FakeHTTPServer"
+
+    def _handle(self) -> None:
+        """Answer request with the API's response."""
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, response = self.server.api.handle(self.command, url.path, params, body)
+        if response is None:
+            payload = b""
+            content_type = "application/json"
+        elif isinstance(response, str):
+            payload = response.encode("utf-8")
+            content_type = "text/plain; charset=UTF-8"
+        else:
+            payload = json.dumps(response).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint:disable=redefined-builtin
+        """Do not log requests to stderr."""
+
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    """HTTP server of the fake elasticsearch."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], api: FakeElasticsearchApi) -> None:
+        """Initialize server.
+
+        :param address: host and port to listen on
+        :param api: API answering the requests
+        """
+        self.api = api
+        super().__init__(address, FakeRequestHandler)
+
+
+def _client_compatible_version() -> str:
+    """Get elasticsearch version the installed client works with."""
+    return f"{elastic_version[0]}.{elastic_version[1]}.0"
+
+
+class FakeElasticsearch:
+    """Fake elasticsearch node, served from a thread of the test process."""
+
+    repo_path = None
+
+    def __init__(self, host: str, port: int, version: Optional[str] = None) -> None:
+        """Initialize fake elasticsearch.
+
+        :param host: hostname to listen on
+        :param port: port to listen on, 0 for any free one
+        :param version: elasticsearch version to report,
+            the one matching installed client by default
+        """
+        self.host = host
+        self.port = port
+        self.version = version or _client_compatible_version()
+        self.api = FakeElasticsearchApi(self.version)
+        self._server: Optional[FakeHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeElasticsearch":
+        """Start serving requests."""
+        if self._server is not None:
+            return self
+        self._server = FakeHTTPServer((self.host, self.port), self.api)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"fake-elasticsearch-{self.port}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def running(self) -> bool:
+        """Check if the fake is serving requests."""
+        return self._server is not None
+
+    def stop(self) -> None:
+        """Stop serving requests, keeping the data."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        assert self._thread
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def reset(self) -> None:
+        """Remove all indices."""
+        with self.api.lock:
+            self.api.indices.clear()
@@ -0,0 +1,83 @@
+"""Index template giving indices created by tests settings that keep writes fast."""
+
+import warnings
+from typing import Dict, Optional
+
+from elasticsearch import Elasticsearch
+from elasticsearch import __version__ as elastic_version
+from packaging.version import Version
+
+INDEX_DEFAULTS = ("test", "none")
+INDEX_TEMPLATE_NAME = "pytest-elasticsearch-defaults"
+INDEX_TEMPLATE_META = {"managed": True, "description": "Settings of indices created by tests"}
+# Nodes older than that support legacy index templates only.
+COMPOSABLE_TEMPLATES_VERSION = Version("7.8.0")
+
+
+def index_settings(refresh_interval: Optional[str] = None) -> Dict[str, str]:
+    """Get settings of indices created by tests.
+
+    Single shard with no replicas keeps single node cluster green,
+    and translog is not synced to disk on every write.
+
+    :param refresh_interval: how often indices are refreshed,
+        elasticsearch's default if not given
+    """
+    settings = {
+        "index.number_of_shards": "1",
+        "index.number_of_replicas": "0",
+        "index.translog.durability": "async",
+    }
+    if refresh_interval:
+        settings["index.refresh_interval"] = refresh_interval
+    return settings
+
+
+def install_index_template(client: Elasticsearch, settings: Dict[str, str]) -> None:
+    """Install catch-all index template with test indices' settings.
+
+    Nodes supporting composable templates (7.8 and later) get one of the lowest priority,
+    so templates created by tests take precedence, as long as they give themselves
+    a priority above 0. Older nodes get a legacy template of the lowest order.
+    The template is marked as managed, so cleanup strategies leave it in place.
+
+    :param client: client of the node to install the template on
+    :param settings: settings of indices created by tests, see :func:`index_settings`
+    """
+    node_version = Version(client.info()["version"]["number"].split("-")[0])
+    with warnings.catch_warnings():
+        # Elasticsearch warns about legacy templates matching the same indices.
+        warnings.simplefilter("ignore")
+        if node_version < COMPOSABLE_TEMPLATES_VERSION:
+            _install_legacy_template(client, settings)
+        elif elastic_version >= (8, 0, 0):
+            client.indices.put_index_template(
+                name=INDEX_TEMPLATE_NAME,
+                index_patterns=["*"],
+                priority=0,
+                template={"settings": settings},
+                meta=INDEX_TEMPLATE_META,
+            )
+        else:
+            client.indices.put_index_template(
+                name=INDEX_TEMPLATE_NAME,
+                body={
+                    "index_patterns": ["*"],
+                    "priority": 0,
+                    "template": {"settings": settings},
+                    "_meta": INDEX_TEMPLATE_META,
+                },
+            )
+
+
+def _install_legacy_template(client: Elasticsearch, settings: Dict[str, str]) -> None:
+    """Install catch-all legacy index template of the lowest order."""
+    if elastic_version >= (8, 0, 0):
+        client.indices.put_template(
+            name=INDEX_TEMPLATE_NAME, index_patterns=["*"], order=0, settings=settings
+        )
+    else:
+        client.indices.put_template(
+            name=INDEX_TEMPLATE_NAME,
+            body={"index_patterns": ["*"], "order": 0, "settings": settings},
+        )
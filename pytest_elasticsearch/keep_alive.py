@@ -0,0 +1,137 @@
+"""Elasticsearch nodes kept running between pytest sessions."""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import ContextManager, List, Optional, TypedDict
+from urllib.request import urlopen
+
+from pytest_elasticsearch.data_template import DataTemplateSeed, seed_fingerprint
+from pytest_elasticsearch.executor import ElasticSearchExecutor, KeptElasticsearch, process_running
+from pytest_elasticsearch.shared import file_lock
+
+KEPT_NODES_DIR = "pytest-elasticsearch-keep-alive"
+
+
+class KeptNodeState(TypedDict):
+    """State of a kept node, stored next to its data."""
+
+    host: str
+    port: int
+    transport_port: int
+    pid: int
+    version: str
+    settings_hash: str
+    repo_path: str
+
+
+def settings_hash(executor: ElasticSearchExecutor, seed: Optional[DataTemplateSeed]) -> str:
+    """Compute hash of settings a kept node can only be reused with.
+
+    Ports are left out, as the kept node's ones are reused.
+
+    :param executor: executor configured by the current session
+    :param seed: data template the node has been seeded with
+    :returns: hex digest of the node's settings
+    """
+    payload = json.dumps(
+        {
+            "executable": str(Path(executor.executable).resolve()),
+            "version": str(executor.version),
+            "host": executor.host,
+            "cluster_name": executor.cluster_name,
+            "network_publish_host": executor.network_publish_host,
+            "index_store_type": executor.index_store_type,
+            "settings": executor.settings,
+            "envvars": executor._envvars,  # pylint:disable=protected-access
+            "seed": seed_fingerprint(seed) if seed else None,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def node_healthy(host: str, port: int, timeout: float = 2.0) -> bool:
+    """Check whether elasticsearch node responds to HTTP requests."""
+    try:
+        with urlopen(f"http://{host}:{port}/", timeout=timeout) as response:
+            return bool(response.status == 200)
+    except OSError:
+        return False
+
+
+class KeptNode:
+    """Elasticsearch node left running after the session, for the next one to reuse.
+
+    Its state file records the node's pid, ports, version and settings hash,
+    the next session reattaches to the node if these match its configuration.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize kept node.
+
+        :param path: directory holding node's state and data
+        """
+        self.path = path
+        self.state_file = path / "state.json"
+        self.lock_file = path / "state.lock"
+
+    def locked(self) -> ContextManager[None]:
+        """Hold an exclusive lock on the node's state."""
+        return file_lock(self.lock_file)
+
+    def read(self) -> Optional[KeptNodeState]:
+        """Read node state, None if there's no kept node."""
+        if not self.state_file.exists():
+            return None
+        state: KeptNodeState = json.loads(self.state_file.read_text(encoding="utf-8"))
+        return state
+
+    def write(self, state: KeptNodeState) -> None:
+        """Store node state."""
+        self.state_file.write_text(json.dumps(state), encoding="utf-8")
+
+    def attach(self, expected_hash: str) -> Optional[KeptElasticsearch]:
+        """Attach to the kept node, if it's running with expected settings and healthy."""
+        state = self.read()
+        if (
+            state is None
+            or state["settings_hash"] != expected_hash
+            or not process_running(state["pid"])
+            or not node_healthy(state["host"], state["port"])
+        ):
+            return None
+        return KeptElasticsearch(
+            state["host"], state["port"], state["pid"], Path(state["repo_path"])
+        )
+
+    def stop(self) -> None:
+        """Stop the kept node, if it's still running, and remove its data."""
+        state = self.read()
+        if state is not None and process_running(state["pid"]):
+            KeptElasticsearch(state["host"], state["port"], state["pid"]).stop()
+        for child in self.path.iterdir():
+            if child == self.lock_file:
+                continue
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink()
+
+
+def stop_kept_nodes(directory: Path) -> List[str]:
+    """Stop all nodes kept in a directory.
+
+    :param directory: directory holding kept nodes
+    :returns: names of stopped nodes
+    """
+    stopped = []
+    for path in sorted(directory.iterdir()):
+        node = KeptNode(path)
+        with node.locked():
+            if node.read() is None:
+                continue
+            node.stop()
+        stopped.append(path.name)
+    return stopped
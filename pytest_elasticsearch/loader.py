@@ -0,0 +1,94 @@
+"""Bulk loading of fixture data."""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from elasticsearch import Elasticsearch
+from elasticsearch import __version__ as elastic_version
+from elasticsearch.helpers import parallel_bulk, streaming_bulk
+
+Document = Dict[str, Any]
+DataSource = Union[str, Path, Callable[[], Iterable[Document]]]
+
+
+def read_ndjson(path: Union[str, Path]) -> Iterator[Document]:
+    """Stream documents from a NDJSON (JSON lines) file, one line at a time."""
+    with open(path, encoding="utf-8") as ndjson:
+        for line in ndjson:
+            if line.strip():
+                yield json.loads(line)
+
+
+def documents(source: DataSource) -> Iterable[Document]:
+    """Get documents from a NDJSON file path, or a callable returning them."""
+    if callable(source):
+        return source()
+    return read_ndjson(source)
+
+
+def _put_refresh_interval(client: Elasticsearch, index: str, interval: Optional[str]) -> None:
+    """Set index refresh interval, None resets it to the default."""
+    settings = {"index": {"refresh_interval": interval}}
+    if elastic_version >= (8, 0, 0):
+        client.indices.put_settings(index=index, settings=settings)
+    else:
+        client.indices.put_settings(index=index, body=settings)
+
+
+def bulk_load(
+    client: Elasticsearch,
+    source: DataSource,
+    index: str,
+    chunk_size: int = 500,
+    thread_count: int = 1,
+    mappings: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Load documents into an index with bulk requests.
+
+    Documents are streamed in chunks, so memory usage does not depend on
+    the size of the data set. Periodic refreshes are turned off during
+    the load, and the index is refreshed once at the end instead.
+
+    :param client: elasticsearch client
+    :param source: NDJSON file path or a callable returning documents.
+        Documents might contain bulk metadata, like ``_id``.
+    :param index: index to load documents into, created if it does not exist
+    :param chunk_size: number of documents sent within one bulk request
+    :param thread_count: number of threads sending bulk requests in parallel
+    :param mappings: mappings to create the index with
+    :return: number of loaded documents
+    """
+    if not client.indices.exists(index=index):
+        if elastic_version >= (8, 0, 0):
+            client.indices.create(index=index, mappings=mappings)
+        elif mappings:
+            client.indices.create(index=index, body={"mappings": mappings})
+        else:
+            client.indices.create(index=index)
+    # Interval of a new index might come from a template, and it's restored after the load.
+    previous_interval = (
+        client.indices.get_settings(index=index, name="index.refresh_interval")
+        .get(index, {})
+        .get("settings", {})
+        .get("index", {})
+        .get("refresh_interval")
+    )
+    _put_refresh_interval(client, index, "-1")
+
+    try:
+        if thread_count > 1:
+            results = parallel_bulk(
+                client,
+                documents(source),
+                thread_count=thread_count,
+                chunk_size=chunk_size,
+                index=index,
+            )
+        else:
+            results = streaming_bulk(client, documents(source), chunk_size=chunk_size, index=index)
+        loaded = sum(1 for ok, _ in results if ok)
+    finally:
+        _put_refresh_interval(client, index, previous_interval)
+    client.indices.refresh(index=index)
+    return loaded
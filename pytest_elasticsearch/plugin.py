@@ -17,9 +17,22 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pytest-elasticsearch.  If not, see <http://www.gnu.org/licenses/>.
 """Pytest-elasticsearch py.test's plugin configuration."""
-from pytest import Parser
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest import Config, ExitCode, Parser, TerminalReporter
 
 from pytest_elasticsearch import factories
+from pytest_elasticsearch.cleanup import CLEANUP_STRATEGIES
+from pytest_elasticsearch.container import BACKENDS
+from pytest_elasticsearch.executor import JVM_PROFILES, READINESS_STATUSES, SETTINGS_PROFILES
+from pytest_elasticsearch.index_defaults import INDEX_DEFAULTS
+from pytest_elasticsearch.keep_alive import KEPT_NODES_DIR, stop_kept_nodes
+from pytest_elasticsearch.profiling import get_profiler
+from pytest_elasticsearch.shared import XDIST_MODES
+from pytest_elasticsearch.teardown import TEARDOWN_MODES, kept_directories_key
+from pytest_elasticsearch.timing import get_timings
 
 # pylint:disable=invalid-name
 _help_host = "Elasticsearch host"
@@ -27,9 +40,60 @@ _help_executable = "Elasticsearch executable"
 _help_port = "Elasticsearch port"
 _help_cluster_name = "Cluster name of the elasticsearch process fixture"
 _help_index_store_type = "type of the index to use in the elasticsearch process fixture"
+_help_index_defaults = "Settings of indices created by tests: none - elasticsearch's defaults, \
+    test - single shard, no replicas and asynchronous translog, \
+    with an index template installed by process fixtures"
+_help_refresh_interval = "Refresh interval of indices created by tests, \
+    e.g. -1 to refresh them only when asked to"
 _help_network_publish_host = "network host to which elasticsearch publish to connect to cluseter"
 _help_elasticsearch_transport_tcp_port = "The tcp ansport port used \
     for internal communication between nodes within the cluster"
+_help_data_template_dir = "Directory to cache seeded data directories in. \
+    Pytest's cache directory by default"
+_help_xdist_mode = "How to run elasticsearch nodes under pytest-xdist: \
+    worker - node per worker, shared - single node for all workers, \
+    pool - workers assigned to a pool of nodes round-robin"
+_help_xdist_pool_size = "Number of elasticsearch nodes in the pytest-xdist pool mode"
+_help_parallel_start = "Spawn all elasticsearch process fixtures used in the session \
+    at once, when the first of them is requested"
+_help_jvm_profile = "JVM profile of elasticsearch process: default - elasticsearch's defaults, \
+    test - small heap, Class Data Sharing, C1 compiler only and single-node discovery"
+_help_heap_size = "JVM heap size of elasticsearch process, e.g. 512m"
+_help_java_opts = "Additional JVM options of elasticsearch process"
+_help_envvars = "Additional environment variables of elasticsearch process, as NAME=value"
+_help_profile = "Settings profile of elasticsearch process: default - regular node, \
+    ephemeral - single-node discovery without ML, watcher, monitoring, GeoIP downloader \
+    and disk allocation watermarks"
+_help_settings = "Additional elasticsearch settings, as name=value"
+_help_version = "Elasticsearch version of the executable. \
+    Detected by running the executable (cached between sessions) if not set"
+_help_keep_alive = "Leave elasticsearch nodes running after the session \
+    and reattach to them in the next one, if their configuration has not changed"
+_help_stop = "Stop elasticsearch nodes left running by --elasticsearch-keep-alive and exit"
+_help_connections_per_node = "Size of client fixtures' connection pool, per node"
+_help_cleanup = "What client fixtures remove after each test: indices - all indices, \
+    sweep - also data streams, aliases, index and component templates and ingest pipelines, \
+    baseline - all of these that were not there before the first test"
+_help_wait_for_status = "Cluster health status elasticsearch process fixtures wait for on start: \
+    yellow, green or none - only until the node responds"
+_help_data_dir = "Directory to create nodes' data directories in, e.g. a tmpfs mount point"
+_help_teardown = "What happens to nodes' data and logs directories after they are stopped: \
+    delete - removed right away, background - removed by a detached process, \
+    keep - left for inspection"
+_help_keep_on_failure = "Keep nodes' data and logs directories if any test has failed"
+_help_backend = "How process fixtures run elasticsearch: local - the executable, \
+    container - an image with Docker or Podman"
+_help_image = "Elasticsearch image of the container backend, \
+    the official one matching installed client's version by default"
+_help_container_runtime = "Container runtime executable of the container backend, \
+    e.g. docker or podman"
+_help_timings = "Report time spent by elasticsearch fixtures on their setup and teardown phases"
+_help_timings_json = "Write elasticsearch fixtures' timings to a JSON file"
+_help_requests_report = "Record requests of elasticsearch client fixtures, \
+    and report the slowest ones and tests making the most of them"
+_help_requests_report_size = "Number of the slowest requests and busiest tests reported"
+_help_search_profiles = "Profile searches of elasticsearch client fixtures, \
+    and report profiles of the slowest ones"
 
 
 def pytest_addoption(parser: Parser) -> None:
@@ -48,6 +112,10 @@ def pytest_addoption(parser: Parser) -> None:
         name="elasticsearch_index_store_type", help=_help_index_store_type, default="mmapfs"
     )
 
+    parser.addini(name="elasticsearch_index_defaults", help=_help_index_defaults, default="none")
+
+    parser.addini(name="elasticsearch_refresh_interval", help=_help_refresh_interval, default=None)
+
     parser.addini(
         name="elasticsearch_network_publish_host",
         help=_help_network_publish_host,
@@ -66,6 +134,89 @@ def pytest_addoption(parser: Parser) -> None:
         default=None,
     )
 
+    parser.addini(
+        name="elasticsearch_data_template_dir",
+        help=_help_data_template_dir,
+        default="",
+    )
+
+    parser.addini(name="elasticsearch_xdist_mode", help=_help_xdist_mode, default="worker")
+
+    parser.addini(name="elasticsearch_xdist_pool_size", help=_help_xdist_pool_size, default=None)
+
+    parser.addini(
+        name="elasticsearch_parallel_start",
+        type="bool",
+        help=_help_parallel_start,
+        default=False,
+    )
+
+    parser.addini(name="elasticsearch_version", help=_help_version, default=None)
+
+    parser.addini(name="elasticsearch_jvm_profile", help=_help_jvm_profile, default="default")
+
+    parser.addini(name="elasticsearch_heap_size", help=_help_heap_size, default=None)
+
+    parser.addini(name="elasticsearch_java_opts", help=_help_java_opts, default=None)
+
+    parser.addini(name="elasticsearch_envvars", type="linelist", help=_help_envvars, default=[])
+
+    parser.addini(name="elasticsearch_profile", help=_help_profile, default="default")
+
+    parser.addini(name="elasticsearch_settings", type="linelist", help=_help_settings, default=[])
+
+    parser.addini(
+        name="elasticsearch_keep_alive", type="bool", help=_help_keep_alive, default=False
+    )
+
+    parser.addini(
+        name="elasticsearch_connections_per_node", help=_help_connections_per_node, default=None
+    )
+
+    parser.addini(name="elasticsearch_cleanup", help=_help_cleanup, default="indices")
+
+    parser.addini(
+        name="elasticsearch_wait_for_status", help=_help_wait_for_status, default="yellow"
+    )
+
+    parser.addini(name="elasticsearch_data_dir", help=_help_data_dir, default=None)
+
+    parser.addini(name="elasticsearch_teardown", help=_help_teardown, default="delete")
+
+    parser.addini(
+        name="elasticsearch_keep_on_failure",
+        type="bool",
+        help=_help_keep_on_failure,
+        default=False,
+    )
+
+    parser.addini(name="elasticsearch_backend", help=_help_backend, default="local")
+
+    parser.addini(name="elasticsearch_image", help=_help_image, default=None)
+
+    parser.addini(
+        name="elasticsearch_container_runtime", help=_help_container_runtime, default="docker"
+    )
+
+    parser.addini(name="elasticsearch_timings", type="bool", help=_help_timings, default=False)
+
+    parser.addini(name="elasticsearch_timings_json", help=_help_timings_json, default=None)
+
+    parser.addini(
+        name="elasticsearch_requests_report",
+        type="bool",
+        help=_help_requests_report,
+        default=False,
+    )
+
+    parser.addini(
+        name="elasticsearch_requests_report_size", help=_help_requests_report_size, default="10"
+    )
+
+    parser.addini(
+        name="elasticsearch_search_profiles", type="bool", help=_help_search_profiles, default=False
+    )
+
     parser.addoption(
         "--elasticsearch-host",
         action="store",
@@ -94,6 +245,21 @@ def pytest_addoption(parser: Parser) -> None:
         help=_help_index_store_type,
     )
 
+    parser.addoption(
+        "--elasticsearch-index-defaults",
+        action="store",
+        choices=INDEX_DEFAULTS,
+        dest="elasticsearch_index_defaults",
+        help=_help_index_defaults,
+    )
+
+    parser.addoption(
+        "--elasticsearch-refresh-interval",
+        action="store",
+        dest="elasticsearch_refresh_interval",
+        help=_help_refresh_interval,
+    )
+
     parser.addoption(
         "--elasticsearch-network-publish-host",
         action="store",
@@ -112,7 +278,277 @@ def pytest_addoption(parser: Parser) -> None:
         help=_help_elasticsearch_transport_tcp_port,
     )
 
+    parser.addoption(
+        "--elasticsearch-data-template-dir",
+        action="store",
+        dest="elasticsearch_data_template_dir",
+        help=_help_data_template_dir,
+    )
+
+    parser.addoption(
+        "--elasticsearch-xdist-mode",
+        action="store",
+        choices=XDIST_MODES,
+        dest="elasticsearch_xdist_mode",
+        help=_help_xdist_mode,
+    )
+
+    parser.addoption(
+        "--elasticsearch-xdist-pool-size",
+        action="store",
+        dest="elasticsearch_xdist_pool_size",
+        help=_help_xdist_pool_size,
+    )
+
+    parser.addoption(
+        "--elasticsearch-parallel-start",
+        action="store_true",
+        dest="elasticsearch_parallel_start",
+        help=_help_parallel_start,
+    )
+
+    parser.addoption(
+        "--elasticsearch-version",
+        action="store",
+        dest="elasticsearch_version",
+        help=_help_version,
+    )
+
+    parser.addoption(
+        "--elasticsearch-jvm-profile",
+        action="store",
+        choices=JVM_PROFILES,
+        dest="elasticsearch_jvm_profile",
+        help=_help_jvm_profile,
+    )
+
+    parser.addoption(
+        "--elasticsearch-heap-size",
+        action="store",
+        dest="elasticsearch_heap_size",
+        help=_help_heap_size,
+    )
+
+    parser.addoption(
+        "--elasticsearch-java-opts",
+        action="store",
+        dest="elasticsearch_java_opts",
+        help=_help_java_opts,
+    )
+
+    parser.addoption(
+        "--elasticsearch-envvar",
+        action="append",
+        dest="elasticsearch_envvars",
+        help=_help_envvars,
+    )
+
+    parser.addoption(
+        "--elasticsearch-profile",
+        action="store",
+        choices=SETTINGS_PROFILES,
+        dest="elasticsearch_profile",
+        help=_help_profile,
+    )
+
+    parser.addoption(
+        "--elasticsearch-setting",
+        action="append",
+        dest="elasticsearch_settings",
+        help=_help_settings,
+    )
+
+    parser.addoption(
+        "--elasticsearch-keep-alive",
+        action="store_true",
+        dest="elasticsearch_keep_alive",
+        help=_help_keep_alive,
+    )
+
+    parser.addoption(
+        "--elasticsearch-stop",
+        action="store_true",
+        dest="elasticsearch_stop",
+        help=_help_stop,
+    )
+
+    parser.addoption(
+        "--elasticsearch-connections-per-node",
+        action="store",
+        type=int,
+        dest="elasticsearch_connections_per_node",
+        help=_help_connections_per_node,
+    )
+
+    parser.addoption(
+        "--elasticsearch-cleanup",
+        action="store",
+        choices=CLEANUP_STRATEGIES,
+        dest="elasticsearch_cleanup",
+        help=_help_cleanup,
+    )
+
+    parser.addoption(
+        "--elasticsearch-wait-for-status",
+        action="store",
+        choices=READINESS_STATUSES,
+        dest="elasticsearch_wait_for_status",
+        help=_help_wait_for_status,
+    )
+
+    parser.addoption(
+        "--elasticsearch-data-dir",
+        action="store",
+        dest="elasticsearch_data_dir",
+        help=_help_data_dir,
+    )
+
+    parser.addoption(
+        "--elasticsearch-teardown",
+        action="store",
+        choices=TEARDOWN_MODES,
+        dest="elasticsearch_teardown",
+        help=_help_teardown,
+    )
+
+    parser.addoption(
+        "--elasticsearch-keep-on-failure",
+        action="store_true",
+        dest="elasticsearch_keep_on_failure",
+        help=_help_keep_on_failure,
+    )
+
+    parser.addoption(
+        "--elasticsearch-backend",
+        action="store",
+        choices=BACKENDS,
+        dest="elasticsearch_backend",
+        help=_help_backend,
+    )
+
+    parser.addoption(
+        "--elasticsearch-image",
+        action="store",
+        dest="elasticsearch_image",
+        help=_help_image,
+    )
+
+    parser.addoption(
+        "--elasticsearch-container-runtime",
+        action="store",
+        dest="elasticsearch_container_runtime",
+        help=_help_container_runtime,
+    )
+
+    parser.addoption(
+        "--elasticsearch-timings",
+        action="store_true",
+        dest="elasticsearch_timings",
+        help=_help_timings,
+    )
+
+    parser.addoption(
+        "--elasticsearch-timings-json",
+        action="store",
+        dest="elasticsearch_timings_json",
+        help=_help_timings_json,
+    )
+
+    parser.addoption(
+        "--elasticsearch-requests-report",
+        action="store_true",
+        dest="elasticsearch_requests_report",
+        help=_help_requests_report,
+    )
+
+    parser.addoption(
+        "--elasticsearch-requests-report-size",
+        action="store",
+        type=int,
+        dest="elasticsearch_requests_report_size",
+        help=_help_requests_report_size,
+    )
+
+    parser.addoption(
+        "--elasticsearch-search-profiles",
+        action="store_true",
+        dest="elasticsearch_search_profiles",
+        help=_help_search_profiles,
+    )
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    """Stop kept elasticsearch nodes instead of running tests, if requested."""
+    config = session.config
+    if not config.getoption("elasticsearch_stop"):
+        return
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        raise pytest.UsageError(
+            "--elasticsearch-stop needs pytest's cacheprovider plugin, "
+            "where kept elasticsearch nodes are recorded"
+        )
+    terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+    for name in stop_kept_nodes(Path(cache.mkdir(KEPT_NODES_DIR))):
+        if terminalreporter is not None:
+            terminalreporter.write_line(f"Stopped elasticsearch node {name}")
+    pytest.exit("Stopped kept elasticsearch nodes", returncode=ExitCode.OK)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    """Attribute requests of client fixtures to the test, including its fixtures' setup."""
+    get_profiler(item.config).current_test = item.nodeid
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Pass pytest-xdist worker's timings and requests to the controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["elasticsearch_timings"] = get_timings(session.config).as_list()
+        profiler = get_profiler(session.config)
+        workeroutput["elasticsearch_requests"] = {
+            "calls": profiler.slowest_calls(),
+            "tests": list(profiler.tests.values()),
+        }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Gather timings and requests of a finished pytest-xdist worker."""
+    workeroutput = getattr(node, "workeroutput", {})
+    get_timings(node.config).merge(workeroutput.get("elasticsearch_timings", []))
+    requests = workeroutput.get("elasticsearch_requests", {})
+    get_profiler(node.config).merge(requests.get("calls", []), requests.get("tests", []))
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: Config) -> None:
+    """Report kept nodes' directories, requests and time spent by elasticsearch fixtures."""
+    kept_directories = config.stash.get(kept_directories_key, [])
+    if kept_directories:
+        terminalreporter.write_sep("=", "elasticsearch directories kept for inspection")
+        for path in kept_directories:
+            terminalreporter.write_line(str(path))
+    profiler = get_profiler(config)
+    if profiler.tests:
+        terminalreporter.write_sep("=", "elasticsearch slowest requests")
+        for line in profiler.report():
+            terminalreporter.write_line(line)
+    timings = get_timings(config)
+    if not timings.phases:
+        return
+    if config.getoption("elasticsearch_timings") or config.getini("elasticsearch_timings"):
+        terminalreporter.write_sep("=", "elasticsearch fixtures timings")
+        for line in timings.report():
+            terminalreporter.write_line(line)
+    export_path = config.getoption("elasticsearch_timings_json") or config.getini(
+        "elasticsearch_timings_json"
+    )
+    if export_path:
+        timings.export(Path(export_path))
+
 
 elasticsearch_proc = factories.elasticsearch_proc()
 elasticsearch_nooproc = factories.elasticsearch_noproc()
+elasticsearch_fakeproc = factories.elasticsearch_fakeproc()
 elasticsearch = factories.elasticsearch("elasticsearch_proc")
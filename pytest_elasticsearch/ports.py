@@ -0,0 +1,84 @@
+"""Reservation of ports between processes starting elasticsearch nodes."""
+
+import fcntl
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Iterable, Optional
+
+from port_for import get_port
+from port_for.api import PortType
+
+PORTS_DIR = Path(tempfile.gettempdir()) / "pytest-elasticsearch-ports"
+RESERVATION_ATTEMPTS = 20
+
+
+class PortReservation:
+    """Port reserved by this process, until released or the process exits."""
+
+    def __init__(self, port: int, lock_file: Optional[IO[str]] = None) -> None:
+        """Initialize port reservation.
+
+        :param port: reserved port
+        :param lock_file: locked reservation file, None if the port is not reserved
+        """
+        self.port = port
+        self.lock_file = lock_file
+
+    def release(self) -> None:
+        """Let other processes use the port, removing its reservation file."""
+        if self.lock_file is not None:
+            # Removed while still locked, see reserve_port.
+            Path(self.lock_file.name).unlink(missing_ok=True)
+            self.lock_file.close()
+            self.lock_file = None
+
+
+def _still_in_place(lock_file: IO[str], lock_path: Path) -> bool:
+    """Check whether the locked file is the one at its path."""
+    try:
+        return os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def reserve_port(
+    ports: Optional[PortType],
+    exclude_ports: Iterable[int] = (),
+    directory: Path = PORTS_DIR,
+) -> Optional[PortReservation]:
+    """Select a free port, not reserved by any other process, and reserve it.
+
+    Ports selected by other sessions at the same time are not free
+    only once their nodes bind them. Reservation is an exclusive lock on a file
+    named after the port, released by the system when the process exits,
+    or removed along with the file when the port is released.
+
+    :param ports: ports to select from, as accepted by :func:`port_for.get_port`.
+        Exact port is returned even if reserved by another process.
+    :param exclude_ports: ports not to select
+    :param directory: directory of reservation files, common to all processes
+    :returns: reservation of selected port, None if ports do not select any
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    excluded = set(exclude_ports)
+    for _ in range(RESERVATION_ATTEMPTS):
+        port = get_port(ports, exclude_ports=excluded)
+        if port is None:
+            return None
+        lock_path = directory / f"{port}.lock"
+        lock_file = open(lock_path, "w", encoding="utf-8")  # pylint:disable=consider-using-with
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            if isinstance(ports, (int, str)):
+                return PortReservation(port)
+            excluded.add(port)
+            continue
+        if not _still_in_place(lock_file, lock_path):
+            # File has been released and removed, while this process was locking it.
+            lock_file.close()
+            continue
+        return PortReservation(port, lock_file)
+    raise RuntimeError(f"No free port within {ports} could be reserved.")
@@ -0,0 +1,221 @@
+"""Requests made by elasticsearch client fixtures, with the slowest ones and busiest tests."""
+
+import heapq
+import json
+import threading
+import time
+from itertools import count
+from typing import Any, Dict, List, Mapping, Optional, Tuple, TypedDict
+from urllib.parse import urlsplit
+
+import pytest
+from elasticsearch import Elasticsearch
+
+# Attribute marking a transport whose requests are already recorded.
+_PROFILED_ATTRIBUTE = "_pytest_elasticsearch_profiled"
+# Endpoints followed by a document id.
+_DOCUMENT_ENDPOINTS = ("_doc", "_create", "_update", "_source", "_explain", "_termvectors")
+
+
+class RequestCall(TypedDict):
+    """Single request made by a client fixture."""
+
+    test: str
+    method: str
+    endpoint: str
+    index: Optional[str]
+    seconds: float
+    size: int
+    took: Optional[int]
+    profile: Optional[Dict[str, Any]]
+
+
+class RequestsPerTest(TypedDict):
+    """Requests made during a single test, aggregated."""
+
+    test: str
+    calls: int
+    total: float
+    took: int
+
+
+def endpoint_of(target: str) -> Tuple[str, Optional[str]]:
+    """Split request target into the endpoint and the index it targets.
+
+    Index names and document ids are replaced with placeholders,
+    so requests of the same kind share the endpoint, e.g. ``/{index}/_doc/{id}``.
+    """
+    segments = [segment for segment in urlsplit(target).path.split("/") if segment]
+    index = segments[0] if segments and not segments[0].startswith("_") else None
+    parts = ["{index}"] + segments[1:] if index else list(segments)
+    for position in range(1, len(parts)):
+        if parts[position - 1] in _DOCUMENT_ENDPOINTS:
+            parts[position] = "{id}"
+    return "/" + "/".join(parts), index
+
+
+def response_size(response: Any, body: Any) -> int:
+    """Get size of the response body, as sent by elasticsearch if it tells."""
+    meta = getattr(response, "meta", None)
+    if meta is not None and meta.headers.get("content-length"):
+        return int(meta.headers["content-length"])
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    if isinstance(body, (dict, list)):
+        return len(json.dumps(body))
+    return 0
+
+
+def _profile_search(kwargs: Dict[str, Any]) -> None:
+    """Ask elasticsearch to profile the search, given its transport request's arguments."""
+    body = kwargs.get("body")
+    if body is None:
+        headers = kwargs.get("headers")
+        # Requests without body are sent without content type by client 8.
+        if isinstance(headers, Mapping) and "content-type" not in headers:
+            kwargs["headers"] = {
+                **headers,
+                "content-type": headers.get("accept", "application/json"),
+            }
+        kwargs["body"] = {"profile": True}
+    elif isinstance(body, dict):
+        kwargs["body"] = {**body, "profile": True}
+
+
+def _format_size(size: int) -> str:
+    """Get human readable size."""
+    return f"{size / 1024:.1f}kB" if size >= 1024 else f"{size}B"
+
+
+class Profiler:
+    """Requests of the session, keeping the slowest ones and aggregates per test."""
+
+    def __init__(self, slowest: int = 10) -> None:
+        """Initialize empty profiler.
+
+        :param slowest: number of the slowest requests kept
+        """
+        self.slowest = slowest
+        self.current_test = ""
+        self.calls: List[Tuple[float, int, RequestCall]] = []
+        self.tests: Dict[str, RequestsPerTest] = {}
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+    def record(self, call: RequestCall) -> None:
+        """Add a request."""
+        with self._lock:
+            heapq.heappush(self.calls, (call["seconds"], next(self._sequence), call))
+            if len(self.calls) > self.slowest:
+                heapq.heappop(self.calls)
+            test = self.tests.setdefault(
+                call["test"], RequestsPerTest(test=call["test"], calls=0, total=0.0, took=0)
+            )
+            test["calls"] += 1
+            test["total"] += call["seconds"]
+            test["took"] += call["took"] or 0
+
+    def instrument(self, client: Elasticsearch, search_profiles: bool = False) -> None:
+        """Record requests sent by the client's transport, shared by its views.
+
+        :param client: client to record requests of
+        :param search_profiles: whether to ask elasticsearch to profile searches,
+            kept along the slowest requests
+        """
+        transport = client.transport
+        if getattr(transport, _PROFILED_ATTRIBUTE, False):
+            return
+        perform_request = transport.perform_request
+
+        def profiled_request(method: str, target: str, *args: Any, **kwargs: Any) -> Any:
+            endpoint, index = endpoint_of(target)
+            if search_profiles and endpoint.endswith("/_search"):
+                _profile_search(kwargs)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = perform_request(method, target, *args, **kwargs)
+                return response
+            finally:
+                seconds = time.perf_counter() - start
+                body = getattr(response, "body", response)
+                result = body if isinstance(body, dict) else {}
+                self.record(
+                    RequestCall(
+                        test=self.current_test,
+                        method=method,
+                        endpoint=endpoint,
+                        index=index,
+                        seconds=seconds,
+                        size=response_size(response, body),
+                        took=result.get("took"),
+                        profile=result.get("profile"),
+                    )
+                )
+
+        setattr(transport, "perform_request", profiled_request)
+        setattr(transport, _PROFILED_ATTRIBUTE, True)
+
+    def merge(self, calls: List[RequestCall], tests: List[RequestsPerTest]) -> None:
+        """Add requests recorded elsewhere, e.g. by a pytest-xdist worker."""
+        with self._lock:
+            for call in calls:
+                heapq.heappush(self.calls, (call["seconds"], next(self._sequence), call))
+                if len(self.calls) > self.slowest:
+                    heapq.heappop(self.calls)
+            for test in tests:
+                if test["test"] not in self.tests:
+                    self.tests[test["test"]] = test.copy()
+                    continue
+                merged = self.tests[test["test"]]
+                merged["calls"] += test["calls"]
+                merged["total"] += test["total"]
+                merged["took"] += test["took"]
+
+    def slowest_calls(self) -> List[RequestCall]:
+        """Get the slowest requests, slowest first."""
+        return [call for _, _, call in sorted(self.calls, reverse=True)]
+
+    def busiest_tests(self) -> List[RequestsPerTest]:
+        """Get tests which made the most requests, as many as slowest requests kept."""
+        return sorted(self.tests.values(), key=lambda test: (-test["calls"], test["test"]))[
+            : self.slowest
+        ]
+
+    def report(self) -> List[str]:
+        """Get lines of a human readable report of the slowest requests and busiest tests."""
+        lines = [f"{'time':>9} {'took':>8} {'size':>9}  request"]
+        for call in self.slowest_calls():
+            took = f"{call['took']}ms" if call["took"] is not None else "-"
+            index = f" ({call['index']})" if call["index"] else ""
+            lines.append(
+                f"{call['seconds']:>8.3f}s {took:>8} {_format_size(call['size']):>9}  "
+                f"{call['method']} {call['endpoint']}{index}  {call['test']}"
+            )
+            for shard in (call["profile"] or {}).get("shards", []):
+                for search in shard.get("searches", []):
+                    for query in search.get("query", []):
+                        lines.append(
+                            f"{'':>30}{query['type']} {query['description']} "
+                            f"{query['time_in_nanos'] / 1_000_000:.3f}ms  {shard['id']}"
+                        )
+        lines.append("")
+        lines.append(f"{'calls':>6} {'total':>10} {'took':>10}  test")
+        for test in self.busiest_tests():
+            lines.append(
+                f"{test['calls']:>6} {test['total']:>9.3f}s {test['took']:>8}ms  {test['test']}"
+            )
+        return lines
+
+
+profiler_key = pytest.StashKey[Profiler]()
+
+
+def get_profiler(config: pytest.Config) -> Profiler:
+    """Get requests profiler of the session."""
+    if profiler_key not in config.stash:
+        slowest = config.getoption("elasticsearch_requests_report_size") or config.getini(
+            "elasticsearch_requests_report_size"
+        )
+        config.stash[profiler_key] = Profiler(int(slowest))
+    return config.stash[profiler_key]
@@ -0,0 +1,116 @@
+"""Coordination of elasticsearch nodes shared between pytest-xdist workers."""
+
+import fcntl
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ContextManager, Iterator, List, Optional, TypedDict
+
+XDIST_MODES = ("worker", "shared", "pool")
+
+
+class SharedNodeState(TypedDict):
+    """State of a shared node, stored next to it."""
+
+    host: str
+    port: int
+    pid: int
+    repo_path: str
+    workers: List[str]
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a file, shared with other processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def xdist_worker() -> Optional[str]:
+    """Return pytest-xdist worker id, if running within one."""
+    return os.environ.get("PYTEST_XDIST_WORKER")
+
+
+def worker_name(name: str, shared: bool) -> str:
+    """Get name of index, alias or snapshot, owned by the worker on a shared node.
+
+    :param name: name the resource has on a node used by a single session
+    :param shared: whether the node is shared between pytest-xdist workers
+    """
+    worker = xdist_worker()
+    if shared and worker:
+        return f"pytest-{worker}-{name}"
+    return name
+
+
+def xdist_slot(mode: str, pool_size: int) -> Optional[int]:
+    """Pick a shared node slot for the current pytest-xdist worker.
+
+    :param mode: *worker* to start a node per worker,
+        *shared* to share a single node between all workers,
+        *pool* to assign workers to a pool of nodes round-robin
+    :param pool_size: number of nodes in the pool
+    :returns: slot number, or None if node should not be shared
+    """
+    if mode not in XDIST_MODES:
+        raise ValueError(f"Unknown xdist mode {mode!r}, choose one of {', '.join(XDIST_MODES)}")
+    worker = xdist_worker()
+    if worker is None or mode == "worker":
+        return None
+    if mode == "shared":
+        return 0
+    return int(worker.lstrip("gw")) % max(pool_size, 1)
+
+
+class SharedNode:
+    """Elasticsearch node used by several pytest-xdist workers.
+
+    The first worker starts the node and records it in a state file,
+    others attach to it. Each worker registers itself, so the last one
+    to leave knows it has to stop the node.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize shared node.
+
+        :param path: directory holding node's state and data
+        """
+        self.path = path
+        self.state_file = path / "state.json"
+        self.lock_file = path / "state.lock"
+
+    def locked(self) -> ContextManager[None]:
+        """Hold an exclusive lock on the node's state."""
+        return file_lock(self.lock_file)
+
+    def read(self) -> Optional[SharedNodeState]:
+        """Read node state, None if no worker has started it."""
+        if not self.state_file.exists():
+            return None
+        state: SharedNodeState = json.loads(self.state_file.read_text(encoding="utf-8"))
+        return state
+
+    def write(self, state: SharedNodeState) -> None:
+        """Store node state."""
+        self.state_file.write_text(json.dumps(state), encoding="utf-8")
+
+    def remove(self) -> None:
+        """Remove node state and data, keeping the lock file.
+
+        Workers waiting for the lock hold the same file once it's released,
+        a removed one would let a late worker lock a new file alongside them.
+        """
+        for child in self.path.iterdir():
+            if child == self.lock_file:
+                continue
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink()
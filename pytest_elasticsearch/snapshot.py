@@ -0,0 +1,88 @@
+"""Snapshot based reset of seeded indices."""
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from elasticsearch import Elasticsearch
+
+REPOSITORY = "pytest-elasticsearch"
+
+IndexCounters = Dict[str, Tuple[int, int]]
+
+
+class SeedSnapshot:
+    """Snapshot of seeded indices, restoring only those that tests have modified.
+
+    Modifications are detected with indexing statistics: any index, update
+    or delete operation on an index marks it as modified, and so does
+    removing it. Changes to mappings or settings alone are not detected.
+    """
+
+    def __init__(self, client: Elasticsearch, location: Path, name: str, indices: List[str]):
+        """Initialize seed snapshot.
+
+        :param client: elasticsearch client
+        :param location: snapshot repository location, has to be within
+            elasticsearch's ``path.repo``
+        :param name: snapshot name, also naming its repository
+        :param indices: seeded indices
+        """
+        self.client = client
+        self.location = location
+        self.name = name
+        # Repository of each snapshot has its own location,
+        # so snapshots of other fixtures or workers on the same node can't share one.
+        self.repository = f"{REPOSITORY}-{name}"
+        self.indices = indices
+        self.baseline: IndexCounters = {}
+
+    def create(self) -> None:
+        """Register filesystem snapshot repository and snapshot seeded indices."""
+        # body is understood by all supported elasticsearch client versions
+        self.client.snapshot.create_repository(
+            name=self.repository, body={"type": "fs", "settings": {"location": str(self.location)}}
+        )
+        self.client.snapshot.create(
+            repository=self.repository,
+            snapshot=self.name,
+            body={"indices": ",".join(self.indices), "include_global_state": False},
+            wait_for_completion=True,
+        )
+        self.baseline = self._counters()
+
+    def _counters(self) -> IndexCounters:
+        """Get indexing and deleting operation counters of seeded indices."""
+        # Statistics of all indices, as the request would fail on a missing one.
+        stats = self.client.indices.stats(metric="indexing")
+        return {
+            index: (
+                index_stats["primaries"]["indexing"]["index_total"],
+                index_stats["primaries"]["indexing"]["delete_total"],
+            )
+            for index, index_stats in stats["indices"].items()
+            if index in self.indices
+        }
+
+    def modified(self) -> List[str]:
+        """List seeded indices modified, or removed, since the snapshot."""
+        counters = self._counters()
+        return [index for index in self.indices if counters.get(index) != self.baseline[index]]
+
+    def restore(self) -> List[str]:
+        """Restore modified indices from the snapshot.
+
+        :return: restored indices
+        """
+        modified = self.modified()
+        if not modified:
+            return modified
+        self.client.indices.delete(index=",".join(modified), ignore_unavailable=True)
+        self.client.snapshot.restore(
+            repository=self.repository,
+            snapshot=self.name,
+            body={"indices": ",".join(modified), "include_global_state": False},
+            wait_for_completion=True,
+        )
+        # Restored shards start counting operations from scratch.
+        self.baseline.update(self._counters())
+        return modified
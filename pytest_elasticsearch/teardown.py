@@ -0,0 +1,73 @@
+"""Removal of elasticsearch nodes' directories after they are stopped."""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional
+from uuid import uuid4
+
+import pytest
+
+TEARDOWN_MODES = ("delete", "background", "keep")
+
+kept_directories_key = pytest.StashKey[List[Path]]()
+
+_RMTREE = "import shutil, sys\nfor path in sys.argv[1:]:\n    shutil.rmtree(path, True)"
+
+
+def data_directory(data_dir: Optional[Path], default: Path, prefix: str) -> Path:
+    """Get node's data directory, unique within data_dir if one is given.
+
+    :param data_dir: directory to create node's data directory in,
+        e.g. a tmpfs mount point
+    :param default: data directory to use if data_dir is not given
+    :param prefix: prefix of the data directory name created within data_dir
+    """
+    if data_dir is None:
+        return default
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=f"{prefix}-", dir=data_dir))
+
+
+def delete_in_background(paths: Iterable[Path]) -> None:
+    """Move directories out of the way and delete them from a detached process.
+
+    The process outlives pytest, so the session ends without waiting for the deletion.
+    """
+    doomed = []
+    for path in paths:
+        # Renaming within the same directory is atomic and does not touch the contents.
+        target = path.with_name(f"{path.name}.deleted-{uuid4().hex}")
+        path.rename(target)
+        doomed.append(str(target))
+    if doomed:
+        subprocess.Popen(  # pylint:disable=consider-using-with
+            [sys.executable, "-c", _RMTREE, *doomed],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def remove_directories(
+    request: pytest.FixtureRequest, paths: Iterable[Path], mode: str, keep_on_failure: bool
+) -> None:
+    """Remove stopped node's directories.
+
+    :param request: process fixture's request
+    :param paths: directories to remove
+    :param mode: *delete* - remove them right away, *background* - remove them
+        from a detached process, *keep* - leave them for inspection
+    :param keep_on_failure: leave them for inspection if any test has failed
+    """
+    existing = [path for path in paths if path.exists()]
+    if mode == "keep" or (keep_on_failure and request.session.testsfailed):
+        request.config.stash.setdefault(kept_directories_key, []).extend(existing)
+    elif mode == "background":
+        delete_in_background(existing)
+    else:
+        for path in existing:
+            shutil.rmtree(path)
@@ -0,0 +1,92 @@
+"""Time spent by elasticsearch fixtures on their setup and teardown phases."""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, TypedDict
+
+import pytest
+
+
+class PhaseTiming(TypedDict):
+    """Aggregated duration of a single fixture phase."""
+
+    fixture: str
+    phase: str
+    calls: int
+    total: float
+    max: float
+
+
+class Timings:
+    """Durations of fixture phases, aggregated per fixture and phase."""
+
+    def __init__(self) -> None:
+        """Initialize empty timings."""
+        self.phases: Dict[Tuple[str, str], PhaseTiming] = {}
+
+    def record(self, fixture: str, phase: str, seconds: float) -> None:
+        """Add duration of a fixture phase.
+
+        :param fixture: fixture name
+        :param phase: phase of the fixture, e.g. *spawn*
+        :param seconds: time the phase took
+        """
+        timing = self.phases.setdefault(
+            (fixture, phase),
+            PhaseTiming(fixture=fixture, phase=phase, calls=0, total=0.0, max=0.0),
+        )
+        timing["calls"] += 1
+        timing["total"] += seconds
+        timing["max"] = max(timing["max"], seconds)
+
+    @contextmanager
+    def measure(self, fixture: str, phase: str) -> Iterator[None]:
+        """Measure the time spent within the context."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(fixture, phase, time.perf_counter() - start)
+
+    def merge(self, phases: List[PhaseTiming]) -> None:
+        """Add timings gathered elsewhere, e.g. by a pytest-xdist worker."""
+        for timing in phases:
+            key = (timing["fixture"], timing["phase"])
+            if key not in self.phases:
+                self.phases[key] = timing.copy()
+                continue
+            merged = self.phases[key]
+            merged["calls"] += timing["calls"]
+            merged["total"] += timing["total"]
+            merged["max"] = max(merged["max"], timing["max"])
+
+    def as_list(self) -> List[PhaseTiming]:
+        """Get timings grouped by fixture, in the order phases were first run."""
+        return sorted(self.phases.values(), key=lambda timing: timing["fixture"])
+
+    def report(self) -> List[str]:
+        """Get lines of a human readable timings report."""
+        width = max([len(timing["fixture"]) for timing in self.phases.values()] + [7])
+        lines = [f"{'fixture':<{width}} {'phase':<13} {'calls':>6} {'total':>10} {'max':>10}"]
+        for timing in self.as_list():
+            lines.append(
+                f"{timing['fixture']:<{width}} {timing['phase']:<13} {timing['calls']:>6} "
+                f"{timing['total']:>9.3f}s {timing['max']:>9.3f}s"
+            )
+        return lines
+
+    def export(self, path: Path) -> None:
+        """Write timings to a JSON file."""
+        path.write_text(json.dumps(self.as_list(), indent=2), encoding="utf-8")
+
+
+timings_key = pytest.StashKey[Timings]()
+
+
+def get_timings(config: pytest.Config) -> Timings:
+    """Get timings of the session."""
+    if timings_key not in config.stash:
+        config.stash[timings_key] = Timings()
+    return config.stash[timings_key]
@@ -1,16 +1,76 @@
 """Tests main conftest file."""
 
 import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+import pytest
 
 from pytest_elasticsearch import factories
 from pytest_elasticsearch.plugin import *  # noqa: F403
 
+pytest_plugins = ["pytester"]
+
 warnings.simplefilter("error", category=DeprecationWarning)
 
+STUBS = Path(__file__).parent / "stubs"
+ELASTICSEARCH_STUB = STUBS / "elasticsearch"
+
+RunPytest = Callable[..., pytest.RunResult]
+
+
+@pytest.fixture
+def run_pytest(pytester: pytest.Pytester) -> RunPytest:
+    """Run pytest with the plugin within pytester's directory, on elasticsearch stub.
+
+    Sessions are run without pytest-xdist, however tests themselves are run.
+    """
+
+    def run(*args: str) -> pytest.RunResult:
+        return pytester.runpytest(
+            "-p",
+            "pytest_elasticsearch.plugin",
+            "-p",
+            "no:xdist",
+            f"--elasticsearch-executable={ELASTICSEARCH_STUB}",
+            *args,
+        )
+
+    return run
+
 
 elasticsearch_proc2 = factories.elasticsearch_proc(port=9393)
 elasticsearch_nooproc2 = factories.elasticsearch_noproc(port=9393)
 
 elasticsearch2 = factories.elasticsearch("elasticsearch_proc2")
 elasticsearch2_noop = factories.elasticsearch("elasticsearch_nooproc2")
+elasticsearch_namespaced = factories.elasticsearch("elasticsearch_proc", namespace=True)
+elasticsearch_fake = factories.elasticsearch("elasticsearch_fakeproc")
+
+
+def books() -> Iterator[Dict[str, Any]]:
+    """Generate books."""
+    for number in range(1000):
+        yield {"_id": str(number), "title": f"Book {number}"}
+
+
+elasticsearch_books = factories.elasticsearch_data("elasticsearch_proc", books, index="books")
+elasticsearch_library = factories.elasticsearch_data(
+    "elasticsearch_proc", books, index="library", scope="session"
+)
+elasticsearch_library_reset = factories.elasticsearch_reset(
+    "elasticsearch_proc", ["elasticsearch_library"]
+)
+elasticsearch_books_seed = factories.elasticsearch_data(
+    "elasticsearch_proc", books, index="books-seed", scope="session"
+)
+elasticsearch_books_reset = factories.elasticsearch_reset(
+    "elasticsearch_proc", ["elasticsearch_books_seed"]
+)
+elasticsearch_library_source = factories.elasticsearch_data(
+    "elasticsearch_proc", books, index="library-source", scope="module"
+)
+elasticsearch_library_clone = factories.elasticsearch_index(
+    "elasticsearch_proc", "elasticsearch_library_source", alias="shelf"
+)
 # pylint:enable=invalid-name
@@ -0,0 +1,127 @@
+"""Cleanup strategies tests."""
+
+import asyncio
+from typing import List, Type
+
+import mock
+import pytest
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.cleanup import (
+    ClusterState,
+    async_cleanup_cluster,
+    chunk_names,
+    cleanup_cluster,
+)
+
+
+def mock_client(client_class: Type[mock.MagicMock] = mock.MagicMock) -> mock.MagicMock:
+    """Mock client of a cluster with user's and elasticsearch's own resources."""
+    client = client_class()
+    client.indices.get_alias.return_value = {
+        "books": {"aliases": {"library": {}}},
+        "shop": {"aliases": {}},
+        ".kibana_1": {"aliases": {".kibana": {}}},
+    }
+    client.indices.get_data_stream.return_value = {
+        "data_streams": [{"name": "logs-app-default"}, {"name": ".logs-deprecation"}]
+    }
+    client.indices.get_index_template.return_value = {
+        "index_templates": [
+            {"name": "app", "index_template": {}},
+            {"name": "logs", "index_template": {"_meta": {"managed": True}}},
+        ]
+    }
+    client.cluster.get_component_template.return_value = {
+        "component_templates": [
+            {"name": "logs@settings", "component_template": {"_meta": {"managed": True}}}
+        ]
+    }
+    client.ingest.get_pipeline.return_value = {
+        "app-pipeline": {"processors": []},
+        "logs-default-pipeline": {"_meta": {"managed": True}},
+    }
+    return client
+
+
+def test_chunk_names() -> None:
+    """Names are joined into chunks limited by length."""
+    assert list(chunk_names(["c", "bb", "a"])) == ["a,bb,c"]
+    assert list(chunk_names(["aaa", "bbb", "ccc"], max_length=8)) == ["aaa,bbb", "ccc"]
+    assert not list(chunk_names([]))
+
+
+def test_cleanup_indices() -> None:
+    """All user's indices are deleted with a single request."""
+    client = mock_client()
+    cleanup_cluster(client, "indices")
+    client.indices.delete.assert_called_once_with(index="books,shop", ignore_unavailable=True)
+    client.indices.delete_data_stream.assert_not_called()
+
+
+def test_cleanup_sweep() -> None:
+    """Sweep removes user's resources, leaving out the system and managed ones."""
+    client = mock_client()
+    cleanup_cluster(client, "sweep")
+    client.indices.delete_data_stream.assert_called_once_with(name="logs-app-default")
+    client.indices.delete.assert_called_once_with(index="books,shop", ignore_unavailable=True)
+    client.indices.update_aliases.assert_not_called()
+    client.indices.delete_index_template.assert_called_once_with(name="app")
+    client.cluster.delete_component_template.assert_not_called()
+    client.ingest.delete_pipeline.assert_called_once_with(id="app-pipeline")
+
+
+def test_cleanup_baseline() -> None:
+    """Only resources added since the baseline are removed."""
+    client = mock_client()
+    baseline = ClusterState(
+        indices={"books"},
+        aliases=set(),
+        data_streams={"logs-app-default"},
+        index_templates={"app"},
+        component_templates=set(),
+        pipelines=set(),
+    )
+    cleanup_cluster(client, "baseline", baseline)
+    client.indices.delete_data_stream.assert_not_called()
+    client.indices.delete.assert_called_once_with(index="shop", ignore_unavailable=True)
+    client.indices.update_aliases.assert_called_once_with(
+        body={"actions": [{"remove": {"index": "books", "alias": "library"}}]}
+    )
+    client.indices.delete_index_template.assert_not_called()
+    client.ingest.delete_pipeline.assert_called_once_with(id="app-pipeline")
+
+
+def test_async_cleanup_sweep() -> None:
+    """Async client's cleanup uses the same strategies."""
+    client = mock_client(mock.AsyncMock)
+    asyncio.run(async_cleanup_cluster(client, "sweep"))
+    client.indices.delete_data_stream.assert_awaited_once_with(name="logs-app-default")
+    client.indices.delete.assert_awaited_once_with(index="books,shop", ignore_unavailable=True)
+    client.indices.delete_index_template.assert_awaited_once_with(name="app")
+    client.cluster.delete_component_template.assert_not_awaited()
+    client.ingest.delete_pipeline.assert_awaited_once_with(id="app-pipeline")
+
+
+def test_async_cleanup_concurrent() -> None:
+    """Async client deletes chunks of indices concurrently."""
+    client = mock_client(mock.AsyncMock)
+    client.indices.get_alias.return_value = {name * 2000: {"aliases": {}} for name in "abc"}
+    started: List[str] = []
+    concurrent: List[int] = []
+
+    async def delete(index: str, ignore_unavailable: bool) -> None:
+        started.append(index)
+        await asyncio.sleep(0)
+        concurrent.append(len(started))
+
+    client.indices.delete.side_effect = delete
+    asyncio.run(async_cleanup_cluster(client, "indices"))
+    assert len(started) == 3
+    assert concurrent == [3, 3, 3]
+
+
+def test_cleanup_unknown_strategy() -> None:
+    """Unknown strategy is reported."""
+    with pytest.raises(ValueError):
+        cleanup_cluster(mock.MagicMock(spec=Elasticsearch), "everything")
@@ -0,0 +1,126 @@
+"""Client fixtures tests."""
+
+from typing import Tuple
+
+import mock
+import pytest
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.client import NamespacedElasticsearch, client_view, new_namespace
+from tests.conftest import RunPytest
+
+
+def test_namespace_unique() -> None:
+    """Each namespace is a valid and unique index prefix."""
+    namespace = new_namespace()
+    assert namespace == namespace.lower()
+    assert namespace.endswith("-")
+    assert namespace != new_namespace()
+
+
+def test_delete_namespace_single_request() -> None:
+    """All indices within namespace are deleted with a single request."""
+    client = NamespacedElasticsearch("http://127.0.0.1:9200")
+    client.namespace = "pytest-abc-"
+    get_alias = mock.patch.object(
+        client.indices,
+        "get_alias",
+        return_value={"pytest-abc-books": {}, "pytest-abc-shop": {}},
+    )
+    with get_alias as get_alias_mock, mock.patch.object(client.indices, "delete") as delete_mock:
+        client.delete_namespace()
+    get_alias_mock.assert_called_once_with(index="pytest-abc-*", expand_wildcards="all")
+    delete_mock.assert_called_once_with(
+        index="pytest-abc-books,pytest-abc-shop", ignore_unavailable=True
+    )
+
+
+def test_namespaced_cleanup(
+    elasticsearch: Elasticsearch, elasticsearch_namespaced: NamespacedElasticsearch
+) -> None:
+    """Namespaced client only sees its own indices removed."""
+    elasticsearch.indices.create(index="shared-index")
+    elasticsearch_namespaced.indices.create(index=f"{elasticsearch_namespaced.namespace}books")
+
+    elasticsearch_namespaced.delete_namespace()
+
+    assert elasticsearch.indices.exists(index="shared-index")
+    assert not elasticsearch.indices.exists(index=f"{elasticsearch_namespaced.namespace}books")
+
+
+@pytest.mark.parametrize("version", [(7, 17, 0), (8, 15, 0)])
+def test_client_view(version: Tuple[int, int, int]) -> None:
+    """Client view shares the transport, but not attributes set on it."""
+    client = NamespacedElasticsearch(hosts=["http://localhost:9200"])
+    with mock.patch("pytest_elasticsearch.client.elastic_version", version):
+        view = client_view(client)
+    view.namespace = "pytest-test-"
+    assert view is not client
+    assert view.transport is client.transport
+    assert client.namespace == ""
+
+
+def test_pooled_client(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Client fixtures share a connection pool, sized with connections per node."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_namespaced = factories.elasticsearch("elasticsearch_proc", namespace=True)
+        """
+    )
+    pytester.makepyfile(
+        """
+        transports = []
+
+        def test_first(elasticsearch, elasticsearch_namespaced):
+            transports.extend([elasticsearch.transport, elasticsearch_namespaced.transport])
+            elasticsearch_namespaced.namespace_used = True
+            node = elasticsearch.transport.node_pool.all()[0]
+            assert node.config.connections_per_node == 3
+
+        def test_second(elasticsearch, elasticsearch_namespaced):
+            assert elasticsearch.transport is transports[0]
+            assert elasticsearch_namespaced.transport is transports[1]
+            assert not hasattr(elasticsearch_namespaced, "namespace_used")
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-connections-per-node=3",
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_async_client(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Async client fixture connects to the process fixture's node."""
+    pytester.makeini(
+        """
+        [pytest]
+        asyncio_default_fixture_loop_scope = function
+        """
+    )
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        async_elasticsearch = factories.async_elasticsearch("elasticsearch_proc")
+        async_elasticsearch_namespaced = factories.async_elasticsearch(
+            "elasticsearch_proc", namespace=True
+        )
+        """
+    )
+    pytester.makepyfile(
+        """
+        import pytest
+        from elasticsearch import AsyncElasticsearch
+
+        @pytest.mark.asyncio
+        async def test_info(async_elasticsearch, async_elasticsearch_namespaced):
+            assert isinstance(async_elasticsearch, AsyncElasticsearch)
+            info = await async_elasticsearch.info()
+            assert info["version"]["number"]
+            assert async_elasticsearch_namespaced.namespace.startswith("pytest-")
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=1)
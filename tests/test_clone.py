@@ -0,0 +1,71 @@
+"""Index clone fixtures tests."""
+
+import mock
+import pytest
+
+from pytest_elasticsearch.clone import ClonedIndexElasticsearch, clone_index
+from tests.conftest import RunPytest
+
+
+def test_clone_index() -> None:
+    """Source index is write-blocked, the clone is writable and aliased."""
+    client = mock.MagicMock()
+    clone_index(client, "books", "books-clone", "library")
+    client.indices.add_block.assert_called_once_with(index="books", block="write")
+    client.indices.clone.assert_called_once_with(
+        index="books",
+        target="books-clone",
+        settings={"index.blocks.write": None},
+        aliases={"library": {}},
+    )
+
+
+def test_index_fixture(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Each test gets its own clone of the module's source index."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        def books():
+            yield {"_id": "1", "title": "Dune"}
+
+        elasticsearch_books = factories.elasticsearch_data(
+            "elasticsearch_proc", books, index="books", scope="module"
+        )
+        elasticsearch_books_clone = factories.elasticsearch_index(
+            "elasticsearch_proc", "elasticsearch_books", alias="library"
+        )
+        """
+    )
+    pytester.makepyfile(
+        """
+        clones = []
+
+        def test_first(elasticsearch_books_clone):
+            assert elasticsearch_books_clone.source_index == "books"
+            assert elasticsearch_books_clone.cloned_index.startswith("books-clone-")
+            assert elasticsearch_books_clone.index_name == "library"
+            clones.append(elasticsearch_books_clone.cloned_index)
+
+        def test_second(elasticsearch_books_clone):
+            assert elasticsearch_books_clone.cloned_index not in clones
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=2)
+
+
+def test_clone_isolation(elasticsearch_library_clone: ClonedIndexElasticsearch) -> None:
+    """Changes to the clone don't affect the source index, nor other tests."""
+    client = elasticsearch_library_clone
+    assert client.index_name.endswith("shelf")
+    assert client.count(index=client.index_name)["count"] == 1000
+    client.delete(index=client.index_name, id="1", refresh=True)
+    assert client.count(index=client.index_name)["count"] == 999
+    assert client.count(index=client.source_index)["count"] == 1000
+
+
+def test_clone_isolation_next(elasticsearch_library_clone: ClonedIndexElasticsearch) -> None:
+    """Next test gets a fresh clone."""
+    client = elasticsearch_library_clone
+    assert client.count(index=client.index_name)["count"] == 1000
@@ -0,0 +1,53 @@
+"""Elasticsearch cluster fixture tests."""
+
+import pytest
+
+from tests.conftest import RunPytest
+
+
+def test_cluster(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Cluster nodes discover each other, and can be stopped and started again."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_cluster = factories.elasticsearch_cluster(nodes=3)
+        elasticsearch_cluster_client = factories.elasticsearch("elasticsearch_cluster")
+        """
+    )
+    pytester.makepyfile(
+        """
+        import json
+
+        def test_discovery(elasticsearch_cluster, elasticsearch_cluster_client):
+            executors = elasticsearch_cluster.executors
+            assert len(executors) == 3
+            assert len({executor.port for executor in executors}) == 3
+            for number, executor in enumerate(executors):
+                stub = json.loads((executor.logs_path / "stub.json").read_text())
+                settings = stub["settings"]
+                assert settings["node.name"] == f"elasticsearch_cluster-{number}"
+                assert len(settings["discovery.seed_hosts"].split(",")) == 3
+                assert settings["cluster.initial_master_nodes"].split(",") == [
+                    "elasticsearch_cluster-0",
+                    "elasticsearch_cluster-1",
+                    "elasticsearch_cluster-2",
+                ]
+                assert "discovery.type" not in settings
+                assert settings["path.repo"] == str(elasticsearch_cluster.repo_path)
+            assert elasticsearch_cluster_client.info()["version"]["number"]
+
+        def test_failover(elasticsearch_cluster):
+            first, second, _ = elasticsearch_cluster.executors
+            first.stop()
+            assert elasticsearch_cluster.running()
+            assert elasticsearch_cluster.port == second.port
+            elasticsearch_cluster.start()
+            assert first.running()
+            assert elasticsearch_cluster.port == first.port
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-profile=ephemeral",
+    )
+    result.assert_outcomes(passed=2)
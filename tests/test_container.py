@@ -0,0 +1,68 @@
+"""Container backend tests."""
+
+import json
+
+import pytest
+
+from tests.conftest import STUBS, RunPytest
+
+
+def test_container(
+    run_pytest: RunPytest, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Elasticsearch runs in a container, with the image pulled only when it's missing."""
+    state = pytester.path / "runtime"
+    monkeypatch.setenv("CONTAINER_STUB_STATE", str(state))
+    pytester.makepyfile(
+        """
+        import pytest
+
+        def test_container(elasticsearch_proc, elasticsearch):
+            assert elasticsearch_proc.running()
+            assert elasticsearch_proc.image == "elasticsearch:8.15.0"
+            assert elasticsearch.info()["version"]["number"]
+
+        @pytest.mark.parametrize("number", range(3))
+        def test_client(elasticsearch, number):
+            assert elasticsearch.info()
+        """
+    )
+    arguments = (
+        "--elasticsearch-backend=container",
+        f"--elasticsearch-container-runtime={STUBS / 'container-runtime'}",
+        "--elasticsearch-image=elasticsearch:8.15.0",
+        "--elasticsearch-profile=ephemeral",
+    )
+    run_pytest(*arguments).assert_outcomes(passed=4)
+    run_pytest(*arguments).assert_outcomes(passed=4)
+
+    calls = (state / "calls.log").read_text().splitlines()
+    assert [call for call in calls if call.startswith("pull")] == ["pull elasticsearch:8.15.0"]
+    # Container is not inspected on each client fixture's setup.
+    assert len([call for call in calls if call.startswith("inspect")]) < 8
+    runs = [call.split() for call in calls if call.startswith("run")]
+    assert len(runs) == 2
+    assert "--tmpfs" in runs[0]
+    assert "discovery.type=single-node" in runs[0]
+    assert "xpack.ml.enabled=false" in runs[0]
+    assert json.loads((state / "state.json").read_text())["containers"] == {}
+
+
+def test_container_exited(
+    run_pytest: RunPytest, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Start fails with container's logs, if elasticsearch exits."""
+    monkeypatch.setenv("CONTAINER_STUB_STATE", str(pytester.path / "runtime"))
+    pytester.makepyfile(
+        """
+        def test_container(elasticsearch_proc):
+            pass
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-backend=container",
+        f"--elasticsearch-container-runtime={STUBS / 'container-runtime'}",
+        "--elasticsearch-setting=http.port=invalid",
+    )
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*ContainerStartError: Elasticsearch container * has exited:*"])
@@ -0,0 +1,46 @@
+"""Data template tests."""
+
+from pathlib import Path
+
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.data_template import DataTemplate, data_template_key
+
+
+def seed_library(client: Elasticsearch) -> None:
+    """Seed library index."""
+    client.indices.create(index="library")
+
+
+def seed_shop(client: Elasticsearch) -> None:
+    """Seed shop index."""
+    client.indices.create(index="shop")
+
+
+def test_data_template_key() -> None:
+    """Template key depends on version, settings and seed."""
+    settings = {"cluster_name": "cluster", "index_store_type": "mmapfs"}
+    key = data_template_key("8.16.1", settings, seed_library)
+
+    assert key == data_template_key("8.16.1", dict(settings), seed_library)
+    assert key != data_template_key("7.17.0", settings, seed_library)
+    assert key != data_template_key("8.16.1", {**settings, "cluster_name": "other"}, seed_library)
+    assert key != data_template_key("8.16.1", settings, seed_shop)
+
+
+def test_data_template_save_and_restore(tmp_path: Path) -> None:
+    """Data directory is stored in cache and copied back into a new workdir."""
+    work_path = tmp_path / "workdir"
+    (work_path / "indices" / "abc").mkdir(parents=True)
+    (work_path / "indices" / "abc" / "segments_1").write_bytes(b"segment")
+    (work_path / "node.lock").touch()
+
+    template = DataTemplate(tmp_path / "cache", "key")
+    assert not template.exists()
+    template.save(work_path)
+    assert template.exists()
+    assert not (template.path / "node.lock").exists()
+
+    restored = tmp_path / "restored"
+    template.restore(restored)
+    assert (restored / "indices" / "abc" / "segments_1").read_bytes() == b"segment"
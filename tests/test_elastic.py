@@ -2,6 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import mock
 import pytest
@@ -10,7 +11,8 @@ from packaging.version import Version
 from pytest import FixtureRequest
 
 import pytest_elasticsearch.config
-from pytest_elasticsearch.executor import ElasticSearchExecutor
+from pytest_elasticsearch.executor import ElasticSearchExecutor, jvm_options
+from pytest_elasticsearch.factories import _elasticsearch_version
 
 VERSION_STRING_7_3 = (
     "OpenJDK 64-Bit Server VM warning: Option UseConcMarkSweepGC was "
@@ -153,6 +155,10 @@ def test_default_configuration(request: FixtureRequest) -> None:
     assert not config["cluster_name"]
     assert config["network_publish_host"] == "127.0.0.1"
     assert config["index_store_type"] == "mmapfs"
+    # CI runs the suite in pytest-xdist's shared mode as well.
+    assert config["xdist_mode"] == (
+        request.config.getoption("elasticsearch_xdist_mode") or "worker"
+    )
 
 
 def test_external_elastic(
@@ -175,3 +181,80 @@ def test_external_elastic(
 
     res = elasticsearch2_noop.search(index="test-index", query={"match_all": {}})
     assert res["hits"]["total"]["value"] == 1
+
+
+class DictCache:
+    """Pytest's cache stand-in."""
+
+    def __init__(self) -> None:
+        """Initialize empty cache."""
+        self.values: dict[str, str] = {}
+
+    def get(self, key: str, default: Optional[str]) -> Optional[str]:
+        """Get cached value."""
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: str) -> None:
+        """Cache value."""
+        self.values[key] = value
+
+
+def test_version_cache(tmp_path: Path) -> None:
+    """Executable is run to check its version only once, until it changes."""
+    executable = tmp_path / "elasticsearch"
+    executable.write_text("#!/bin/sh")
+    request = mock.Mock(config=mock.Mock(cache=DictCache()))
+    with mock.patch(
+        "pytest_elasticsearch.factories.read_version", return_value=Version("8.16.1")
+    ) as read_version:
+        assert _elasticsearch_version(request, executable, None) == Version("8.16.1")
+        assert _elasticsearch_version(request, executable, None) == Version("8.16.1")
+        assert read_version.call_count == 1
+
+        executable.write_text("#!/bin/bash")
+        assert _elasticsearch_version(request, executable, None) == Version("8.16.1")
+        assert read_version.call_count == 2
+
+        assert _elasticsearch_version(request, executable, "7.17.0") == Version("7.17.0")
+        assert read_version.call_count == 2
+
+
+def test_jvm_options() -> None:
+    """Test profile trades peak performance for small heap and fast boot."""
+    assert jvm_options("default") == ""
+    assert jvm_options("default", heap_size="1g", java_opts="-Dfoo=bar") == (
+        "-Xms1g -Xmx1g -Dfoo=bar"
+    )
+    options = jvm_options("test", cds_archive=Path("/cache/es.jsa")).split()
+    assert "-Xmx512m" in options
+    assert "-XX:TieredStopAtLevel=1" in options
+    assert "-XX:SharedArchiveFile=/cache/es.jsa" in options
+    # options given later take precedence
+    assert jvm_options("test", heap_size="256m").split()[-1] == "-Xmx256m"
+    with pytest.raises(ValueError):
+        jvm_options("production")
+
+
+def test_exec_command_settings() -> None:
+    """Additional settings are passed to elasticsearch with -E."""
+    executor = ElasticSearchExecutor(
+        executable=Path("elasticsearch"),
+        host="127.0.0.1",
+        port=8888,
+        tcp_port=8889,
+        pidfile=Path("elasticsearch.pid"),
+        logs_path=Path("logs"),
+        works_path=Path("works"),
+        cluster_name="dontstart",
+        network_publish_host="localhost",
+        index_store_type="memory",
+        timeout=10,
+        version=Version("8.16.1"),
+        settings={"discovery.type": "single-node", "node.attr.rack": "rack one"},
+        envvars={"ES_JAVA_OPTS": "-Xmx512m"},
+        repo_path=Path("snapshots"),
+    )
+    assert "-E discovery.type=single-node" in executor.command
+    assert "-E path.repo=snapshots" in executor.command
+    assert "-E node.attr.rack='rack one'" in executor.command
+    assert executor.envvars["ES_JAVA_OPTS"] == "-Xmx512m"
@@ -0,0 +1,70 @@
+"""Fake elasticsearch tests."""
+
+from typing import Any, Dict, Optional
+
+import pytest
+from elasticsearch import BadRequestError, Elasticsearch, NotFoundError
+
+from pytest_elasticsearch.fake import FakeElasticsearch, evaluate
+
+BOOK = {"title": "Dune Messiah", "author": {"name": "Frank Herbert"}, "year": 1969, "tags": ["sf"]}
+
+
+@pytest.mark.parametrize(
+    "query, score",
+    (
+        (None, 1.0),
+        ({"match_all": {}}, 1.0),
+        ({"ids": {"values": ["1"]}}, 1.0),
+        ({"term": {"author.name.keyword": "Frank Herbert"}}, 1.0),
+        ({"term": {"author.name": "frank"}}, None),
+        ({"terms": {"tags": ["fantasy", "sf"]}}, 1.0),
+        ({"match": {"title": "dune children"}}, 1.0),
+        ({"match": {"title": {"query": "dune children", "operator": "and"}}}, None),
+        ({"match_phrase": {"title": "dune messiah"}}, 2.0),
+        ({"range": {"year": {"gte": 1965, "lt": 1969}}}, None),
+        ({"exists": {"field": "author.name"}}, 1.0),
+        (
+            {
+                "bool": {
+                    "must": {"match": {"title": "messiah"}},
+                    "filter": [{"range": {"year": {"gt": "1965"}}}],
+                    "must_not": [{"term": {"tags": "fantasy"}}],
+                }
+            },
+            1.0,
+        ),
+        ({"bool": {"should": [{"term": {"year": 1965}}, {"term": {"year": 1970}}]}}, None),
+    ),
+)
+def test_evaluate(query: Optional[Dict[str, Any]], score: Optional[float]) -> None:
+    """Queries match documents as elasticsearch would, without text analysis."""
+    assert evaluate(query, "1", BOOK) == score
+
+
+def test_fake_client(
+    elasticsearch_fakeproc: FakeElasticsearch, elasticsearch_fake: Elasticsearch
+) -> None:
+    """Client fixture works against the fake, started within the test process."""
+    assert elasticsearch_fakeproc.running()
+    elasticsearch_fake.indices.create(index="books", aliases={"library": {}})
+    elasticsearch_fake.index(index="books", id="1", document=BOOK)
+    elasticsearch_fake.bulk(
+        operations=[{"index": {"_index": "books", "_id": "2"}}, {"title": "Dune", "year": 1965}]
+    )
+
+    found = elasticsearch_fake.search(
+        index="library", query={"match": {"title": "dune"}}, sort=[{"year": "asc"}]
+    )
+    assert [hit["_id"] for hit in found["hits"]["hits"]] == ["2", "1"]
+    assert elasticsearch_fake.count(index="books")["count"] == 2
+    assert "green open books" in elasticsearch_fake.cat.indices().body
+    with pytest.raises(NotFoundError):
+        elasticsearch_fake.get(index="books", id="3")
+    with pytest.raises(BadRequestError, match="fake_unsupported_operation"):
+        elasticsearch_fake.search(index="books", aggs={"years": {"terms": {"field": "year"}}})
+
+
+def test_fake_cleanup(elasticsearch_fake: Elasticsearch) -> None:
+    """Indices left by the previous test are removed."""
+    assert not elasticsearch_fake.indices.exists(index="books")
@@ -0,0 +1,65 @@
+"""Nodes kept running between sessions tests."""
+
+import pytest
+
+from pytest_elasticsearch.executor import process_running
+from tests.conftest import RunPytest
+
+
+def test_keep_alive(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Next session reattaches to the kept node, until it's stopped."""
+    pytester.makepyfile(
+        """
+        from pytest_elasticsearch.executor import KeptElasticsearch
+
+        def test_node(request, elasticsearch_proc):
+            assert elasticsearch_proc.running()
+            pid_file = request.config.rootpath / "pid"
+            if isinstance(elasticsearch_proc, KeptElasticsearch):
+                assert int(pid_file.read_text()) == elasticsearch_proc.pid
+                pid_file.write_text("reattached")
+            else:
+                pid_file.write_text(str(elasticsearch_proc.process.pid))
+        """
+    )
+    pid_file = pytester.path / "pid"
+    try:
+        run_pytest("--elasticsearch-keep-alive").assert_outcomes(passed=1)
+        pid = int(pid_file.read_text())
+        assert process_running(pid)
+
+        run_pytest("--elasticsearch-keep-alive").assert_outcomes(passed=1)
+        assert pid_file.read_text() == "reattached"
+    finally:
+        result = run_pytest("--elasticsearch-stop")
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["Stopped elasticsearch node elasticsearch_proc-*"])
+    assert not process_running(pid)
+
+
+def test_keep_alive_settings_changed(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Kept node is replaced, when the next session configures it differently."""
+    pytester.makepyfile(
+        """
+        def test_node(request, elasticsearch_proc):
+            with open(request.config.rootpath / "pids", "a") as pids:
+                pids.write(f"{elasticsearch_proc.process.pid}\\n")
+        """
+    )
+    args = ("--elasticsearch-keep-alive",)
+    try:
+        run_pytest(*args).assert_outcomes(passed=1)
+        run_pytest(*args, "--elasticsearch-setting=node.attr.rack=r1").assert_outcomes(passed=1)
+    finally:
+        run_pytest(*args, "--elasticsearch-stop")
+    first, second = (int(pid) for pid in (pytester.path / "pids").read_text().split())
+    assert first != second
+    assert not process_running(first)
+    assert not process_running(second)
+
+
+def test_stop_without_cache(run_pytest: RunPytest) -> None:
+    """Stopping kept nodes is a usage error, when pytest's cache is disabled."""
+    result = run_pytest("-p", "no:cacheprovider", "--elasticsearch-stop")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*--elasticsearch-stop needs pytest's cacheprovider plugin*"])
@@ -0,0 +1,60 @@
+"""Bulk data loader tests."""
+
+from pathlib import Path
+
+import mock
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.loader import bulk_load, read_ndjson
+
+
+def test_read_ndjson(tmp_path: Path) -> None:
+    """NDJSON files are streamed line by line, skipping blank lines."""
+    ndjson = tmp_path / "books.ndjson"
+    ndjson.write_text('{"_id": "1", "title": "Dune"}\n\n{"title": "Solaris"}\n')
+    assert list(read_ndjson(ndjson)) == [{"_id": "1", "title": "Dune"}, {"title": "Solaris"}]
+
+
+def test_bulk_load_refresh_interval() -> None:
+    """Periodic refreshes are off during the load, with single refresh at the end."""
+    client = mock.Mock()
+    client.indices.exists.return_value = True
+    client.indices.get_settings.return_value = {
+        "books": {"settings": {"index": {"refresh_interval": "5s"}}}
+    }
+    with mock.patch(
+        "pytest_elasticsearch.loader.streaming_bulk",
+        return_value=iter([(True, {}), (True, {})]),
+    ) as streaming_bulk:
+        assert bulk_load(client, lambda: iter([{"a": 1}, {"a": 2}]), "books", chunk_size=10) == 2
+    assert streaming_bulk.call_args.kwargs["chunk_size"] == 10
+    intervals = [
+        call.kwargs["settings"]["index"]["refresh_interval"]
+        for call in client.indices.put_settings.call_args_list
+    ]
+    assert intervals == ["-1", "5s"]
+    client.indices.refresh.assert_called_once_with(index="books")
+
+
+def test_bulk_load_new_index_interval() -> None:
+    """Refresh interval a new index got from a template is restored after the load."""
+    client = mock.Mock()
+    client.indices.exists.return_value = False
+    client.indices.get_settings.return_value = {
+        "books": {"settings": {"index": {"refresh_interval": "-1"}}}
+    }
+    with mock.patch("pytest_elasticsearch.loader.streaming_bulk", return_value=iter([])):
+        bulk_load(client, lambda: iter([]), "books")
+    client.indices.create.assert_called_once()
+    intervals = [
+        call.kwargs["settings"]["index"]["refresh_interval"]
+        for call in client.indices.put_settings.call_args_list
+    ]
+    assert intervals == ["-1", "-1"]
+
+
+def test_elasticsearch_data(elasticsearch_books: str, elasticsearch: Elasticsearch) -> None:
+    """Data fixture loads all documents, and makes them searchable."""
+    assert elasticsearch.count(index=elasticsearch_books)["count"] == 1000
+    settings = elasticsearch.indices.get_settings(index=elasticsearch_books)
+    assert "refresh_interval" not in settings[elasticsearch_books]["settings"]["index"]
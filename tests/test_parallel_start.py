@@ -0,0 +1,35 @@
+"""Parallel start of process fixtures tests."""
+
+import pytest
+
+from tests.conftest import RunPytest
+
+
+def test_parallel_start(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """All process fixtures used in the session are spawned together."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_first = factories.elasticsearch_proc()
+        elasticsearch_second = factories.elasticsearch_proc()
+        elasticsearch_unused = factories.elasticsearch_proc()
+        """
+    )
+    pytester.makepyfile(
+        """
+        from pytest_elasticsearch.factories import prestarted_key
+
+        def test_first(request, elasticsearch_first):
+            prestarted = request.config.stash[prestarted_key]
+            assert list(prestarted) == ["elasticsearch_second"]
+            assert prestarted["elasticsearch_second"].running()
+
+        def test_second(request, elasticsearch_second):
+            assert request.config.stash[prestarted_key] == {}
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-parallel-start",
+    )
+    result.assert_outcomes(passed=2)
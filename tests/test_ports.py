@@ -0,0 +1,88 @@
+"""Port reservation and startup retry tests."""
+
+import socket
+from pathlib import Path
+
+import pytest
+from port_for import get_port
+
+from pytest_elasticsearch.ports import reserve_port
+from tests.conftest import RunPytest
+
+
+def test_reserved_port_not_selected(tmp_path: Path) -> None:
+    """Port reserved by a session is not selected by another one, until released."""
+    first_port = get_port(None)
+    second_port = get_port(None, exclude_ports=[first_port] if first_port else [])
+    assert first_port and second_port
+    ports = {first_port, second_port}
+    reservation = reserve_port(ports, directory=tmp_path)
+    assert reservation
+    other = reserve_port(ports, directory=tmp_path)
+    assert other
+    assert other.port != reservation.port
+    other.release()
+
+    reservation.release()
+    assert reservation.lock_file is None
+    assert not (tmp_path / f"{reservation.port}.lock").exists()
+    again = reserve_port({reservation.port}, directory=tmp_path)
+    assert again
+    assert again.port == reservation.port
+    assert again.lock_file is not None
+    again.release()
+
+
+def test_exact_port_not_reserved(tmp_path: Path) -> None:
+    """Exact port is used even if reserved, as no other port would do."""
+    reservation = reserve_port(9500, directory=tmp_path)
+    assert reservation
+    exact = reserve_port(9500, directory=tmp_path)
+    assert exact
+    assert exact.port == 9500
+    assert exact.lock_file is None
+    reservation.release()
+
+
+def test_start_retried_on_new_ports(
+    run_pytest: RunPytest,
+    pytester: pytest.Pytester,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Node which could not bind its port is started again on new ones."""
+    failures = tmp_path / "bind-failures"
+    failures.write_text("2")
+    monkeypatch.setenv("ELASTICSEARCH_STUB_BIND_FAILURES", str(failures))
+    pytester.makepyfile(
+        """
+        def test_started(request, elasticsearch_proc):
+            assert elasticsearch_proc.running()
+            (request.config.rootpath / "port").write_text(str(elasticsearch_proc.port))
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=1)
+    assert failures.read_text() == "0"
+    failed_ports = (tmp_path / "bind-failures.ports").read_text().split()
+    ports = [*failed_ports, (pytester.path / "port").read_text()]
+    assert len(set(ports)) == 3
+
+
+def test_port_in_use(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Node which could not bind its exact port fails with port in use error."""
+    # Bound but not listening port fails node's bind, while not seeming taken by a running node.
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        port = taken.getsockname()[1]
+        pytester.makepyfile(
+            """
+            def test_started(elasticsearch_proc):
+                pass
+            """
+        )
+        result = run_pytest(
+            f"--elasticsearch-port={port}",
+        )
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines([f"*PortInUse: Elasticsearch could not bind port {port}.*"])
@@ -0,0 +1,139 @@
+"""Client fixtures' requests profiling tests."""
+
+import pytest
+
+from pytest_elasticsearch.profiling import Profiler, RequestCall, endpoint_of
+from tests.conftest import RunPytest
+
+
+def call(test: str, seconds: float, took: int = 1) -> RequestCall:
+    """Get request made by a test."""
+    return RequestCall(
+        test=test,
+        method="POST",
+        endpoint="/{index}/_search",
+        index="books",
+        seconds=seconds,
+        size=100,
+        took=took,
+        profile=None,
+    )
+
+
+def test_endpoint_of() -> None:
+    """Index names and document ids are replaced in endpoints."""
+    assert endpoint_of("/books/_doc/1?refresh=true") == ("/{index}/_doc/{id}", "books")
+    assert endpoint_of("/_cluster/health") == ("/_cluster/health", None)
+    assert endpoint_of("/") == ("/", None)
+
+
+def test_slowest_and_busiest() -> None:
+    """Profiler keeps the slowest requests, and counts requests of every test."""
+    profiler = Profiler(slowest=2)
+    for seconds in (0.1, 0.5, 0.2):
+        profiler.record(call("test_a", seconds))
+    profiler.merge([call("test_b", 0.3)], [{"test": "test_a", "calls": 2, "total": 1.0, "took": 4}])
+    assert [request["seconds"] for request in profiler.slowest_calls()] == [0.5, 0.3]
+    assert [(test["test"], test["calls"]) for test in profiler.busiest_tests()] == [("test_a", 5)]
+    assert profiler.busiest_tests()[0]["took"] == 7
+
+
+def test_requests_report(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Requests of client fixtures are reported at the end of the session."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_fake = factories.elasticsearch("elasticsearch_fakeproc")
+        """
+    )
+    pytester.makepyfile(
+        """
+        def test_search(elasticsearch_fake):
+            elasticsearch_fake.index(index="books", id="1", document={"title": "Dune"})
+            elasticsearch_fake.indices.refresh(index="books")
+            assert elasticsearch_fake.search(index="books")["hits"]["total"]["value"] == 1
+
+        def test_count(elasticsearch_fake):
+            elasticsearch_fake.count(index="*")
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-search-profiles",
+        "--elasticsearch-requests-report-size=2",
+    )
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= elasticsearch slowest requests =*",
+            "*time*took*size*request",
+            "*s * *B  * /*",
+            "*s * *B  * /*",
+            "",
+            "*calls*total*took*test",
+            "*[1-9]*s*ms  test_requests_report.py::test_search",
+            "*[1-9]*s*ms  test_requests_report.py::test_count",
+        ]
+    )
+
+
+def test_profile_requests_of_fixture(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Only requests of client fixtures asking for it are recorded."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_fake = factories.elasticsearch("elasticsearch_fakeproc")
+        elasticsearch_profiled = factories.elasticsearch(
+            "elasticsearch_fakeproc", profile_requests=True
+        )
+        """
+    )
+    pytester.makepyfile(
+        """
+        def test_profiled(elasticsearch_profiled, elasticsearch_fake):
+            elasticsearch_profiled.count(index="*")
+            elasticsearch_fake.count(index="*")
+
+        def test_unprofiled(elasticsearch_fake):
+            elasticsearch_fake.count(index="*")
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= elasticsearch slowest requests =*",
+            "*calls*total*took*test",
+            "*  test_profile_requests_of_fixture.py::test_profiled",
+        ]
+    )
+    result.stdout.no_fnmatch_line("*  test_profile_requests_of_fixture.py::test_unprofiled")
+
+
+def test_search_profile_report() -> None:
+    """Profiles of the slowest searches are reported along with them."""
+    profiler = Profiler()
+    search = call("test_search", 0.2, took=150)
+    search["profile"] = {
+        "shards": [
+            {
+                "id": "[node][books][0]",
+                "searches": [
+                    {
+                        "query": [
+                            {
+                                "type": "TermQuery",
+                                "description": "title:dune",
+                                "time_in_nanos": 1_500_000,
+                            }
+                        ]
+                    }
+                ],
+            }
+        ]
+    }
+    profiler.record(search)
+    report = profiler.report()
+    assert report[1].endswith("150ms      100B  POST /{index}/_search (books)  test_search")
+    assert report[2].strip() == "TermQuery title:dune 1.500ms  [node][books][0]"
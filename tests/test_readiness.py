@@ -0,0 +1,88 @@
+"""Process fixtures readiness tests."""
+
+import time
+
+import pytest
+
+from tests.conftest import RunPytest
+
+
+def test_wait_for_status(
+    run_pytest: RunPytest, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Node is started once its cluster reaches health status, unless told otherwise."""
+    monkeypatch.setenv("ELASTICSEARCH_STUB_RECOVERY_TIME", "2")
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_green = factories.elasticsearch_proc(wait_for_status="green")
+        elasticsearch_responding = factories.elasticsearch_proc(wait_for_status="none")
+        """
+    )
+    pytester.makepyfile(
+        """
+        import json
+        from urllib.request import urlopen
+
+        def health(process):
+            with urlopen(f"http://{process.host}:{process.port}/_cluster/health") as response:
+                return json.load(response)["status"]
+
+        def test_green(elasticsearch_green):
+            assert elasticsearch_green.wait_for_status == "green"
+            assert health(elasticsearch_green) == "green"
+
+        def test_responding(elasticsearch_responding):
+            assert elasticsearch_responding.wait_for_status is None
+            assert health(elasticsearch_responding) == "red"
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=2)
+
+
+def test_fatal_failure(
+    run_pytest: RunPytest, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Node reporting a fatal failure fails right away, with its output in the error."""
+    monkeypatch.setenv("ELASTICSEARCH_STUB_FATAL", "[1] bootstrap checks failed")
+    pytester.makepyfile(
+        """
+        def test_started(elasticsearch_proc):
+            pass
+        """
+    )
+    started = time.monotonic()
+    result = run_pytest()
+    assert time.monotonic() - started < 30
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*NodeStartupError: Elasticsearch node on port * has failed to start:",
+            "E*ERROR: [[]1[]] bootstrap checks failed",
+        ]
+    )
+
+
+def test_startup_progress(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Startup progress callback receives lines the node logs while starting."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        progress = []
+        elasticsearch_reporting = factories.elasticsearch_proc(startup_progress=progress.append)
+        """
+    )
+    pytester.makepyfile(
+        """
+        from conftest import progress
+
+        def test_progress(elasticsearch_reporting):
+            assert progress[0].endswith(f"pid[{elasticsearch_reporting.process.pid}]")
+            assert "[INFO ][o.e.n.Node] starting ..." in progress
+        """
+    )
+    result = run_pytest()
+    result.assert_outcomes(passed=1)
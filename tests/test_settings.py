@@ -0,0 +1,106 @@
+"""Elasticsearch node settings tests."""
+
+import pytest
+from packaging.version import Version
+
+from pytest_elasticsearch.executor import profile_settings
+from tests.conftest import RunPytest
+
+
+def test_ephemeral_profile_settings() -> None:
+    """Ephemeral profile disables modules available in given version."""
+    assert profile_settings("default", Version("8.16.1")) == {}
+
+    settings_8 = profile_settings("ephemeral", Version("8.16.1"))
+    assert settings_8["discovery.type"] == "single-node"
+    assert settings_8["xpack.ml.enabled"] == "false"
+    assert settings_8["ingest.geoip.downloader.enabled"] == "false"
+    assert "xpack.monitoring.enabled" not in settings_8
+
+    settings_7 = profile_settings("ephemeral", Version("7.10.0"))
+    assert settings_7["xpack.monitoring.enabled"] == "false"
+    assert "ingest.geoip.downloader.enabled" not in settings_7
+
+
+def test_node_settings(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Profile and additional settings are passed to the node."""
+    pytester.makepyfile(
+        """
+        import json
+
+        def test_settings(elasticsearch_proc):
+            stub = json.loads((elasticsearch_proc.logs_path / "stub.json").read_text())
+            assert stub["settings"]["xpack.watcher.enabled"] == "false"
+            assert stub["settings"]["node.attr.rack"] == "r1"
+            assert stub["es_java_opts"].endswith("-Xms256m -Xmx256m")
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-profile=ephemeral",
+        "--elasticsearch-setting=node.attr.rack=r1",
+        "--elasticsearch-heap-size=256m",
+    )
+    result.assert_outcomes(passed=1)
+
+
+def test_index_defaults(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Process fixture installs index template with test indices' settings, when asked to."""
+    pytester.makeconftest(
+        """
+        from pytest_elasticsearch import factories
+
+        elasticsearch_test_defaults = factories.elasticsearch_proc(index_defaults="test")
+        """
+    )
+    pytester.makepyfile(
+        """
+        import json
+
+        def test_template(elasticsearch_test_defaults):
+            logs_path = elasticsearch_test_defaults.logs_path
+            templates = json.loads((logs_path / "templates.json").read_text())
+            template = templates["pytest-elasticsearch-defaults"]
+            assert template["index_patterns"] == ["*"]
+            assert template["priority"] == 0
+            assert template["_meta"]["managed"] is True
+            assert template["template"]["settings"] == {
+                "index.number_of_shards": "1",
+                "index.number_of_replicas": "0",
+                "index.translog.durability": "async",
+                "index.refresh_interval": "-1",
+            }
+
+        def test_no_template(elasticsearch_proc):
+            assert not (elasticsearch_proc.logs_path / "templates.json").exists()
+        """
+    )
+    result = run_pytest(
+        "--elasticsearch-refresh-interval=-1",
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_index_defaults_legacy(
+    run_pytest: RunPytest, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Nodes without composable templates get a legacy index template."""
+    monkeypatch.setenv("ELASTICSEARCH_STUB_VERSION", "7.7.1")
+    pytester.makepyfile(
+        """
+        import json
+
+        def test_template(elasticsearch_proc):
+            templates = json.loads((elasticsearch_proc.logs_path / "templates.json").read_text())
+            assert templates["pytest-elasticsearch-defaults"] == {
+                "index_patterns": ["*"],
+                "order": 0,
+                "settings": {
+                    "index.number_of_shards": "1",
+                    "index.number_of_replicas": "0",
+                    "index.translog.durability": "async",
+                },
+            }
+        """
+    )
+    result = run_pytest("--elasticsearch-index-defaults=test")
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,78 @@
+"""Tests for nodes shared between pytest-xdist workers."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pytest_elasticsearch.executor import SharedElasticsearch, process_running
+from pytest_elasticsearch.shared import SharedNode, SharedNodeState, xdist_slot
+
+
+@pytest.mark.parametrize(
+    "worker, mode, pool_size, expected_slot",
+    (
+        (None, "shared", 1, None),
+        ("gw3", "worker", 1, None),
+        ("gw3", "shared", 1, 0),
+        ("gw3", "pool", 2, 1),
+        ("gw10", "pool", 4, 2),
+    ),
+)
+def test_xdist_slot(
+    monkeypatch: pytest.MonkeyPatch,
+    worker: str,
+    mode: str,
+    pool_size: int,
+    expected_slot: int,
+) -> None:
+    """Workers are assigned to shared nodes according to the mode."""
+    if worker:
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+    else:
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert xdist_slot(mode, pool_size) == expected_slot
+
+
+def test_xdist_slot_unknown_mode() -> None:
+    """Unknown mode is reported."""
+    with pytest.raises(ValueError):
+        xdist_slot("cluster", 1)
+
+
+def test_shared_node_state(tmp_path: Path) -> None:
+    """Shared node state is kept in a file next to the node."""
+    node = SharedNode(tmp_path / "node")
+    with node.locked():
+        assert node.read() is None
+        node.write(
+            SharedNodeState(
+                host="127.0.0.1", port=9201, pid=1, repo_path="/snapshots", workers=["gw0"]
+            )
+        )
+        state = node.read()
+    assert state == {
+        "host": "127.0.0.1",
+        "port": 9201,
+        "pid": 1,
+        "repo_path": "/snapshots",
+        "workers": ["gw0"],
+    }
+    (node.path / "workdir").mkdir()
+    with node.locked():
+        node.remove()
+    assert node.read() is None
+    assert not (node.path / "workdir").exists()
+    # Workers waiting for the lock still hold the same file.
+    assert node.lock_file.exists()
+
+
+def test_shared_elasticsearch_stop() -> None:
+    """Node started by another worker gets stopped through its process group."""
+    process = subprocess.Popen(["sleep", "60"], start_new_session=True)
+    shared = SharedElasticsearch("127.0.0.1", 9201, process.pid)
+    assert shared.running()
+    shared.stop(timeout=5)
+    assert not shared.running()
+    process.wait()
+    assert not process_running(process.pid)
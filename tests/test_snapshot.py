@@ -0,0 +1,92 @@
+"""Snapshot based reset tests."""
+
+from pathlib import Path
+
+import mock
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.snapshot import REPOSITORY, SeedSnapshot
+
+
+def indexing_stats(**counters: tuple[int, int]) -> dict:
+    """Build indices stats response."""
+    return {
+        "indices": {
+            index: {"primaries": {"indexing": {"index_total": total, "delete_total": deleted}}}
+            for index, (total, deleted) in counters.items()
+        }
+    }
+
+
+def test_restore_modified_only() -> None:
+    """Only modified, or removed, seeded indices get restored."""
+    client = mock.Mock()
+    client.indices.stats.return_value = indexing_stats(
+        books=(10, 0), movies=(5, 0), games=(3, 0), other=(1, 0)
+    )
+    snapshot = SeedSnapshot(client, Path("/snapshots"), "seed", ["books", "movies", "games"])
+    snapshot.create()
+    assert snapshot.baseline == {"books": (10, 0), "movies": (5, 0), "games": (3, 0)}
+
+    client.indices.stats.return_value = indexing_stats(books=(10, 1), movies=(5, 0), other=(9, 9))
+    assert snapshot.restore() == ["books", "games"]
+    client.indices.delete.assert_called_once_with(index="books,games", ignore_unavailable=True)
+    assert client.snapshot.restore.call_args.kwargs["repository"] == f"{REPOSITORY}-seed"
+    assert client.snapshot.restore.call_args.kwargs["body"]["indices"] == "books,games"
+
+
+def test_repository_per_snapshot() -> None:
+    """Snapshots on the same node register repositories of their own."""
+    client = mock.Mock()
+    client.indices.stats.return_value = indexing_stats(books=(10, 0))
+    for name in ("seed", "other_seed"):
+        SeedSnapshot(client, Path("/snapshots") / name, name, ["books"]).create()
+    repositories = [
+        (call.kwargs["name"], call.kwargs["body"]["settings"]["location"])
+        for call in client.snapshot.create_repository.call_args_list
+    ]
+    assert repositories == [
+        (f"{REPOSITORY}-seed", "/snapshots/seed"),
+        (f"{REPOSITORY}-other_seed", "/snapshots/other_seed"),
+    ]
+    assert [call.kwargs["repository"] for call in client.snapshot.create.call_args_list] == [
+        f"{REPOSITORY}-seed",
+        f"{REPOSITORY}-other_seed",
+    ]
+
+
+def test_reset_modify(
+    elasticsearch_library_reset: Elasticsearch, elasticsearch_library: str
+) -> None:
+    """Modify seeded index."""
+    elasticsearch_library_reset.delete(index=elasticsearch_library, id="1", refresh=True)
+    assert elasticsearch_library_reset.count(index=elasticsearch_library)["count"] == 999
+
+
+def test_reset_restored(
+    elasticsearch_library_reset: Elasticsearch, elasticsearch_library: str
+) -> None:
+    """Seeded index modified by previous test is restored."""
+    assert elasticsearch_library_reset.count(index=elasticsearch_library)["count"] == 1000
+
+
+def test_two_resets_modify(
+    elasticsearch_library_reset: Elasticsearch,
+    elasticsearch_books_reset: Elasticsearch,
+    elasticsearch_library: str,
+    elasticsearch_books_seed: str,
+) -> None:
+    """Modify indices seeded for two reset fixtures of the same process fixture."""
+    elasticsearch_library_reset.delete(index=elasticsearch_library, id="1", refresh=True)
+    elasticsearch_books_reset.delete(index=elasticsearch_books_seed, id="1", refresh=True)
+
+
+def test_two_resets_restored(
+    elasticsearch_library_reset: Elasticsearch,
+    elasticsearch_books_reset: Elasticsearch,
+    elasticsearch_library: str,
+    elasticsearch_books_seed: str,
+) -> None:
+    """Both reset fixtures restore their indices from their own snapshots."""
+    assert elasticsearch_library_reset.count(index=elasticsearch_library)["count"] == 1000
+    assert elasticsearch_books_reset.count(index=elasticsearch_books_seed)["count"] == 1000
@@ -0,0 +1,73 @@
+"""Node directories teardown tests."""
+
+import time
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from pytest_elasticsearch.teardown import data_directory, delete_in_background
+from tests.conftest import RunPytest
+
+
+def test_data_directory(tmp_path: Path) -> None:
+    """Data directories within data_dir are unique, default one is used without it."""
+    default = tmp_path / "workdir"
+    assert data_directory(None, default, "node") == default
+    first = data_directory(tmp_path / "ram", default, "node")
+    second = data_directory(tmp_path / "ram", default, "node")
+    assert first != second
+    assert first.parent == second.parent == tmp_path / "ram"
+    assert first.name.startswith("node-")
+
+
+def test_delete_in_background(tmp_path: Path) -> None:
+    """Directories are moved aside right away, and deleted by a detached process."""
+    data = tmp_path / "data"
+    (data / "nodes").mkdir(parents=True)
+    (data / "nodes" / "segment").write_text("data")
+    delete_in_background([data])
+    assert not data.exists()
+    for _ in range(100):
+        if not list(tmp_path.iterdir()):
+            break
+        time.sleep(0.05)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(
+    "options, kept",
+    (
+        ((), False),
+        (("--elasticsearch-keep-on-failure",), True),
+        (("--elasticsearch-teardown=keep",), True),
+        (("--elasticsearch-teardown=background",), False),
+    ),
+)
+def test_teardown(
+    run_pytest: RunPytest, pytester: pytest.Pytester, options: Tuple[str, ...], kept: bool
+) -> None:
+    """Node directories are removed after the session, unless kept for inspection."""
+    ram = pytester.path / "ram"
+    pytester.makepyfile(
+        f"""
+        from pathlib import Path
+
+        def test_data_dir(elasticsearch_proc):
+            assert elasticsearch_proc.works_path.parent == Path({str(ram)!r})
+
+        def test_failing():
+            assert False
+        """
+    )
+    result = run_pytest(
+        f"--elasticsearch-data-dir={ram}",
+        *options,
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    node_directories = [path for path in ram.iterdir() if ".deleted-" not in path.name]
+    assert bool(node_directories) is kept
+    if kept:
+        result.stdout.fnmatch_lines(
+            ["*elasticsearch directories kept for inspection*", f"{node_directories[0]}"]
+        )
@@ -0,0 +1,64 @@
+"""Fixtures timing instrumentation tests."""
+
+import json
+
+import pytest
+
+from pytest_elasticsearch.timing import Timings
+from tests.conftest import RunPytest
+
+
+def test_timings_aggregate() -> None:
+    """Phase durations are aggregated per fixture, also from other workers."""
+    timings = Timings()
+    timings.record("elasticsearch", "setup", 0.5)
+    timings.record("elasticsearch", "setup", 1.5)
+    timings.merge(
+        [
+            {"fixture": "elasticsearch", "phase": "setup", "calls": 2, "total": 1.0, "max": 0.75},
+            {
+                "fixture": "elasticsearch_proc",
+                "phase": "spawn",
+                "calls": 1,
+                "total": 2.0,
+                "max": 2.0,
+            },
+        ]
+    )
+    assert timings.as_list() == [
+        {"fixture": "elasticsearch", "phase": "setup", "calls": 4, "total": 3.0, "max": 1.5},
+        {"fixture": "elasticsearch_proc", "phase": "spawn", "calls": 1, "total": 2.0, "max": 2.0},
+    ]
+
+
+def test_timings_report(run_pytest: RunPytest, pytester: pytest.Pytester) -> None:
+    """Timings are reported in terminal summary and exported to JSON file."""
+    pytester.makepyfile(
+        """
+        def test_first(elasticsearch):
+            pass
+
+        def test_second(elasticsearch):
+            pass
+        """
+    )
+    export_path = pytester.path / "timings.json"
+    result = run_pytest(
+        "--elasticsearch-timings",
+        f"--elasticsearch-timings-json={export_path}",
+    )
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*elasticsearch fixtures timings*",
+            "elasticsearch *setup *2 *",
+            "elasticsearch_proc *readiness *1 *",
+        ]
+    )
+    exported = {
+        (timing["fixture"], timing["phase"]): timing
+        for timing in json.loads(export_path.read_text())
+    }
+    assert exported[("elasticsearch", "cleanup")]["calls"] == 2
+    for phase in ("version", "spawn", "readiness", "stop", "rmtree"):
+        assert exported[("elasticsearch_proc", phase)]["calls"] == 1
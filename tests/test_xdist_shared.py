@@ -0,0 +1,62 @@
+"""Tests of a node shared between pytest-xdist workers.
+
+CI runs the suite with ``-n 2 --elasticsearch-xdist-mode=shared`` as well,
+these pass in any mode.
+"""
+
+from elasticsearch import Elasticsearch
+
+from pytest_elasticsearch.client import ElasticsearchProcess, NamespacedElasticsearch
+from pytest_elasticsearch.clone import ClonedIndexElasticsearch
+from pytest_elasticsearch.shared import xdist_worker
+
+
+def test_client_namespaced(
+    elasticsearch_proc: ElasticsearchProcess, elasticsearch: Elasticsearch
+) -> None:
+    """Client of a shared node is namespaced per worker."""
+    if getattr(elasticsearch_proc, "xdist_shared", False):
+        assert isinstance(elasticsearch, NamespacedElasticsearch)
+        assert str(xdist_worker()) in elasticsearch.namespace
+
+
+def test_data_index_per_worker(
+    elasticsearch_proc: ElasticsearchProcess,
+    elasticsearch_books: str,
+    elasticsearch_namespaced: Elasticsearch,
+) -> None:
+    """Seeded index is owned by the worker on a shared node."""
+    if getattr(elasticsearch_proc, "xdist_shared", False) and xdist_worker():
+        assert elasticsearch_books == f"pytest-{xdist_worker()}-books"
+    else:
+        assert elasticsearch_books == "books"
+    assert elasticsearch_namespaced.count(index=elasticsearch_books)["count"] == 1000
+
+
+def test_clone_alias_per_worker(elasticsearch_library_clone: ClonedIndexElasticsearch) -> None:
+    """Clone's alias is owned by the worker on a shared node."""
+    client = elasticsearch_library_clone
+    assert client.index_name.endswith("shelf")
+    client.delete(index=client.index_name, id="1", refresh=True)
+    assert client.count(index=client.index_name)["count"] == 999
+
+
+def test_reset_per_worker(
+    elasticsearch_proc: ElasticsearchProcess,
+    elasticsearch_library_reset: Elasticsearch,
+    elasticsearch_library: str,
+) -> None:
+    """Seeded index and its snapshot repository are owned by the worker on a shared node."""
+    if getattr(elasticsearch_proc, "xdist_shared", False) and xdist_worker():
+        assert elasticsearch_library == f"pytest-{xdist_worker()}-library"
+        repository = f"pytest-elasticsearch-pytest-{xdist_worker()}-elasticsearch_library_reset"
+        assert repository in elasticsearch_library_reset.snapshot.get_repository()
+    elasticsearch_library_reset.delete(index=elasticsearch_library, id="1", refresh=True)
+    assert elasticsearch_library_reset.count(index=elasticsearch_library)["count"] == 999
+
+
+def test_reset_per_worker_restored(
+    elasticsearch_library_reset: Elasticsearch, elasticsearch_library: str
+) -> None:
+    """Seeded index modified by previous test is restored from the worker's snapshot."""
+    assert elasticsearch_library_reset.count(index=elasticsearch_library)["count"] == 1000